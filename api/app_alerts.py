@@ -5,7 +5,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from decouple import config
 from fastapi import FastAPI
 
-from chalicelib.core import alerts_processor
+from chalicelib.core import alerts_processor, rollups
 from chalicelib.utils import pg_client
 
 
@@ -18,6 +18,10 @@ async def lifespan(app: FastAPI):
     app.schedule.add_job(id="alerts_processor", **{"func": alerts_processor.process, "trigger": "interval",
                                                    "minutes": config("ALERTS_INTERVAL", cast=int, default=5),
                                                    "misfire_grace_time": 20})
+    if rollups.ENABLED:
+        app.schedule.add_job(id="rollups", **{"func": rollups.refresh, "trigger": "interval",
+                                              "minutes": config("ROLLUPS_INTERVAL", cast=int, default=1),
+                                              "misfire_grace_time": 20, "max_instances": 1})
 
     ap_logger.info(">Scheduled jobs:")
     for job in app.schedule.get_jobs():
@@ -0,0 +1,41 @@
+"""Time the in-memory autocomplete lookups (autocomplete_index.ProjectIndex) of a project with n_values random values
+spread over the autocomplete types: the index build and the search of each keystroke in all the types.
+Run from api, with the api env loaded:
+    python -m benchmarks.autocomplete_index [n_values]
+The SQL lookups it replaces take a database round trip (a few ms at best) per type and per keystroke."""
+import random
+import string
+import sys
+from time import perf_counter
+
+from chalicelib.core import autocomplete_index
+
+TYPES = ["REVID", "CLICK", "USERDEVICE", "USERID", "USERBROWSER", "USEROS", "CUSTOM", "USERCOUNTRY", "USERCITY",
+         "USERSTATE", "LOCATION", "INPUT"]
+
+
+def make_rows(n_values: int, seed: int = 0):
+    rnd = random.Random(seed)
+    values = [{"type": rnd.choice(TYPES),
+               "value": "".join(rnd.choices(string.ascii_letters + " /", k=rnd.randint(5, 60)))}
+              for _ in range(n_values)]
+    # the index is loaded with ORDER BY value
+    return sorted(values, key=lambda v: v["value"].lower())
+
+
+def run(n_values: int, repeat: int = 100):
+    rows = make_rows(n_values)
+    t = perf_counter()
+    index = autocomplete_index.ProjectIndex(rows)
+    print(f"{n_values} values, build: {(perf_counter() - t) * 1000:.1f}ms")
+    for text in ["a", "ab", "sig", "/chec"]:
+        t = perf_counter()
+        for _ in range(repeat):
+            for t_type in TYPES:
+                # same as autocomplete: the substring search starts at 3 characters
+                index.search(type=t_type, text=text, limit=5, contains=len(text) > 2)
+        print(f"{text!r}: {(perf_counter() - t) / repeat * 1000:.3f}ms per keystroke ({len(TYPES)} types)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,40 @@
+"""Time the Sankey construction of the path analysis (product_analytics.__transform_journey) on synthetic journey rows:
+n_steps steps of rows_per_step (event, next event) pairs, streamed as the path analysis cursor would be.
+Run from api, with the api env loaded:
+    python -m benchmarks.path_analysis [n_steps] [rows_per_step]
+A card query returns at most density x eventThresholdNumberInGroup rows (80 at the density limit of 10), the default
+sizes are far above that to time the node lookups: on 10k rows, the list based version took 6.9s, the dict based one
+0.09s. The cost of the chained step queries themselves is not measured here."""
+import random
+import sys
+from time import perf_counter
+
+from chalicelib.core import product_analytics
+
+transform_journey = getattr(product_analytics, "__transform_journey")
+
+
+def make_rows(n_steps: int, rows_per_step: int, seed: int = 0):
+    rnd = random.Random(seed)
+    for step in range(1, n_steps + 1):
+        for _ in range(rows_per_step):
+            yield {"event_number_in_session": step, "event_type": "LOCATION",
+                   "e_value": f"/page{rnd.randrange(rows_per_step)}",
+                   "next_type": "LOCATION",
+                   "next_value": f"/page{rnd.randrange(rows_per_step)}" if step < n_steps else None,
+                   "sessions_count": rnd.randrange(1, 100),
+                   "avg_time_from_previous": rnd.choice([None, 10, 20])}
+
+
+def run(n_steps: int, rows_per_step: int):
+    rows = list(make_rows(n_steps, rows_per_step))
+    t = perf_counter()
+    result = transform_journey(iter(rows))
+    t_transform = perf_counter() - t
+    print(f"{len(rows)} rows ({n_steps} steps of {rows_per_step})")
+    print(f"__transform_journey: {t_transform:.3f}s ({len(result['nodes'])} nodes, {len(result['links'])} links)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,64 @@
+"""Time the funnel issues computation (significance.get_funnel_columns, get_stages, get_issues) on synthetic funnel
+rows: sessions going through n_stages stages, with 0 to 3 issues each and a long tail of issue ids.
+Run from api, with the api env loaded:
+    python -m benchmarks.significance [n_sessions] [n_issues] [n_stages]
+On 40k sessions (64k rows), 300 issues and 4 stages, the row by row version took 12.3s, the numpy one 0.27s."""
+import random
+import sys
+import warnings
+from time import perf_counter
+
+import schemas
+from chalicelib.core import significance
+
+
+def make_rows(n_sessions: int, n_issues: int, n_stages: int, seed: int = 0):
+    rnd = random.Random(seed)
+    rows = []
+    for session_id in range(n_sessions):
+        timestamp = 1000 + rnd.randint(0, 100)
+        timestamps = []
+        for i in range(n_stages):
+            if i > 0 and (timestamps[-1] is None or rnd.random() < 0.3):
+                timestamps.append(None)
+            else:
+                timestamp += rnd.randint(1, 100)
+                timestamps.append(timestamp)
+        row = {f"stage{i + 1}_timestamp": t for i, t in enumerate(timestamps)}
+        row["session_id"] = session_id
+        row["user_uuid"] = None if rnd.random() < 0.2 else f"u{rnd.randint(0, n_sessions // 3)}"
+        n_session_issues = rnd.choice([0, 0, 1, 2, 3])
+        if n_session_issues == 0:
+            rows.append({**row, "issue_id": None, "issue_type": None, "issue_timestamp": None, "issue_context": None})
+        for _ in range(n_session_issues):
+            issue_id = f"i{int(rnd.paretovariate(1.2)) % n_issues}"
+            rows.append({**row, "issue_id": issue_id, "issue_type": "click_rage", "issue_context": issue_id,
+                         "issue_timestamp": timestamps[0] + rnd.randint(-5, 400)})
+    return rows
+
+
+def run(n_sessions: int, n_issues: int, n_stages: int):
+    rows = make_rows(n_sessions, n_issues, n_stages)
+    stages = [schemas.SessionSearchEventSchema2(type=schemas.EventType.location, value=[f"/step{i}"],
+                                                operator=schemas.SearchEventOperator._is)
+              for i in range(n_stages)]
+    t = perf_counter()
+    columns = significance.get_funnel_columns(rows, n_stages)
+    t_columns = perf_counter() - t
+
+    t = perf_counter()
+    significance.get_stages(stages, columns)
+    n_critical, issues, _ = significance.get_issues(stages, columns)
+    t_issues = perf_counter() - t
+
+    print(f"{n_sessions} sessions, {len(rows)} rows, {n_issues} issues, {n_stages} stages")
+    print(f"get_funnel_columns: {t_columns:.3f}s")
+    print(f"get_stages+get_issues: {t_issues:.3f}s ({len(issues['significant'])} significant issues)")
+
+
+if __name__ == "__main__":
+    # the correlation of constant columns warns, they are reported as not significant
+    warnings.simplefilter("ignore")
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 40000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 300,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 4)
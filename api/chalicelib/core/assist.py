@@ -1,17 +1,31 @@
 from os import access, R_OK
-from os.path import exists as path_exists, getsize
+from os.path import exists as path_exists
 
 import jwt
 import requests
 from decouple import config
 from fastapi import HTTPException, status
+from requests.adapters import HTTPAdapter
 
 import schemas
 from chalicelib.core import projects
 from chalicelib.utils.TimeUTC import TimeUTC
+from chalicelib.utils.ttl_cache import TTLCache
 
 ASSIST_KEY = config("ASSIST_KEY")
 ASSIST_URL = config("ASSIST_URL") % ASSIST_KEY
+ASSIST_TIMEOUT = config("assistTimeout", cast=int, default=5)
+# the live sessions of a project are listed once for all the checks of the next LIVE_CACHE_TTL seconds
+LIVE_CACHE_TTL = config("ASSIST_LIVE_CACHE_TTL", cast=int, default=5)
+
+# keep-alive connections to assist, shared by the API threads
+__session = requests.Session()
+__session.mount("http://", HTTPAdapter(pool_maxsize=config("ASSIST_POOL_SIZE", cast=int, default=20)))
+__session.mount("https://", HTTPAdapter(pool_maxsize=config("ASSIST_POOL_SIZE", cast=int, default=20)))
+__project_keys = TTLCache(name="assist_project_keys",
+                          ttl=config("ASSIST_PROJECT_KEY_CACHE_TTL", cast=int, default=300), max_size=10000)
+__live_sessions = TTLCache(name="assist_live_sessions", ttl=LIVE_CACHE_TTL, max_size=1000)
+
 SESSION_PROJECTION_COLS = """s.project_id,
                            s.session_id::text AS session_id,
                            s.user_uuid,
@@ -28,6 +42,14 @@ SESSION_PROJECTION_COLS = """s.project_id,
                            """
 
 
+def __get_project_key(project_id):
+    found, project_key = __project_keys.get(project_id)
+    if not found:
+        project_key = projects.get_project_key(project_id)
+        __project_keys.set(project_id, project_key)
+    return project_key
+
+
 def get_live_sessions_ws_user_id(project_id, user_id):
     data = {
         "filter": {"userId": user_id} if user_id else {}
@@ -51,10 +73,10 @@ def get_live_sessions_ws(project_id, body: schemas.LiveSessionsSearchPayloadSche
 
 
 def __get_live_sessions_ws(project_id, data):
-    project_key = projects.get_project_key(project_id)
+    project_key = __get_project_key(project_id)
     try:
-        results = requests.post(ASSIST_URL + config("assist") + f"/{project_key}",
-                                json=data, timeout=config("assistTimeout", cast=int, default=5))
+        results = __session.post(ASSIST_URL + config("assist") + f"/{project_key}",
+                                 json=data, timeout=ASSIST_TIMEOUT)
         if results.status_code != 200:
             print(f"!! issue with the peer-server code:{results.status_code} for __get_live_sessions_ws")
             print(results.text)
@@ -101,10 +123,10 @@ def __get_agent_token(project_id, project_key, session_id):
 
 
 def get_live_session_by_id(project_id, session_id):
-    project_key = projects.get_project_key(project_id)
+    project_key = __get_project_key(project_id)
     try:
-        results = requests.get(ASSIST_URL + config("assist") + f"/{project_key}/{session_id}",
-                               timeout=config("assistTimeout", cast=int, default=5))
+        results = __session.get(ASSIST_URL + config("assist") + f"/{project_key}/{session_id}",
+                                timeout=ASSIST_TIMEOUT)
         if results.status_code != 200:
             print(f"!! issue with the peer-server code:{results.status_code} for get_live_session_by_id")
             print(results.text)
@@ -129,20 +151,26 @@ def get_live_session_by_id(project_id, session_id):
     return results
 
 
-def is_live(project_id, session_id, project_key=None):
+def get_live_sessions_ids(project_id, project_key=None):
+    """
+    Returns the ids of the live sessions of the project, from the cache if they were listed
+    less than LIVE_CACHE_TTL seconds ago; None if assist couldn't be reached
+    """
+    found, sessions_ids = __live_sessions.get(project_id)
+    if found:
+        return sessions_ids
     if project_key is None:
-        project_key = projects.get_project_key(project_id)
+        project_key = __get_project_key(project_id)
     try:
-        results = requests.get(ASSIST_URL + config("assistList") + f"/{project_key}/{session_id}",
-                               timeout=config("assistTimeout", cast=int, default=5))
+        results = __session.get(ASSIST_URL + config("assistList") + f"/{project_key}", timeout=ASSIST_TIMEOUT)
         if results.status_code != 200:
-            print(f"!! issue with the peer-server code:{results.status_code} for is_live")
+            print(f"!! issue with the peer-server code:{results.status_code} for get_live_sessions_ids")
             print(results.text)
-            return False
-        results = results.json().get("data")
+            return None
+        results = results.json().get("data") or {}
     except requests.exceptions.Timeout:
         print("!! Timeout getting Assist response")
-        return False
+        return None
     except Exception as e:
         print("!! Issue getting Assist response")
         print(str(e))
@@ -151,19 +179,27 @@ def is_live(project_id, session_id, project_key=None):
             print(results.text)
         except:
             print("couldn't get response")
-        return False
-    return str(session_id) == results
+        return None
+    sessions_ids = {str(s) for s in results.get("sessions", [])}
+    __live_sessions.set(project_id, sessions_ids)
+    return sessions_ids
+
+
+def is_live(project_id, session_id, project_key=None):
+    # answered from the cached list: a session can still be seen live up to LIVE_CACHE_TTL seconds after it ended
+    live_ids = get_live_sessions_ids(project_id=project_id, project_key=project_key) or set()
+    return str(session_id) in live_ids
 
 
 def autocomplete(project_id, q: str, key: str = None):
-    project_key = projects.get_project_key(project_id)
+    project_key = __get_project_key(project_id)
     params = {"q": q}
     if key:
         params["key"] = key
     try:
-        results = requests.get(
+        results = __session.get(
             ASSIST_URL + config("assistList") + f"/{project_key}/autocomplete",
-            params=params, timeout=config("assistTimeout", cast=int, default=5))
+            params=params, timeout=ASSIST_TIMEOUT)
         if results.status_code != 200:
             print(f"!! issue with the peer-server code:{results.status_code} for autocomplete")
             print(results.text)
@@ -215,9 +251,6 @@ def get_raw_mob_by_id(project_id, session_id):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail=f"Replay file found under: {efs_path};" +
                                        " but it is not readable, please check permissions")
-        # getsize return size in bytes, UNPROCESSED_MAX_SIZE is in Kb
-        if (getsize(path_to_file) / 1000) >= config("UNPROCESSED_MAX_SIZE", cast=int, default=200 * 1000):
-            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Replay file too large")
         return path_to_file
 
     return None
@@ -243,10 +276,11 @@ def get_raw_devtools_by_id(project_id, session_id):
 
 
 def session_exists(project_id, session_id):
-    project_key = projects.get_project_key(project_id)
+    # guards the files of the unprocessed sessions: assist is always asked, not the cached list of live sessions
+    project_key = __get_project_key(project_id)
     try:
-        results = requests.get(ASSIST_URL + config("assist") + f"/{project_key}/{session_id}",
-                               timeout=config("assistTimeout", cast=int, default=5))
+        results = __session.get(ASSIST_URL + config("assist") + f"/{project_key}/{session_id}",
+                                timeout=ASSIST_TIMEOUT)
         if results.status_code != 200:
             print(f"!! issue with the peer-server code:{results.status_code} for session_exists")
             print(results.text)
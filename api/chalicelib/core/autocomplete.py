@@ -1,5 +1,5 @@
 import schemas
-from chalicelib.core import countries, events, metadata
+from chalicelib.core import autocomplete_index, countries, events, metadata
 from chalicelib.utils import helper
 from chalicelib.utils import pg_client
 from chalicelib.utils.event_filter_definition import Event
@@ -21,6 +21,17 @@ def __get_autocomplete_table(value, project_id):
                            schemas.EventType.location,
                            schemas.EventType.input]
     autocomplete_events.sort()
+    index = autocomplete_index.get(project_id=project_id, text=value)
+    if index is not None:
+        results = []
+        for e in autocomplete_events:
+            if e == schemas.FilterType.user_country:
+                values = index.in_values(type=e.value.upper(),
+                                         values=countries.get_country_code_autocomplete(value))
+            else:
+                values = index.search(type=e.value.upper(), text=value, limit=5, contains=len(value) > 2)
+            results += [{"value": v, "type": e.value} for v in values]
+        return results
     sub_queries = []
     c_list = []
     for e in autocomplete_events:
@@ -109,8 +120,25 @@ def __generic_query(typename, value_length=None):
                 LIMIT 10;"""
 
 
+def __search_index(project_id, typename, value):
+    index = autocomplete_index.get(project_id=project_id, text=value)
+    if index is None:
+        return None
+    typename = typename.upper()
+    if typename == schemas.FilterType.user_country.upper():
+        values = index.in_values(type=typename, values=countries.get_country_code_autocomplete(value))
+    elif len(value) > 2:
+        values = index.search(type=typename, text=value, limit=5)
+    else:
+        values = index.search(type=typename, text=value, limit=10, contains=False)
+    return [{"value": v, "type": typename} for v in values]
+
+
 def __generic_autocomplete(event: Event):
     def f(project_id, value, key=None, source=None):
+        rows = __search_index(project_id=project_id, typename=event.ui_type, value=value)
+        if rows is not None:
+            return rows
         with pg_client.PostgresClient() as cur:
             query = __generic_query(event.ui_type, value_length=len(value))
             params = {"project_id": project_id, "value": helper.string_to_sql_like(value),
@@ -123,6 +151,9 @@ def __generic_autocomplete(event: Event):
 
 def __generic_autocomplete_metas(typename):
     def f(project_id, text):
+        rows = __search_index(project_id=project_id, typename=typename, value=text)
+        if rows is not None:
+            return rows
         with pg_client.PostgresClient() as cur:
             params = {"project_id": project_id, "value": helper.string_to_sql_like(text),
                       "svalue": helper.string_to_sql_like("^" + text)}
@@ -0,0 +1,132 @@
+import heapq
+import logging
+import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from threading import Lock
+from time import time
+
+from decouple import config
+
+from chalicelib.utils import pg_client
+
+logger = logging.getLogger(__name__)
+
+ENABLED = config("AUTOCOMPLETE_INDEX_ENABLED", cast=bool, default=True)
+# the index of a project is reloaded in the background once it is older than TTL, the old one is used meanwhile
+TTL = config("AUTOCOMPLETE_INDEX_TTL", cast=int, default=300)
+# the projects with more values are searched with SQL
+MAX_VALUES = config("AUTOCOMPLETE_INDEX_MAX_VALUES", cast=int, default=50000)
+MAX_PROJECTS = config("AUTOCOMPLETE_INDEX_MAX_PROJECTS", cast=int, default=50)
+# the texts using the wildcards of helper.string_to_sql_like are searched with SQL
+__wildcards = re.compile(r"[*%_$^\\]")
+
+__executor = ThreadPoolExecutor(max_workers=config("AUTOCOMPLETE_INDEX_WORKERS", cast=int, default=2))
+# LRU of the loaded indexes: {project_id: (loaded_at, ProjectIndex)}
+__indexes = OrderedDict()
+__loading = set()
+__lock = Lock()
+
+
+class ProjectIndex:
+    # The values of public.autocomplete of a project, by type, in the order of the database collation
+    # (rows ordered by value), so the first matches are the ones the ORDER BY value LIMIT queries return
+    def __init__(self, rows):
+        self.values = {}
+        # the lowercase values of a type sorted for the prefix search, with the position of each one in values
+        self.keys = {}
+        self.ranks = {}
+        # the lowercase values of a type (in values order) joined by new lines and the offset of each one,
+        # for the substring search
+        self.texts = {}
+        self.offsets = {}
+        for r in rows:
+            self.values.setdefault(r["type"], []).append(r["value"])
+        for t, values in self.values.items():
+            keys = [v.lower() for v in values]
+            self.ranks[t] = sorted(range(len(keys)), key=keys.__getitem__)
+            self.keys[t] = [keys[i] for i in self.ranks[t]]
+            self.texts[t] = "\n".join(keys)
+            self.offsets[t] = list(accumulate([len(k) + 1 for k in keys[:-1]], initial=0))
+
+    def starts_with(self, type, text, limit):
+        if type not in self.keys:
+            return []
+        keys = self.keys[type]
+        text = text.lower()
+        start = bisect_left(keys, text)
+        end = bisect_left(keys, text + chr(0x10FFFF), lo=start)
+        return [self.values[type][i] for i in heapq.nsmallest(limit, self.ranks[type][start:end])]
+
+    def contains(self, type, text, limit):
+        text = text.lower()
+        results = []
+        if type not in self.texts or "\n" in text:
+            return results
+        all_text, offsets = self.texts[type], self.offsets[type]
+        position = all_text.find(text)
+        while position >= 0 and len(results) < limit:
+            i = bisect_right(offsets, position) - 1
+            results.append(self.values[type][i])
+            # the next match is searched after the current value
+            position = all_text.find(text, offsets[i + 1] if i + 1 < len(offsets) else len(all_text))
+        return results
+
+    def search(self, type, text, limit, contains=True):
+        # same as the ILIKE '^text' and ILIKE 'text' queries of autocomplete, the duplicates are removed
+        text = re.sub(' +', ' ', text)
+        results = self.starts_with(type=type, text=text, limit=limit)
+        if contains:
+            for v in self.contains(type=type, text=text, limit=limit):
+                if v not in results:
+                    results.append(v)
+        return results
+
+    def in_values(self, type, values):
+        values = set(values)
+        return [v for v in self.values.get(type, []) if v in values]
+
+
+def __load(project_id):
+    try:
+        with pg_client.PostgresClient() as cur:
+            cur.execute(cur.mogrify("""SELECT type, value
+                                       FROM public.autocomplete
+                                       WHERE project_id = %(project_id)s
+                                       ORDER BY value
+                                       LIMIT %(limit)s;""",
+                                    {"project_id": project_id, "limit": MAX_VALUES + 1}))
+            rows = cur.fetchall()
+        # too many values: None is kept to not reload the project before TTL
+        index = ProjectIndex(rows) if len(rows) <= MAX_VALUES else None
+        with __lock:
+            __indexes[project_id] = (time(), index)
+            __indexes.move_to_end(project_id)
+            while len(__indexes) > MAX_PROJECTS:
+                __indexes.popitem(last=False)
+        logger.debug(f"autocomplete index of project {project_id} loaded: {len(rows)} values")
+    except Exception as e:
+        logger.warning(f"!! couldn't load the autocomplete index of project {project_id}")
+        logger.warning(e)
+    finally:
+        with __lock:
+            __loading.discard(project_id)
+
+
+def get(project_id, text) -> ProjectIndex | None:
+    """
+    Returns the index of the project to search text in, or None if SQL should be used:
+    the index is disabled, not loaded yet (it is loaded in the background), too big or text has wildcards
+    """
+    if not ENABLED or __wildcards.search(text):
+        return None
+    with __lock:
+        loaded_at, index = __indexes.get(project_id, (None, None))
+        if loaded_at is not None:
+            __indexes.move_to_end(project_id)
+        if (loaded_at is None or loaded_at + TTL < time()) and project_id not in __loading:
+            __loading.add(project_id)
+            __executor.submit(__load, project_id)
+    return index
@@ -69,8 +69,7 @@ def search_short_session(data: schemas.ClickMapSessionsSearch, project_id, user_
         session = cur.fetchone()
     if session:
         if include_mobs:
-            session['domURL'] = sessions_mobs.get_urls(session_id=session["session_id"], project_id=project_id)
-            session['mobsUrl'] = sessions_mobs.get_urls_depercated(session_id=session["session_id"])
+            session.update(sessions_mobs.get_replay_urls(project_id=project_id, session_id=session["session_id"]))
         session['events'] = events.get_by_session_id(project_id=project_id, session_id=session["session_id"],
                                                      event_type=schemas.EventType.location)
 
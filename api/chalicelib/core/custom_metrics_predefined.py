@@ -1,13 +1,15 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
-import logging
-from typing import Union
+from decouple import config
 
 import schemas
 from chalicelib.core import metrics
 
 logger = logging.getLogger(__name__)
+# Each worker holds a PG/CH connection while its metric is computed
+__executor = ThreadPoolExecutor(max_workers=config("METRICS_BATCH_WORKERS", cast=int, default=4))
 
 
 def get_metric(key: Union[schemas.MetricOfWebVitals, schemas.MetricOfErrors, \
@@ -59,3 +61,18 @@ def get_metric(key: Union[schemas.MetricOfWebVitals, schemas.MetricOfErrors, \
                  schemas.MetricOfResources.resources_count_by_type: metrics.get_resources_count_by_type, }
 
     return supported.get(key, lambda *args: None)(project_id=project_id, **data)
+
+
+def get_metrics(keys: list, project_id: int, data: dict):
+    # Computes several predefined metrics with the same filters, returns {key: result}
+    # The metrics reading the same columns of the pages share their queries, the others run concurrently
+    keys = list(dict.fromkeys(keys))
+    shared = [k for k in keys if k in metrics.PAGES_AVG_METRICS]
+    tasks = [__executor.submit(get_metric, key=k, project_id=project_id, data=data)
+             for k in keys if k not in shared or len(shared) == 1]
+    results = {}
+    if len(shared) > 1:
+        results = metrics.get_pages_avg_metrics(project_id=project_id, keys=shared, **data)
+    for k, t in zip([k for k in keys if k not in results], tasks):
+        results[k] = t.result()
+    return {k: results[k] for k in keys}
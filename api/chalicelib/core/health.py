@@ -4,7 +4,7 @@ import redis
 import requests
 from decouple import config
 
-from chalicelib.utils import pg_client
+from chalicelib.utils import pg_client, ttl_cache
 from chalicelib.utils.TimeUTC import TimeUTC
 
 
@@ -61,6 +61,9 @@ def __check_database_pg(*_):
         "details": {
             # "version": server_version["server_version"],
             # "schema": schema_version["version"]
+            "pools": pg_client.pool_stats(),
+            # hits/misses of the authorizers' users/projects caches, these would be PG queries otherwise
+            "caches": ttl_cache.stats()
         }
     }
 
@@ -1,31 +1,10 @@
-import math
-
 import schemas
 from chalicelib.core import metadata
 from chalicelib.utils import args_transformer
 from chalicelib.utils import helper
 from chalicelib.utils import pg_client
 from chalicelib.utils.TimeUTC import TimeUTC
-from chalicelib.utils.metrics_helper import __get_step_size
-
-
-# Written by David Aznaurov, inspired by numpy.quantile
-def __quantiles(a, q, interpolation='higher'):
-    arr = a.copy()
-    arr = sorted(arr)
-    if isinstance(q, list):
-        ind = [qi * (len(arr) - 1) for qi in q]
-    else:
-        ind = q * (len(arr) - 1)
-    if interpolation == 'higher':
-        if isinstance(q, list):
-            ind = [math.ceil(i) for i in ind]
-        else:
-            ind = math.ceil(ind)
-    if isinstance(q, list):
-        return [arr[i] for i in ind]
-    else:
-        return arr[ind]
+from chalicelib.utils.metrics_helper import __get_step_size, __get_histogram_params, __get_histogram_chart
 
 
 def __get_constraints(project_id, time_constraint=True, chart=False, duration=True, project=True,
@@ -1136,43 +1115,24 @@ def get_pages_response_time_distribution(project_id, startTimestamp=TimeUTC.now(
     pg_sub_query = __get_constraints(project_id=project_id, data=args)
     pg_sub_query.append("pages.response_time IS NOT NULL")
     pg_sub_query.append("pages.response_time>0")
+    quantiles_keys = [50, 90, 95, 99]
+    params = {"project_id": project_id, "startTimestamp": startTimestamp, "endTimestamp": endTimestamp,
+              "quantiles": [i / 100 for i in quantiles_keys], **__get_constraint_values(args)}
 
     with pg_client.PostgresClient() as cur:
-        pg_query = f"""SELECT pages.response_time AS response_time,
-                              COUNT(pages.session_id) AS count
-                        FROM events.pages INNER JOIN public.sessions USING (session_id)
-                        WHERE {" AND ".join(pg_sub_query)} 
-                        GROUP BY response_time
-                        ORDER BY pages.response_time;"""
-        cur.execute(cur.mogrify(pg_query, {"project_id": project_id,
-                                           "startTimestamp": startTimestamp,
-                                           "endTimestamp": endTimestamp, **__get_constraint_values(args)}))
-        rows = cur.fetchall()
-        pg_query = f"""SELECT COALESCE(AVG(pages.response_time),0) AS avg
+        pg_query = f"""SELECT COALESCE(AVG(pages.response_time),0) AS avg,
+                              COUNT(1) AS total,
+                              MIN(pages.response_time) AS min_value,
+                              percentile_disc(%(quantiles)s::FLOAT[]) 
+                                    WITHIN GROUP (ORDER BY pages.response_time) AS quantiles
                         FROM events.pages INNER JOIN public.sessions USING (session_id)
                         WHERE {" AND ".join(pg_sub_query)};"""
-        cur.execute(cur.mogrify(pg_query, {"project_id": project_id,
-                                           "startTimestamp": startTimestamp,
-                                           "endTimestamp": endTimestamp, **__get_constraint_values(args)}))
-        avg = cur.fetchone()["avg"]
-        quantiles_keys = [50, 90, 95, 99]
-        pg_query = f"""SELECT pages.response_time AS value
-                        FROM events.pages INNER JOIN public.sessions USING (session_id)
-                        WHERE {" AND ".join(pg_sub_query)};"""
-        cur.execute(cur.mogrify(pg_query, {"project_id": project_id,
-                                           "startTimestamp": startTimestamp,
-                                           "endTimestamp": endTimestamp, **__get_constraint_values(args)}))
-        response_times = cur.fetchall()
-        response_times = [i["value"] for i in response_times]
-        if len(response_times) > 0:
-            quantiles = __quantiles(a=response_times,
-                                    q=[i / 100 for i in quantiles_keys],
-                                    interpolation='higher')
-        else:
-            quantiles = [0 for i in range(len(quantiles_keys))]
+        cur.execute(cur.mogrify(pg_query, params))
+        stats = cur.fetchone()
+        quantiles = stats["quantiles"] if stats["total"] > 0 else [0 for i in range(len(quantiles_keys))]
         result = {
-            "value": avg,
-            "total": sum(r["count"] for r in rows),
+            "value": stats["avg"],
+            "total": stats["total"],
             "chart": [],
             "percentiles": [{
                 "percentile": float(v),
@@ -1182,70 +1142,28 @@ def get_pages_response_time_distribution(project_id, startTimestamp=TimeUTC.now(
             "extremeValues": [{"count": 0}],
             "unit": schemas.TemplatePredefinedUnits.millisecond
         }
-        rows = helper.list_to_camel_case(rows)
-        _99 = result["percentiles"][-1]["responseTime"]
-        extreme_values_first_index = -1
-        for i, r in enumerate(rows):
-            if r["responseTime"] > _99:
-                extreme_values_first_index = i
-                break
-
-        if extreme_values_first_index >= 0:
-            extreme_values_first_index += 1
-            result["extremeValues"][0]["count"] = sum(r["count"] for r in rows[extreme_values_first_index:])
-            rows = rows[:extreme_values_first_index]
-
-        # ------- Merge points to reduce chart length till density
+        if stats["total"] == 0:
+            return result
+
+        # ------- Group the values up to the 99th percentile in density bins, the rest are the extreme values
         if density < len(quantiles_keys):
             density = len(quantiles_keys)
-
-        while len(rows) > density:
-            true_length = len(rows)
-            rows_partitions = []
-            offset = 0
-            for p in result["percentiles"]:
-                rows_partitions.append([])
-                for r in rows[offset:]:
-                    if r["responseTime"] < p["responseTime"]:
-                        rows_partitions[-1].append(r)
-                        offset += 1
-                    else:
-                        break
-            rows_partitions.append(rows[offset:])
-
-            largest_partition = 0
-            for i in range(len(rows_partitions)):
-                if len(rows_partitions[i]) > len(rows_partitions[largest_partition]):
-                    largest_partition = i
-
-            if len(rows_partitions[largest_partition]) <= 2:
-                break
-            # computing lowest merge diff
-            diff = rows[-1]["responseTime"]
-            for i in range(1, len(rows_partitions[largest_partition]) - 1, 1):
-                v1 = rows_partitions[largest_partition][i]
-                v2 = rows_partitions[largest_partition][i + 1]
-                if (v2["responseTime"] - v1["responseTime"]) < diff:
-                    diff = v2["responseTime"] - v1["responseTime"]
-
-            i = 1
-            while i < len(rows_partitions[largest_partition]) - 1 and true_length > density - 1:
-                v1 = rows_partitions[largest_partition][i]
-                v2 = rows_partitions[largest_partition][i + 1]
-                if (v2["responseTime"] - v1["responseTime"]) == diff:
-                    rows_partitions[largest_partition][i]["count"] += v2["count"]
-                    rows_partitions[largest_partition][i]["responseTime"] = v2["responseTime"]
-                    del rows_partitions[largest_partition][i + 1]
-                    true_length -= 1
-                else:
-                    i += 1
-
-            rows = [r for rp in rows_partitions for r in rp]
-
-        if extreme_values_first_index == len(rows):
-            rows.append({"count": 0, "responseTime": rows[-1]["responseTime"] + 10})
-
-        result["chart"] = rows
+        params = {**params, **__get_histogram_params(min_value=stats["min_value"],
+                                                     max_value=result["percentiles"][-1]["responseTime"],
+                                                     density=density)}
+        pg_query = f"""SELECT CASE WHEN pages.response_time > %(histogram_max)s THEN %(histogram_bins)s
+                                   ELSE LEAST((pages.response_time - %(histogram_min)s) / %(histogram_step)s,
+                                              %(histogram_bins)s - 1) END AS bucket,
+                              MAX(pages.response_time) AS value,
+                              COUNT(1) AS count
+                        FROM events.pages INNER JOIN public.sessions USING (session_id)
+                        WHERE {" AND ".join(pg_sub_query)}
+                        GROUP BY bucket
+                        ORDER BY bucket;"""
+        cur.execute(cur.mogrify(pg_query, params))
+        rows = cur.fetchall()
+    result["chart"], result["extremeValues"][0]["count"] = __get_histogram_chart(rows=rows, density=density,
+                                                                                 value_key="responseTime")
     return result
 
 
@@ -2871,6 +2789,62 @@ def get_top_metrics_avg_time_to_interactive(project_id, startTimestamp=TimeUTC.n
     helper.__time_value(row)
     return helper.dict_to_camel_case(row)
 
+# The get_top_metrics_avg_* widgets: the average of a column of the pages and its chart, ignoring the values <= 0
+PAGES_AVG_METRICS = {schemas.MetricOfWebVitals.avg_response_time: "response_time",
+                     schemas.MetricOfWebVitals.avg_first_paint: "first_paint_time",
+                     schemas.MetricOfWebVitals.avg_dom_content_loaded: "dom_content_loaded_time",
+                     schemas.MetricOfWebVitals.avg_till_first_byte: "ttfb",
+                     schemas.MetricOfWebVitals.avg_time_to_interactive: "time_to_interactive"}
+
+
+def get_pages_avg_metrics(project_id, keys, startTimestamp=TimeUTC.now(delta_days=-1),
+                          endTimestamp=TimeUTC.now(), value=None, density=20, **args):
+    # Computes the PAGES_AVG_METRICS of keys with one scan of the pages for the values and one for the charts
+    columns = list(dict.fromkeys(PAGES_AVG_METRICS[k] for k in keys))
+    step_size = __get_step_size(startTimestamp, endTimestamp, density, factor=1)
+    pg_sub_query = __get_constraints(project_id=project_id, data=args)
+    pg_sub_query_chart = __get_constraints(project_id=project_id, time_constraint=True,
+                                           chart=True, data=args)
+    any_value = "(" + " OR ".join([f"pages.{c} > 0" for c in columns]) + ")"
+    pg_sub_query.append(any_value)
+    pg_sub_query_chart.append(any_value)
+    if value is not None:
+        pg_sub_query.append("pages.path = %(value)s")
+        pg_sub_query_chart.append("pages.path = %(value)s")
+    averages = ",".join([f"COALESCE(AVG(pages.{c}) FILTER (WHERE pages.{c} > 0), 0) AS avg_{c}" for c in columns])
+    with pg_client.PostgresClient() as cur:
+        pg_query = f"""SELECT {averages}
+                       FROM events.pages
+                                INNER JOIN public.sessions USING (session_id)
+                       WHERE {" AND ".join(pg_sub_query)}
+                         AND pages.timestamp >= %(startTimestamp)s
+                         AND pages.timestamp < %(endTimestamp)s;"""
+        params = {"step_size": step_size, "project_id": project_id,
+                  "startTimestamp": startTimestamp,
+                  "endTimestamp": endTimestamp,
+                  "value": value, **__get_constraint_values(args)}
+        cur.execute(cur.mogrify(pg_query, params))
+        row = cur.fetchone()
+        pg_query = f"""SELECT generated_timestamp AS timestamp,
+                              {averages}
+                        FROM generate_series(%(startTimestamp)s, %(endTimestamp)s, %(step_size)s) AS generated_timestamp 
+                            LEFT JOIN LATERAL (
+                                SELECT {",".join(columns)} 
+                                FROM events.pages INNER JOIN public.sessions USING (session_id)
+                                WHERE {" AND ".join(pg_sub_query_chart)}
+                        ) AS pages ON (TRUE)
+                        GROUP BY generated_timestamp
+                        ORDER BY generated_timestamp ASC;"""
+        cur.execute(cur.mogrify(pg_query, params))
+        rows = cur.fetchall()
+    results = {}
+    for k in keys:
+        c = PAGES_AVG_METRICS[k]
+        results[k] = {"value": row[f"avg_{c}"],
+                      "chart": [{"timestamp": r["timestamp"], "value": r[f"avg_{c}"]} for r in rows]}
+        helper.__time_value(results[k])
+    return results
+
 
 def get_top_metrics_count_requests(project_id, startTimestamp=TimeUTC.now(delta_days=-1),
                                    endTimestamp=TimeUTC.now(), value=None, density=20, **args):
@@ -5,9 +5,17 @@ from fastapi import HTTPException, status
 
 import schemas
 from chalicelib.core import users
-from chalicelib.utils import pg_client, helper
+from chalicelib.utils import pg_client, helper, ttl_cache
 from chalicelib.utils.TimeUTC import TimeUTC
 
+# Short-lived copies of the projects read by the authorizer on every request, dropped by the write paths below
+PROJECTS_CACHE = ttl_cache.get_cache("projects")
+
+
+def invalidate_cache(project_id):
+    project_id = int(project_id)
+    PROJECTS_CACHE.invalidate(lambda k, v: k[1] == project_id or isinstance(v, dict) and v["projectId"] == project_id)
+
 
 def __exists_by_name(name: str, exclude_id: Optional[int]) -> bool:
     with pg_client.PostgresClient() as cur:
@@ -38,7 +46,9 @@ def __update(tenant_id, project_id, changes):
                                 RETURNING project_id,name,gdpr;""",
                             {"project_id": project_id, **changes})
         cur.execute(query=query)
-        return helper.dict_to_camel_case(cur.fetchone())
+        row = cur.fetchone()
+    invalidate_cache(project_id)
+    return helper.dict_to_camel_case(row)
 
 
 def __create(tenant_id, data):
@@ -164,6 +174,7 @@ def delete(tenant_id, user_id, project_id):
                                WHERE project_id = %(project_id)s;""",
                             {"project_id": project_id})
         cur.execute(query=query)
+    invalidate_cache(project_id)
     return {"data": {"state": "success"}}
 
 
@@ -212,6 +223,27 @@ def get_by_project_key(project_key):
         return helper.dict_to_camel_case(row)
 
 
+def get_project_cached(tenant_id, project_id):
+    # The authorizer's get_project, only found projects are kept so a new project is visible right away
+    key = ("id", int(project_id), tenant_id)
+    found, row = PROJECTS_CACHE.get(key)
+    if not found:
+        row = get_project(tenant_id=tenant_id, project_id=project_id)
+        if row is not None:
+            PROJECTS_CACHE.set(key, row)
+    return row
+
+
+def get_by_project_key_cached(project_key):
+    key = ("key", project_key)
+    found, row = PROJECTS_CACHE.get(key)
+    if not found:
+        row = get_by_project_key(project_key=project_key)
+        if row is not None:
+            PROJECTS_CACHE.set(key, row)
+    return row
+
+
 def get_project_key(project_id):
     with pg_client.PostgresClient() as cur:
         query = cur.mogrify("""SELECT project_key
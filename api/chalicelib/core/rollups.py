@@ -0,0 +1,190 @@
+import logging
+
+from decouple import config
+
+import schemas
+from chalicelib.utils import pg_client
+from chalicelib.utils.TimeUTC import TimeUTC
+
+logger = logging.getLogger(__name__)
+
+ENABLED = config("ROLLUPS_ENABLED", cast=bool, default=False)
+# the events ingested more than DELAY after their timestamp are not counted by the rollups
+DELAY = config("ROLLUPS_DELAY", cast=int, default=5) * 60 * 1000
+# the longest alert period is 24h
+RETENTION = config("ROLLUPS_RETENTION", cast=int, default=2 * 24 * 60) * 60 * 1000
+BUCKET = 60 * 1000
+
+# the alias of each source table in the queries
+TABLES = {"events.pages": "pages", "events.resources": "resources"}
+
+# The metrics that can be rebuilt from the count&sum of a value per project and per minute.
+# value: the aggregated expression, NULL for the rows that are not part of the metric
+# aggregate: avg (sum/count) or count
+METRICS = {
+    schemas.AlertColumn.performance__dom_content_loaded__average: {
+        "table": "events.pages", "value": "NULLIF(dom_content_loaded_time,0)", "aggregate": "avg"},
+    schemas.AlertColumn.performance__first_meaningful_paint__average: {
+        "table": "events.pages", "value": "NULLIF(first_contentful_paint_time,0)", "aggregate": "avg"},
+    schemas.AlertColumn.performance__page_load_time__average: {
+        "table": "events.pages", "value": "NULLIF(load_time,0)", "aggregate": "avg"},
+    schemas.AlertColumn.performance__dom_build_time__average: {
+        "table": "events.pages", "value": "NULLIF(dom_building_time,0)", "aggregate": "avg"},
+    schemas.AlertColumn.performance__speed_index__average: {
+        "table": "events.pages", "value": "NULLIF(speed_index,0)", "aggregate": "avg"},
+    schemas.AlertColumn.performance__page_response_time__average: {
+        "table": "events.pages", "value": "NULLIF(response_time,0)", "aggregate": "avg"},
+    schemas.AlertColumn.performance__ttfb__average: {
+        "table": "events.pages", "value": "NULLIF(first_paint_time,0)", "aggregate": "avg"},
+    schemas.AlertColumn.performance__time_to_render__average: {
+        "table": "events.pages", "value": "NULLIF(visually_complete,0)", "aggregate": "avg"},
+    schemas.AlertColumn.performance__image_load_time__average: {
+        "table": "events.resources", "value": "CASE WHEN type='img' THEN NULLIF(resources.duration,0) END",
+        "aggregate": "avg"},
+    schemas.AlertColumn.performance__request_load_time__average: {
+        "table": "events.resources", "value": "CASE WHEN type='fetch' THEN NULLIF(resources.duration,0) END",
+        "aggregate": "avg"},
+    schemas.AlertColumn.resources__load_time__average: {
+        "table": "events.resources", "value": "NULLIF(resources.duration,0)", "aggregate": "avg"},
+    schemas.AlertColumn.errors__4xx_5xx__count: {
+        "table": "events.resources", "value": "CASE WHEN status/100!=2 THEN 1 END", "aggregate": "count"},
+    schemas.AlertColumn.errors__4xx__count: {
+        "table": "events.resources", "value": "CASE WHEN status/100=4 THEN 1 END", "aggregate": "count"},
+    schemas.AlertColumn.errors__5xx__count: {
+        "table": "events.resources", "value": "CASE WHEN status/100=5 THEN 1 END", "aggregate": "count"},
+}
+
+
+def __get_values_list(metrics):
+    return ", ".join([f"('{m.value}', ({METRICS[m]['value']})::double precision)" for m in metrics])
+
+
+def __get_table_metrics(table):
+    return [m for m in METRICS.keys() if METRICS[m]["table"] == table]
+
+
+def refresh():
+    """
+    Adds the events received since the last refresh to the rollups.
+    The rollups are bucketed by the minute of the session's start, so a window of sessions
+    can be answered exactly from the rollups plus the events received since the watermark.
+    """
+    to_timestamp = TimeUTC.now() - DELAY
+    to_timestamp -= to_timestamp % BUCKET
+    with pg_client.PostgresClient() as cur:
+        for table, alias in TABLES.items():
+            # the lock prevents concurrent refreshes from counting the same events twice
+            cur.execute(cur.mogrify("""SELECT watermark
+                                       FROM public.metrics_rollups_state
+                                       WHERE source_table = %(table)s
+                                           FOR UPDATE;""", {"table": table}))
+            row = cur.fetchone()
+            if row is None:
+                cur.execute(cur.mogrify("""INSERT INTO public.metrics_rollups_state (source_table, started_at, watermark)
+                                           VALUES (%(table)s, %(watermark)s, %(watermark)s)
+                                           ON CONFLICT (source_table) DO NOTHING;""",
+                                        {"table": table, "watermark": to_timestamp}))
+                continue
+            if row["watermark"] >= to_timestamp:
+                continue
+            params = {"table": table, "from_timestamp": row["watermark"], "to_timestamp": to_timestamp,
+                      "min_bucket": to_timestamp - RETENTION}
+            cur.execute(cur.mogrify(f"""\
+                INSERT INTO public.metrics_rollups (project_id, metric, bucket, values_count, values_sum)
+                SELECT sessions.project_id,
+                       m.metric,
+                       sessions.start_ts - sessions.start_ts %% {BUCKET} AS bucket,
+                       COUNT(m.value)                                 AS values_count,
+                       COALESCE(SUM(m.value), 0)                      AS values_sum
+                FROM {table} AS {alias}
+                         INNER JOIN public.sessions USING (session_id)
+                         CROSS JOIN LATERAL (VALUES {__get_values_list(__get_table_metrics(table))}) AS m(metric, value)
+                WHERE {alias}.timestamp >= %(from_timestamp)s
+                  AND {alias}.timestamp < %(to_timestamp)s
+                  AND sessions.start_ts >= %(min_bucket)s
+                GROUP BY sessions.project_id, m.metric, bucket
+                HAVING COUNT(m.value) > 0
+                ON CONFLICT (project_id, metric, bucket) DO UPDATE
+                    SET values_count = metrics_rollups.values_count + excluded.values_count,
+                        values_sum   = metrics_rollups.values_sum + excluded.values_sum;""", params))
+            cur.execute(cur.mogrify("""UPDATE public.metrics_rollups_state
+                                       SET watermark = %(to_timestamp)s
+                                       WHERE source_table = %(table)s;""", params))
+            logger.info(f">>> rollups of {table} refreshed from {row['watermark']} to {to_timestamp}")
+        cur.execute(cur.mogrify("DELETE FROM public.metrics_rollups WHERE bucket < %(min_bucket)s;",
+                                {"min_bucket": to_timestamp - RETENTION}))
+
+
+def get_values(project_id, metrics, start_timestamp, end_timestamp):
+    """
+    Computes the metrics (of the same table) over the events of the sessions started since start_timestamp,
+    until end_timestamp: the buckets of the rollups for the full minutes, the raw events for the rest:
+     - head: sessions started before the first full minute
+     - tail: events received since the watermark of the rollups
+    The watermark is read by the same statement, so a refresh committed meanwhile can't count events twice.
+    The rollups don't count the events ingested more than DELAY after their timestamp (below the watermark
+    once they arrive), their value can be lower than the one computed from the raw events.
+
+    Returns {metric: value}, or None if the rollups don't cover start_timestamp
+    """
+    metrics = [schemas.AlertColumn(m) for m in metrics]
+    table = METRICS[metrics[0]]["table"]
+    alias = TABLES[table]
+    first_bucket = start_timestamp + (-start_timestamp % BUCKET)
+    params = {"table": table, "project_id": project_id, "metrics": tuple([m.value for m in metrics]),
+              "start_timestamp": start_timestamp, "end_timestamp": end_timestamp,
+              "first_bucket": first_bucket, "min_watermark": first_bucket + RETENTION}
+    with pg_client.PostgresClient() as cur:
+        # nothing is read from the events if the rollups don't cover start_timestamp
+        cur.execute(cur.mogrify(f"""\
+            WITH state AS (SELECT watermark,
+                                  started_at <= %(first_bucket)s AND watermark <= %(min_watermark)s AS covered
+                           FROM public.metrics_rollups_state
+                           WHERE source_table = %(table)s)
+            SELECT state.covered, all_values.metric, all_values.values_count, all_values.values_sum
+            FROM state
+                     LEFT JOIN (SELECT metric,
+                                       SUM(values_count)::bigint AS values_count,
+                                       SUM(values_sum)           AS values_sum
+                                FROM (SELECT metric, values_count, values_sum
+                                      FROM public.metrics_rollups
+                                      WHERE (SELECT covered FROM state)
+                                        AND project_id = %(project_id)s
+                                        AND metric IN %(metrics)s
+                                        AND bucket >= %(first_bucket)s
+                                      UNION ALL
+                                      SELECT m.metric,
+                                             COUNT(m.value)            AS values_count,
+                                             COALESCE(SUM(m.value), 0) AS values_sum
+                                      FROM (SELECT {alias}.*
+                                            FROM {table} AS {alias}
+                                                     INNER JOIN public.sessions USING (session_id)
+                                            WHERE (SELECT covered FROM state)
+                                              AND sessions.project_id = %(project_id)s
+                                              AND sessions.start_ts >= %(start_timestamp)s
+                                              AND sessions.start_ts < %(first_bucket)s
+                                              AND {alias}.timestamp <= %(end_timestamp)s
+                                            UNION ALL
+                                            SELECT {alias}.*
+                                            FROM {table} AS {alias}
+                                                     INNER JOIN public.sessions USING (session_id)
+                                            WHERE (SELECT covered FROM state)
+                                              AND sessions.project_id = %(project_id)s
+                                              AND sessions.start_ts >= %(first_bucket)s
+                                              AND {alias}.timestamp >= (SELECT watermark FROM state)
+                                              AND {alias}.timestamp <= %(end_timestamp)s) AS {alias}
+                                               CROSS JOIN LATERAL (VALUES {__get_values_list(metrics)}) AS m(metric, value)
+                                      GROUP BY m.metric) AS values_by_source
+                                GROUP BY metric) AS all_values ON (TRUE);""", params))
+        rows = cur.fetchall()
+    if len(rows) == 0 or not rows[0]["covered"]:
+        return None
+    rows = {r["metric"]: r for r in rows if r["metric"] is not None}
+    results = {}
+    for m in metrics:
+        r = rows.get(m.value)
+        if METRICS[m]["aggregate"] == "count":
+            results[m] = int(r["values_count"]) if r else 0
+        else:
+            results[m] = r["values_sum"] / r["values_count"] if r and r["values_count"] > 0 else None
+    return results
@@ -1234,7 +1234,7 @@ def session_exists(project_id, session_id):
     return row is not None
 
 
-def check_recording_status(project_id: int) -> dict:
+async def check_recording_status(project_id: int) -> dict:
     query = f"""
         WITH project_sessions AS (SELECT COUNT(1)                                      AS full_count,
                                  COUNT(1) FILTER ( WHERE duration IS NOT NULL) AS nn_duration_count
@@ -1251,10 +1251,10 @@ def check_recording_status(project_id: int) -> dict:
         FROM project_sessions;
     """
 
-    with pg_client.PostgresClient() as cur:
+    async with pg_client.AsyncPostgresClient() as cur:
         query = cur.mogrify(query, {"project_id": project_id})
-        cur.execute(query)
-        row = cur.fetchone()
+        await cur.execute(query)
+        row = await cur.fetchone()
 
     return {
         "recordingStatus": row["recording_status"],
@@ -1,6 +1,6 @@
 from decouple import config
 
-from chalicelib.utils.storage import StorageClient
+from chalicelib.utils.storage import StorageClient, resolver
 
 
 def __get_devtools_keys(project_id, session_id):
@@ -14,16 +14,10 @@ def __get_devtools_keys(project_id, session_id):
 
 
 def get_urls(session_id, project_id, check_existence: bool = True):
-    results = []
-    for k in __get_devtools_keys(project_id=project_id, session_id=session_id):
-        if check_existence and not StorageClient.exists(bucket=config("sessions_bucket"), key=k):
-            continue
-        results.append(StorageClient.get_presigned_url_for_sharing(
-            bucket=config("sessions_bucket"),
-            expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
-            key=k
-        ))
-    return results
+    return resolver.get_presigned_urls(bucket=config("sessions_bucket"),
+                                       keys=__get_devtools_keys(project_id=project_id, session_id=session_id),
+                                       expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
+                                       check_existence=check_existence)
 
 
 def delete_mobs(project_id, session_ids):
@@ -1,6 +1,6 @@
 from decouple import config
 
-from chalicelib.utils.storage import StorageClient
+from chalicelib.utils.storage import StorageClient, resolver
 
 
 def __get_mob_keys(project_id, session_id):
@@ -29,42 +29,38 @@ def __get_mob_keys_deprecated(session_id):
 
 
 def get_urls(project_id, session_id, check_existence: bool = True):
-    results = []
-    for k in __get_mob_keys(project_id=project_id, session_id=session_id):
-        if check_existence and not StorageClient.exists(bucket=config("sessions_bucket"), key=k):
-            continue
-        results.append(StorageClient.get_presigned_url_for_sharing(
-            bucket=config("sessions_bucket"),
-            expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
-            key=k
-        ))
-    return results
+    return resolver.get_presigned_urls(bucket=config("sessions_bucket"),
+                                       keys=__get_mob_keys(project_id=project_id, session_id=session_id),
+                                       expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
+                                       check_existence=check_existence)
 
 
 def get_urls_depercated(session_id, check_existence: bool = True):
-    results = []
-    for k in __get_mob_keys_deprecated(session_id=session_id):
-        if check_existence and not StorageClient.exists(bucket=config("sessions_bucket"), key=k):
-            continue
-        results.append(StorageClient.get_presigned_url_for_sharing(
-            bucket=config("sessions_bucket"),
-            expires_in=100000,
-            key=k
-        ))
-    return results
+    return resolver.get_presigned_urls(bucket=config("sessions_bucket"),
+                                       keys=__get_mob_keys_deprecated(session_id=session_id),
+                                       expires_in=100000,
+                                       check_existence=check_existence)
 
 
 def get_ios_videos(session_id, project_id, check_existence=False):
-    results = []
-    for k in __get_ios_video_keys(project_id=project_id, session_id=session_id):
-        if check_existence and not StorageClient.exists(bucket=config("IOS_VIDEO_BUCKET"), key=k):
-            continue
-        results.append(StorageClient.get_presigned_url_for_sharing(
-            bucket=config("IOS_VIDEO_BUCKET"),
-            expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
-            key=k
-        ))
-    return results
+    return resolver.get_presigned_urls(bucket=config("IOS_VIDEO_BUCKET"),
+                                       keys=__get_ios_video_keys(project_id=project_id, session_id=session_id),
+                                       expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
+                                       check_existence=check_existence)
+
+
+def get_replay_urls(project_id, session_id, platform="web", check_existence: bool = True):
+    # All the replay files of a session, with their existence checked in one concurrent batch
+    if platform == "ios":
+        return {"videoURL": get_ios_videos(session_id=session_id, project_id=project_id,
+                                           check_existence=check_existence)}
+    if check_existence:
+        resolver.exists_many(bucket=config("sessions_bucket"),
+                             keys=__get_mob_keys(project_id=project_id, session_id=session_id)
+                                  + __get_mob_keys_deprecated(session_id=session_id))
+    # the existence results are cached now
+    return {"domURL": get_urls(project_id=project_id, session_id=session_id, check_existence=check_existence),
+            "mobsUrl": get_urls_depercated(session_id=session_id, check_existence=check_existence)}
 
 
 def delete_mobs(project_id, session_ids):
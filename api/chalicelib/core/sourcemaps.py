@@ -1,10 +1,29 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import time
 from urllib.parse import urlparse
 
 import requests
 from decouple import config
 
 from chalicelib.core import sourcemaps_parser
-from chalicelib.utils.storage import StorageClient, generators
+from chalicelib.utils.storage import StorageClient, generators, resolver
+from chalicelib.utils.ttl_cache import TTLCache
+
+# the sourcemaps&sources of a file change only when a new version is deployed under the same URL
+CACHE_TTL = config("SOURCEMAPS_CACHE_TTL", cast=int, default=600)
+CACHE_SIZE = config("SOURCEMAPS_CACHE_SIZE", cast=int, default=10000)
+
+__executor = ThreadPoolExecutor(max_workers=config("SOURCEMAPS_WORKERS", cast=int, default=8))
+__session = requests.Session()
+__urls_cache = TTLCache(name="sourcemaps_urls", ttl=CACHE_TTL, max_size=CACHE_SIZE)
+# resolved positions by (project_id, file key, line, column)
+__positions_cache = TTLCache(name="sourcemaps_positions", ttl=CACHE_TTL, max_size=CACHE_SIZE)
+# LRU of the JS files split in lines: {absPath: (expiration, lines)}
+SOURCES_CACHE_SIZE = config("SOURCEMAPS_SOURCES_CACHE_SIZE", cast=int, default=20)
+__sources = OrderedDict()
+__sources_lock = Lock()
 
 
 def presign_share_urls(project_id, urls):
@@ -68,13 +87,42 @@ def format_payload(p, truncate_to_first=False):
 
 
 def url_exists(url):
+    found, exists = __urls_cache.get(url)
+    if found:
+        return exists
     try:
-        r = requests.head(url, allow_redirects=False)
-        return r.status_code == 200 and "text/html" not in r.headers.get("Content-Type", "")
+        r = __session.head(url, allow_redirects=False, timeout=config("sourcemapTimeout", cast=int, default=5))
+        exists = r.status_code == 200 and "text/html" not in r.headers.get("Content-Type", "")
     except Exception as e:
         print(f"!! Issue checking if URL exists: {url}")
         print(e)
         return False
+    __urls_cache.set(url, exists)
+    return exists
+
+
+def __get_original_trace(project_id, key, payload):
+    # positions already resolved are taken from the cache, the others are sent to the sourcemap-reader
+    key_results = [None] * len(payload)
+    to_resolve = []
+    for i, o in enumerate(payload):
+        found, r = __positions_cache.get((project_id, key, o["position"]["line"], o["position"]["column"]))
+        if found:
+            key_results[i] = r
+        else:
+            to_resolve.append(i)
+    if len(to_resolve) > 0:
+        resolved = sourcemaps_parser.get_original_trace(
+            key=payload[0]["URL"] if payload[0]["isURL"] else key,
+            positions=[payload[i]["position"] for i in to_resolve],
+            is_url=payload[0]["isURL"])
+        if resolved is None:
+            return None
+        for i, r in zip(to_resolve, resolved):
+            __positions_cache.set((project_id, key, payload[i]["position"]["line"], payload[i]["position"]["column"]),
+                                  r)
+            key_results[i] = r
+    return key_results
 
 
 def get_traces_group(project_id, payload):
@@ -82,10 +130,8 @@ def get_traces_group(project_id, payload):
 
     results = [{}] * len(frames)
     payloads = {}
-    all_exists = True
+    urls = {}
     for i, u in enumerate(frames):
-        file_exists_in_bucket = False
-        file_exists_in_server = False
         file_url = u["absPath"]
         key = generators.generate_file_key_from_url(project_id, file_url)  # use filename instead?
         params_idx = file_url.find("?")
@@ -93,39 +139,46 @@ def get_traces_group(project_id, payload):
                 and not (file_url[:params_idx] if params_idx > -1 else file_url).endswith(".js"):
             print(f"{u['absPath']} sourcemap is not a JS file")
             payloads[key] = None
-
-        if key not in payloads:
-            file_exists_in_bucket = len(file_url) > 0 and StorageClient.exists(config('sourcemaps_bucket'), key)
-            if len(file_url) > 0 and not file_exists_in_bucket:
-                print(f"{u['absPath']} sourcemap (key '{key}') doesn't exist in S3 looking in server")
-                if not file_url.endswith(".map"):
-                    file_url += '.map'
-                file_exists_in_server = url_exists(file_url)
-                file_exists_in_bucket = file_exists_in_server
-            all_exists = all_exists and file_exists_in_bucket
-            if not file_exists_in_bucket and not file_exists_in_server:
-                print(f"{u['absPath']} sourcemap (key '{key}') doesn't exist in S3 nor server")
-                payloads[key] = None
-            else:
-                payloads[key] = []
+        elif key not in payloads:
+            payloads[key] = None if len(file_url) == 0 else []
+            urls[key] = file_url
         results[i] = dict(u)
         results[i]["frame"] = dict(u)
         if payloads[key] is not None:
-            payloads[key].append({"resultIndex": i, "frame": dict(u), "URL": file_url,
+            payloads[key].append({"resultIndex": i, "frame": dict(u), "URL": urls[key],
                                   "position": {"line": u["lineNo"], "column": u["colNo"]},
-                                  "isURL": file_exists_in_server})
-
-    for key in payloads.keys():
-        if payloads[key] is None:
+                                  "isURL": False})
+    all_exists = True
+    for key in [k for k in urls.keys() if payloads[k] is None]:
+        print(f"{urls.pop(key)} sourcemap (key '{key}') doesn't exist in S3 nor server")
+        all_exists = False
+
+    # all the files are looked for at once in S3, then in the servers
+    in_bucket = resolver.exists_many(bucket=config('sourcemaps_bucket'), keys=list(urls.keys()))
+    to_check = {}
+    for key, file_url in urls.items():
+        if not in_bucket[key]:
+            print(f"{file_url} sourcemap (key '{key}') doesn't exist in S3 looking in server")
+            to_check[key] = file_url if file_url.endswith(".map") else file_url + '.map'
+    for key, file_exists_in_server in zip(to_check.keys(), __executor.map(url_exists, to_check.values())):
+        all_exists = all_exists and file_exists_in_server
+        if not file_exists_in_server:
+            print(f"{urls[key]} sourcemap (key '{key}') doesn't exist in S3 nor server")
+            payloads[key] = None
             continue
-        key_results = sourcemaps_parser.get_original_trace(
-            key=payloads[key][0]["URL"] if payloads[key][0]["isURL"] else key,
-            positions=[o["position"] for o in payloads[key]],
-            is_url=payloads[key][0]["isURL"])
+        for o in payloads[key]:
+            o["URL"] = to_check[key]
+            o["isURL"] = True
+
+    keys = [k for k in payloads.keys() if payloads[k] is not None]
+    for key, key_results in zip(keys, __executor.map(lambda k: __get_original_trace(project_id, k, payloads[k]),
+                                                     keys)):
         if key_results is None:
             all_exists = False
             continue
         for i, r in enumerate(key_results):
+            if r is None:
+                continue
             res_index = payloads[key][i]["resultIndex"]
             # function name search  by frontend lib is better than sourcemaps' one in most cases
             if results[res_index].get("function") is not None:
@@ -143,23 +196,38 @@ def get_js_cache_path(fullURL):
 MAX_COLUMN_OFFSET = 60
 
 
+def __get_source_lines(file_abs_path):
+    now = time()
+    with __sources_lock:
+        entry = __sources.get(file_abs_path)
+        if entry is not None and entry[0] >= now:
+            __sources.move_to_end(file_abs_path)
+            return entry[1]
+    file_path = get_js_cache_path(file_abs_path)
+    file = StorageClient.get_file(config('js_cache_bucket'), file_path)
+    if file is None:
+        print(f"Missing abs_path: {file_abs_path}, file {file_path} not found in {config('js_cache_bucket')}")
+        return None
+    lines = file.split("\n")
+    with __sources_lock:
+        __sources[file_abs_path] = (now + CACHE_TTL, lines)
+        __sources.move_to_end(file_abs_path)
+        while len(__sources) > SOURCES_CACHE_SIZE:
+            __sources.popitem(last=False)
+    return lines
+
+
 def fetch_missed_contexts(frames):
-    source_cache = {}
+    # the files of all the frames without context are downloaded at once
+    to_fetch = list({f["frame"]["absPath"]: None for f in frames
+                     if not (f and f.get("context") and len(f["context"]) > 0)}.keys())
+    source_cache = dict(zip(to_fetch, __executor.map(__get_source_lines, to_fetch)))
     for i in range(len(frames)):
         if frames[i] and frames[i].get("context") and len(frames[i]["context"]) > 0:
             continue
-        file_abs_path = frames[i]["frame"]["absPath"]
-        if file_abs_path in source_cache:
-            file = source_cache[file_abs_path]
-        else:
-            file_path = get_js_cache_path(file_abs_path)
-            file = StorageClient.get_file(config('js_cache_bucket'), file_path)
-            if file is None:
-                print(f"Missing abs_path: {file_abs_path}, file {file_path} not found in {config('js_cache_bucket')}")
-            source_cache[file_abs_path] = file
-        if file is None:
+        lines = source_cache[frames[i]["frame"]["absPath"]]
+        if lines is None:
             continue
-        lines = file.split("\n")
 
         if frames[i]["lineNo"] is None:
             print("no original-source found for frame in sourcemap results")
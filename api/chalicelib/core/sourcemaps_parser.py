@@ -1,6 +1,6 @@
 import requests
-
 from decouple import config
+from requests.adapters import HTTPAdapter
 
 SMR_URL = config("sourcemaps_reader")
 
@@ -10,6 +10,11 @@ if '%s' in SMR_URL:
     else:
         SMR_URL = SMR_URL % "smr"
 
+# the keep-alive connections to the sourcemap-reader are reused by all the threads
+__session = requests.Session()
+__session.mount("http://", HTTPAdapter(pool_maxsize=config("SOURCEMAPS_WORKERS", cast=int, default=8)))
+__session.mount("https://", HTTPAdapter(pool_maxsize=config("SOURCEMAPS_WORKERS", cast=int, default=8)))
+
 
 def get_original_trace(key, positions, is_url=False):
     payload = {
@@ -20,7 +25,7 @@ def get_original_trace(key, positions, is_url=False):
         "isURL": is_url
     }
     try:
-        r = requests.post(SMR_URL, json=payload, timeout=config("sourcemapTimeout", cast=int, default=5))
+        r = __session.post(SMR_URL, json=payload, timeout=config("sourcemapTimeout", cast=int, default=5))
         if r.status_code != 200:
             print(f"Issue getting sourcemap status_code:{r.status_code}")
             return None
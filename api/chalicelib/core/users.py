@@ -9,9 +9,20 @@ from chalicelib.core import authorizers, metadata, projects
 from chalicelib.core import tenants, assist
 from chalicelib.utils import email_helper, smtp
 from chalicelib.utils import helper
-from chalicelib.utils import pg_client
+from chalicelib.utils import pg_client, ttl_cache
 from chalicelib.utils.TimeUTC import TimeUTC
 
+# Short-lived copies of the rows read by the authorizers on every request, dropped by the write paths below.
+# The drops only reach the current worker: a logout or a deleted user is seen by the others when their copy expires,
+# hence the shorter lifetime of the token checks
+AUTH_CACHE = ttl_cache.get_cache("users_auth", ttl=config("AUTH_REVOCATION_CACHE_TTL", cast=int, default=2))
+USERS_CACHE = ttl_cache.get_cache("users")
+
+
+def invalidate_cache(user_id):
+    AUTH_CACHE.invalidate(lambda k, v: k == user_id)
+    USERS_CACHE.invalidate(lambda k, v: k[0] == user_id)
+
 
 def __generate_invitation_token():
     return secrets.token_urlsafe(64)
@@ -145,6 +156,7 @@ def update(tenant_id, user_id, changes, output=True):
                             WHERE basic_authentication.user_id = %(user_id)s;""",
                                 {"user_id": user_id, **changes})
             cur.execute(query)
+    invalidate_cache(user_id)
     if not output:
         return None
     return get(user_id=user_id, tenant_id=tenant_id)
@@ -223,6 +235,14 @@ def get(user_id, tenant_id):
         return helper.dict_to_camel_case(r)
 
 
+def get_cached(user_id, tenant_id):
+    found, r = USERS_CACHE.get((user_id, tenant_id))
+    if not found:
+        r = get(user_id=user_id, tenant_id=tenant_id)
+        USERS_CACHE.set((user_id, tenant_id), r)
+    return r
+
+
 def generate_new_api_key(user_id):
     with pg_client.PostgresClient() as cur:
         cur.execute(
@@ -423,6 +443,7 @@ def delete_member(user_id, tenant_id, id_to_delete):
                                 change_pwd_expire_at= NULL, change_pwd_token= NULL
                            WHERE user_id=%(user_id)s;""",
                         {"user_id": id_to_delete}))
+    invalidate_cache(id_to_delete)
     return {"data": get_members(tenant_id=tenant_id)}
 
 
@@ -525,6 +546,10 @@ def get_by_invitation_token(token, pass_token=None):
 
 
 def auth_exists(user_id, jwt_iat):
+    # Only a cached match is trusted, a token newer than the cached row (login on another worker) is checked in PG
+    found, cached_iat = AUTH_CACHE.get(user_id)
+    if found and cached_iat is not None and abs(jwt_iat - cached_iat) <= 1:
+        return True
     with pg_client.PostgresClient() as cur:
         cur.execute(
             cur.mogrify(f"""SELECT user_id, EXTRACT(epoch FROM jwt_iat)::BIGINT AS jwt_iat 
@@ -535,6 +560,7 @@ def auth_exists(user_id, jwt_iat):
                         {"userId": user_id})
         )
         r = cur.fetchone()
+    AUTH_CACHE.set(user_id, r["jwt_iat"] if r is not None else None)
     return r is not None \
         and r.get("jwt_iat") is not None \
         and abs(jwt_iat - r["jwt_iat"]) <= 1
@@ -568,7 +594,8 @@ def change_jwt_iat_jti(user_id):
                             {"user_id": user_id})
         cur.execute(query)
         row = cur.fetchone()
-        return row.get("jwt_iat"), row.get("jwt_refresh_jti"), row.get("jwt_refresh_iat")
+    invalidate_cache(user_id)
+    return row.get("jwt_iat"), row.get("jwt_refresh_jti"), row.get("jwt_refresh_iat")
 
 
 def refresh_jwt_iat_jti(user_id):
@@ -583,7 +610,8 @@ def refresh_jwt_iat_jti(user_id):
                             {"user_id": user_id})
         cur.execute(query)
         row = cur.fetchone()
-        return row.get("jwt_iat"), row.get("jwt_refresh_jti"), row.get("jwt_refresh_iat")
+    invalidate_cache(user_id)
+    return row.get("jwt_iat"), row.get("jwt_refresh_jti"), row.get("jwt_refresh_iat")
 
 
 def authenticate(email, password, for_change_password=False) -> dict | bool | None:
@@ -633,6 +661,7 @@ def logout(user_id: int):
                WHERE user_id = %(user_id)s;""",
             {"user_id": user_id})
         cur.execute(query)
+    invalidate_cache(user_id)
 
 
 def refresh(user_id: int, tenant_id: int = -1) -> dict:
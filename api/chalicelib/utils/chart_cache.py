@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+import pickle
+from collections import OrderedDict
+from threading import Lock
+from time import time
+
+import redis
+from decouple import config
+
+from chalicelib.utils.TimeUTC import TimeUTC
+
+logger = logging.getLogger(__name__)
+
+# a window ending less than LIVE_DELAY ago is still receiving data, its charts are kept for LIVE_TTL only
+LIVE_DELAY = config("CHART_CACHE_LIVE_DELAY", cast=int, default=15 * 60) * 1000
+LIVE_TTL = config("CHART_CACHE_LIVE_TTL", cast=int, default=60)
+TTL = config("CHART_CACHE_TTL", cast=int, default=60 * 60)
+
+
+class MemoryBackend:
+    # Thread-safe LRU with expiry, each API worker has its own copy
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.lock = Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return pickle.loads(entry[1])
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (time() + ttl, pickle.dumps(value))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def get_version(self, tag):
+        return self.versions.get(tag, 0)
+
+    def incr_version(self, tag):
+        with self.lock:
+            self.versions[tag] = self.versions.get(tag, 0) + 1
+
+
+class RedisBackend:
+    # Shared by all the API workers
+    def __init__(self, url):
+        self.client = redis.from_url(url, socket_timeout=2)
+
+    def get(self, key):
+        value = self.client.get(f"chart:{key}")
+        return None if value is None else pickle.loads(value)
+
+    def set(self, key, value, ttl):
+        self.client.set(f"chart:{key}", pickle.dumps(value), ex=ttl)
+
+    def get_version(self, tag):
+        return int(self.client.get(f"chart_version:{tag}") or 0)
+
+    def incr_version(self, tag):
+        self.client.incr(f"chart_version:{tag}")
+
+
+def __get_backend():
+    backend = config("CHART_CACHE_BACKEND", default="memory")
+    if backend == "redis":
+        return RedisBackend(url=config("REDIS_STRING"))
+    if backend == "memory":
+        return MemoryBackend(max_size=config("CHART_CACHE_SIZE", cast=int, default=1000))
+    if backend != "none":
+        logger.warning(f"!! unknown CHART_CACHE_BACKEND: {backend}, the charts won't be cached")
+    return None
+
+
+backend = __get_backend()
+
+
+def __round_timestamps(payload, step):
+    if isinstance(payload, dict):
+        return {k: v - v % step if k in ("startTimestamp", "endTimestamp") and isinstance(v, int)
+                else __round_timestamps(v, step)
+                for k, v in payload.items()}
+    if isinstance(payload, list):
+        return [__round_timestamps(v, step) for v in payload]
+    return payload
+
+
+def is_live(end_timestamp):
+    return end_timestamp is None or end_timestamp >= TimeUTC.now() - LIVE_DELAY
+
+
+def get_key(project_id, payload: dict, density: int = None):
+    """
+    Canonical hash of the payload of a chart, the timestamps (including the ones of the series) are rounded
+    to the step of the chart so close windows share the same result.
+    A live window and an older one never share a key, even if they are rounded to the same step:
+    the live result would be kept for TTL instead of LIVE_TTL if the older window filled the entry first
+    """
+    start, end = payload.get("startTimestamp"), payload.get("endTimestamp")
+    live = is_live(end)
+    if start is not None and end is not None and density:
+        step = max((end - start) // density, 1)
+        if step > 60 * 1000:
+            # so windows of slightly different sizes get the same step
+            step -= step % (60 * 1000)
+        payload = __round_timestamps(payload, step=step)
+    payload = json.dumps({"projectId": project_id, "payload": payload, "live": live}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def get_ttl(end_timestamp):
+    if is_live(end_timestamp):
+        return LIVE_TTL
+    return TTL
+
+
+def get_version(tag):
+    if backend is None:
+        return 0
+    try:
+        return backend.get_version(tag)
+    except Exception as e:
+        logger.warning(f"!! Issue getting chart cache version for {tag}")
+        logger.warning(e)
+        return 0
+
+
+def invalidate(tag):
+    # the keys built with the previous version of the tag are never read again
+    if backend is None:
+        return
+    try:
+        backend.incr_version(tag)
+    except Exception as e:
+        logger.error(f"!! Issue invalidating chart cache for {tag}")
+        logger.error(e)
+
+
+def get_or_compute(key, ttl, compute):
+    if backend is None:
+        return compute()
+    try:
+        value = backend.get(key)
+    except Exception as e:
+        logger.warning("!! Issue reading chart cache")
+        logger.warning(e)
+        value = None
+    if value is not None:
+        return value
+    value = compute()
+    if value is not None:
+        try:
+            backend.set(key, value, ttl)
+        except Exception as e:
+            logger.warning("!! Issue writing chart cache")
+            logger.warning(e)
+    return value
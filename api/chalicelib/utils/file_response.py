@@ -0,0 +1,155 @@
+import gzip
+import hashlib
+import logging
+import os
+import re
+from threading import get_ident
+from time import time
+
+import anyio
+from decouple import config
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = config("FILE_RESPONSE_CHUNK_SIZE", cast=int, default=256 * 1024)
+# the gzip versions of the files are kept in this directory, if empty the files are compressed on the fly
+# by GZipMiddleware for each request
+GZIP_CACHE_DIR = config("FILE_RESPONSE_GZIP_CACHE_DIR", default="")
+# in MB
+GZIP_CACHE_SIZE = config("FILE_RESPONSE_GZIP_CACHE_SIZE", cast=int, default=1024) * 1024 * 1024
+# the files changed more recently are still being written (live sessions), they are not cached
+GZIP_MIN_AGE = config("FILE_RESPONSE_GZIP_MIN_AGE", cast=int, default=60)
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(value, size):
+    """
+    Returns the (start, end) bytes (inclusive) of a Range header, None to send the full file (no header,
+    multiple ranges or invalid header), False if the range is not satisfiable
+    """
+    if value is None:
+        return None
+    match = RANGE_PATTERN.match(value.strip())
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    if match.group(1) == "":
+        suffix = int(match.group(2))
+        if suffix == 0 or size == 0:
+            return False
+        return max(0, size - suffix), size - 1
+    start = int(match.group(1))
+    end = size - 1 if match.group(2) == "" else min(int(match.group(2)), size - 1)
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def __evict_gzip_cache():
+    files = []
+    for f in os.scandir(GZIP_CACHE_DIR):
+        if f.name.endswith(".gz"):
+            s = f.stat()
+            files.append((s.st_mtime, s.st_size, f.path))
+    total = sum([f[1] for f in files])
+    for _, size, path in sorted(files):
+        if total <= GZIP_CACHE_SIZE:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def get_gzip_version(path, stat_result):
+    """
+    Returns the path of the gzip version of the first stat_result.st_size bytes of the file,
+    compressing it the first time; None if the file is too recent to be cached
+    """
+    if time() - stat_result.st_mtime < GZIP_MIN_AGE:
+        return None
+    key = hashlib.md5(f"{path}:{stat_result.st_size}:{stat_result.st_mtime_ns}".encode()).hexdigest()
+    gzip_path = os.path.join(GZIP_CACHE_DIR, f"{key}.gz")
+    if os.path.exists(gzip_path):
+        # the least recently used files are evicted first
+        os.utime(gzip_path)
+        return gzip_path
+    os.makedirs(GZIP_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{gzip_path}.{os.getpid()}-{get_ident()}.tmp"
+    try:
+        with open(path, "rb") as source, gzip.open(tmp_path, "wb", compresslevel=6) as target:
+            remaining = stat_result.st_size
+            while remaining > 0:
+                chunk = source.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                target.write(chunk)
+                remaining -= len(chunk)
+        os.replace(tmp_path, gzip_path)
+    except OSError as e:
+        logger.warning(f"!! couldn't cache the gzip version of {path}")
+        logger.warning(e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    __evict_gzip_cache()
+    return gzip_path
+
+
+class RangeFileResponse(FileResponse):
+    # Streams a file that might still be growing (live recording): only the bytes present when the request is
+    # received are sent, by chunks, and the Range requests are answered with the requested bytes only
+    chunk_size = CHUNK_SIZE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        self.headers["accept-ranges"] = "bytes"
+        path, size = self.path, stat_result.st_size
+        byte_range = parse_range(request_headers.get("range"), size)
+        if byte_range is False:
+            self.status_code = 416
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        self.set_stat_headers(stat_result)
+        if byte_range is None:
+            start, end = 0, size - 1
+            if GZIP_CACHE_DIR and "gzip" in request_headers.get("accept-encoding", ""):
+                gzip_path = await anyio.to_thread.run_sync(get_gzip_version, self.path, stat_result)
+                if gzip_path is not None:
+                    path = gzip_path
+                    size = (await anyio.to_thread.run_sync(os.stat, gzip_path)).st_size
+                    start, end = 0, size - 1
+                    self.headers["content-encoding"] = "gzip"
+                    self.headers["content-length"] = str(size)
+                    self.headers["etag"] += "-gzip"
+        else:
+            start, end = byte_range
+            self.status_code = 206
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+            self.headers["content-length"] = str(end - start + 1)
+            # the range is of the file's bytes, GZipMiddleware shouldn't compress it
+            self.headers["content-encoding"] = "identity"
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        remaining = end - start + 1
+        async with await anyio.open_file(path, mode="rb") as file:
+            await file.seek(start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0 or end < start:
+            # empty file or truncated while being sent
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
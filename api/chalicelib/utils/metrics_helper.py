@@ -3,3 +3,22 @@ def __get_step_size(startTimestamp, endTimestamp, density, decimal=False, factor
     if decimal:
         return step_size / density
     return step_size // (density - 1)
+
+
+def __get_histogram_params(min_value, max_value, density):
+    # density bins of the same width over [min_value, max_value], the values above max_value go to the bin density
+    return {"histogram_min": min_value, "histogram_max": max_value, "histogram_bins": density,
+            "histogram_step": max((max_value - min_value) // density + 1, 1)}
+
+
+def __get_histogram_chart(rows, density, value_key):
+    # rows: [{"bucket", "value", "count"}] grouped by bucket, value being the highest value of the bucket
+    # returns the chart points and the count of the values above the last bin
+    chart = []
+    extreme_values = 0
+    for r in rows:
+        if r["bucket"] < density:
+            chart.append({value_key: r["value"], "count": r["count"]})
+        else:
+            extreme_values += r["count"]
+    return chart, extreme_values
@@ -1,11 +1,15 @@
+import asyncio
 import logging
 import time
 from threading import Semaphore
 
+import psycopg
 import psycopg2
 import psycopg2.extras
 from decouple import config
+from psycopg.rows import dict_row
 from psycopg2 import pool
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
 
 logger = logging.getLogger(__name__)
 
@@ -165,10 +169,126 @@ class PostgresClient:
         return self.__enter__()
 
 
+class AsyncCursor(psycopg.AsyncClientCursor):
+    # Client-side binding keeps cur.mogrify and the psycopg2 parameters adaptation
+    async def execute(self, query, params=None, **kwargs):
+        try:
+            return await super().execute(query, params, **kwargs)
+        except psycopg.Error as error:
+            logging.error(f"!!! Error of type:{type(error)} while executing query:")
+            logging.error(query)
+            raise error
+
+
+# One pool per kind of query, with its own statement_timeout
+ASYNC_POOLS_CONFIG = {
+    "default": {"options": PG_CONFIG.get("options"),
+                "min_size": config("PG_AIO_MINCONN", cast=int, default=2),
+                "max_size": config("PG_AIO_MAXCONN", cast=int, default=20)},
+    "long": {"options": f"-c statement_timeout={config('pg_long_timeout', cast=int, default=5 * 60) * 1000}",
+             "min_size": 0,
+             "max_size": config("PG_AIO_LONG_MAXCONN", cast=int, default=5)},
+    "unlimited": {"options": None,
+                  "min_size": 0,
+                  "max_size": config("PG_AIO_UNLIMITED_MAXCONN", cast=int, default=2)}
+}
+async_pools: dict[str, AsyncConnectionPool] = {}
+async_pools_lock = asyncio.Lock()
+
+
+async def _get_async_pool(name) -> AsyncConnectionPool:
+    if name in async_pools:
+        return async_pools[name]
+    async with async_pools_lock:
+        if name in async_pools:
+            return async_pools[name]
+        pool_config = ASYNC_POOLS_CONFIG[name]
+        kwargs = {"host": _PG_CONFIG["host"],
+                  "dbname": _PG_CONFIG["database"],
+                  "user": _PG_CONFIG["user"],
+                  "password": _PG_CONFIG["password"],
+                  "port": _PG_CONFIG["port"],
+                  "application_name": _PG_CONFIG["application_name"] + ("" if name == "default" else f"-{name.upper()}"),
+                  "row_factory": dict_row,
+                  "cursor_factory": AsyncCursor}
+        if pool_config["options"] is not None:
+            kwargs["options"] = pool_config["options"]
+        async_pool = AsyncConnectionPool(kwargs=kwargs, min_size=pool_config["min_size"],
+                                         max_size=pool_config["max_size"],
+                                         timeout=config("PG_AIO_POOL_TIMEOUT", cast=float, default=30),
+                                         name=name, open=False)
+        await async_pool.open()
+        async_pools[name] = async_pool
+    return async_pool
+
+
+def pool_stats():
+    """Metrics of the async pools: size, in use, waiting requests, total wait time and timeouts"""
+    stats = {}
+    for name, async_pool in async_pools.items():
+        values = async_pool.get_stats()
+        stats[name] = {"size": values.get("pool_size", 0),
+                       "inUse": values.get("pool_size", 0) - values.get("pool_available", 0),
+                       "waiting": values.get("requests_waiting", 0),
+                       "requests": values.get("requests_num", 0),
+                       "waitMs": values.get("requests_wait_ms", 0),
+                       "timeouts": values.get("requests_errors", 0)}
+    return stats
+
+
+class AsyncPostgresClient:
+    """asyncio version of PostgresClient, to use in async routes instead of blocking the event loop:
+        async with pg_client.AsyncPostgresClient() as cur:
+            query = cur.mogrify("SELECT ... WHERE project_id = %(project_id)s", {"project_id": project_id})
+            await cur.execute(query)
+            row = await cur.fetchone()
+    Rows are dicts. To migrate a chalicelib.core function, make it async, use `async with` and await
+    execute/fetch*; tuples are not adapted (use lists with = ANY(%(list)s) instead of IN %(tuple)s).
+    Long and unlimited queries use their own small pools instead of opening a connection per call."""
+
+    def __init__(self, long_query=False, unlimited_query=False):
+        if unlimited_query:
+            self.pool_name = "unlimited"
+        elif long_query:
+            self.pool_name = "long"
+        else:
+            self.pool_name = "default"
+        self.pool = None
+        self.connection = None
+        self.cursor = None
+
+    async def __aenter__(self):
+        self.pool = await _get_async_pool(self.pool_name)
+        try:
+            self.connection = await self.pool.getconn()
+        except PoolTimeout as error:
+            logging.error(f"!!! Timeout while waiting for a connection from the {self.pool_name} pool")
+            raise error
+        self.cursor = self.connection.cursor()
+        return self.cursor
+
+    async def __aexit__(self, exc_type, *args):
+        try:
+            if exc_type is None:
+                await self.connection.commit()
+            else:
+                logging.info("starting rollback to allow future execution")
+                await self.connection.rollback()
+            await self.cursor.close()
+        except Exception as error:
+            logging.error("Error while committing/closing async PG-connection", error)
+            raise error
+        finally:
+            await self.pool.putconn(self.connection)
+            self.cursor = None
+            self.connection = None
+
+
 async def init():
     logging.info(f">PG_POOL:{config('PG_POOL', default=None)}")
     if config('PG_POOL', cast=bool, default=True):
         make_pool()
+    await _get_async_pool("default")
 
 
 async def terminate():
@@ -179,3 +299,8 @@ async def terminate():
             logging.info("Closed all connexions to PostgreSQL")
         except (Exception, psycopg2.DatabaseError) as error:
             logging.error("Error while closing all connexions to PostgreSQL", error)
+    for name in list(async_pools.keys()):
+        try:
+            await async_pools.pop(name).close()
+        except Exception as error:
+            logging.error(f"Error while closing the {name} async pool", error)
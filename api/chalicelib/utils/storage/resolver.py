@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import time
+
+from decouple import config
+
+from chalicelib.utils.storage import StorageClient
+
+EXISTS_TTL = config("STORAGE_EXISTS_TTL", cast=int, default=300)
+# A missing file can still be uploaded (e.g. the end of a session), so absences are kept for less time
+MISSING_TTL = config("STORAGE_MISSING_TTL", cast=int, default=30)
+CACHE_MAX_SIZE = config("STORAGE_EXISTS_CACHE_SIZE", cast=int, default=10000)
+
+__executor = ThreadPoolExecutor(max_workers=config("STORAGE_CHECK_WORKERS", cast=int, default=8))
+__cache = {}
+__lock = Lock()
+
+
+def __get_cached(bucket, key):
+    entry = __cache.get((bucket, key))
+    if entry is None or entry[0] < time():
+        return None
+    return entry[1]
+
+
+def __set_cached(bucket, key, exists):
+    now = time()
+    with __lock:
+        if len(__cache) >= CACHE_MAX_SIZE:
+            for k in [k for k, v in __cache.items() if v[0] < now]:
+                del __cache[k]
+            if len(__cache) >= CACHE_MAX_SIZE:
+                __cache.clear()
+        __cache[(bucket, key)] = (now + (EXISTS_TTL if exists else MISSING_TTL), exists)
+
+
+def exists_many(bucket, keys):
+    # Returns {key: exists}, the keys without a recent result are checked concurrently
+    results = {}
+    to_check = []
+    for k in keys:
+        exists = __get_cached(bucket=bucket, key=k)
+        if exists is None:
+            to_check.append(k)
+        else:
+            results[k] = exists
+    if len(to_check) == 1:
+        checked = [StorageClient.exists(bucket=bucket, key=to_check[0])]
+    else:
+        checked = __executor.map(lambda k: StorageClient.exists(bucket=bucket, key=k), to_check)
+    for k, exists in zip(to_check, checked):
+        __set_cached(bucket=bucket, key=k, exists=exists)
+        results[k] = exists
+    return results
+
+
+def get_presigned_urls(bucket, keys, expires_in, check_existence=True):
+    # Returns the pre-signed URLs of the keys, skipping the missing ones if check_existence
+    if check_existence:
+        existing = exists_many(bucket=bucket, keys=keys)
+        keys = [k for k in keys if existing[k]]
+    return [StorageClient.get_presigned_url_for_sharing(bucket=bucket, expires_in=expires_in, key=k) for k in keys]
@@ -26,8 +26,9 @@ class AmazonS3Storage(ObjectStorage):
                                   verify=not config("S3_DISABLE_SSL_VERIFY", default=False, cast=bool))
 
     def exists(self, bucket, key):
+        # the client is thread-safe, unlike the resource objects
         try:
-            self.resource.Object(bucket, key).load()
+            self.client.head_object(Bucket=bucket, Key=key)
         except botocore.exceptions.ClientError as e:
             if e.response['Error']['Code'] == "404":
                 return False
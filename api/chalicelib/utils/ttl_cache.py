@@ -0,0 +1,67 @@
+from copy import deepcopy
+from threading import Lock
+from time import time
+
+from decouple import config
+
+
+class TTLCache:
+    # Thread-safe in-process cache with a short lifetime, for values that can be read slightly stale
+    # (each API worker has its own copy, invalidations only reach the current process)
+    def __init__(self, name, ttl, max_size):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = {}
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        # Returns (found, value), value is a copy so callers can change it
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time():
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, deepcopy(entry[1])
+
+    def set(self, key, value):
+        now = time()
+        with self.lock:
+            if len(self.entries) >= self.max_size:
+                for k in [k for k, v in self.entries.items() if v[0] < now]:
+                    del self.entries[k]
+                if len(self.entries) >= self.max_size:
+                    self.entries.clear()
+            self.entries[key] = (now + self.ttl, deepcopy(value))
+
+    def invalidate(self, match):
+        # Deletes the entries for which match(key, value) is True, in this worker only:
+        # the other workers keep serving their copy for up to ttl seconds
+        with self.lock:
+            to_delete = [k for k, v in self.entries.items() if match(k, v[1])]
+            for k in to_delete:
+                del self.entries[k]
+            self.invalidations += len(to_delete)
+
+    def stats(self):
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses,
+                "invalidations": self.invalidations}
+
+
+caches: dict[str, TTLCache] = {}
+
+
+def get_cache(name, ttl=None) -> TTLCache:
+    if name not in caches:
+        if ttl is None:
+            ttl = config("AUTH_CACHE_TTL", cast=int, default=10)
+        caches[name] = TTLCache(name=name, ttl=ttl,
+                                max_size=config("AUTH_CACHE_SIZE", cast=int, default=10000))
+    return caches[name]
+
+
+def stats():
+    return {name: c.stats() for name, c in caches.items()}
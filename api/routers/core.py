@@ -854,7 +854,7 @@ async def check_recording_status(project_id: int):
                   "sessions_count": int      # The total count of sessions
               }
     """
-    return {"data": sessions.check_recording_status(project_id=project_id)}
+    return {"data": await sessions.check_recording_status(project_id=project_id)}
 
 
 @public_app.get('/', tags=["health"])
@@ -14,6 +14,7 @@ from chalicelib.core import webhook
 from chalicelib.core.collaboration_slack import Slack
 from chalicelib.utils import captcha, smtp
 from chalicelib.utils import helper
+from chalicelib.utils.file_response import RangeFileResponse
 from chalicelib.utils.TimeUTC import TimeUTC
 from or_dependencies import OR_context, OR_role
 from routers.base import get_routers
@@ -367,7 +368,7 @@ def get_live_session_replay_file(projectId: int, sessionId: Union[int, str],
     if path is None:
         return not_found
 
-    return FileResponse(path=path, media_type="application/octet-stream")
+    return RangeFileResponse(path=path, media_type="application/octet-stream")
 
 
 @app.get('/{projectId}/unprocessed/{sessionId}/devtools.mob', tags=["assist"])
@@ -388,7 +389,7 @@ def get_live_session_devtools_file(projectId: int, sessionId: Union[int, str],
     if path is None:
         return {"errors": ["Devtools file not found"]}
 
-    return FileResponse(path=path, media_type="application/octet-stream")
+    return RangeFileResponse(path=path, media_type="application/octet-stream")
 
 
 @app.post('/{projectId}/heatmaps/url', tags=["heatmaps"])
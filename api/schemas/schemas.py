@@ -1045,6 +1045,12 @@ class CardSessionsSchema(_TimedSchema, _PaginatedSchema):
         return values
 
 
+class CardsBatchSchema(CardSessionsSchema):
+    # predefined cards computed together with the same filters
+    metrics: List[Union[MetricOfWebVitals, MetricOfErrors, MetricOfPerformance, MetricOfResources]] \
+        = Field(..., min_length=1, max_length=100)
+
+
 class CardConfigSchema(BaseModel):
     col: Optional[int] = Field(default=None)
     row: Optional[int] = Field(default=2)
@@ -0,0 +1,11 @@
+import os
+
+# the storage client is created when chalicelib.utils.storage is first imported, by any test module:
+# the fake credentials and moto have to be loaded before for the tests mocking S3
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+try:
+    import moto  # noqa: F401
+except ImportError:
+    pass
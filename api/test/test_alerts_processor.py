@@ -0,0 +1,29 @@
+import schemas
+from chalicelib.core import alerts_processor
+
+
+def alert(alert_id, left, detection_method=schemas.AlertDetectionMethod.threshold, change=None):
+    return {"alertId": alert_id, "projectId": 1, "seriesId": None, "detectionMethod": detection_method,
+            "change": change, "query": {"left": left, "operator": ">", "right": 10},
+            "options": {"currentPeriod": 15, "previousPeriod": 15}}
+
+
+class TestAlertsProcessor:
+    def test_add_filter(self):
+        add_filter = getattr(alerts_processor, "__add_filter")
+        assert add_filter("COALESCE(AVG(NULLIF(x,0)),0)", "y=1") == "COALESCE(AVG(NULLIF(x,0)) FILTER (WHERE y=1),0)"
+        assert add_filter("COUNT(DISTINCT session_id)", "y=1") == "COUNT(DISTINCT session_id) FILTER (WHERE y=1)"
+
+    def test_build_group(self):
+        group = [alert(1, schemas.AlertColumn.errors__4xx__count),
+                 alert(2, schemas.AlertColumn.errors__5xx__count, schemas.AlertDetectionMethod.change,
+                       schemas.AlertDetectionType.percent)]
+        query, params = alerts_processor.BuildGroup(group)
+        assert query.count("FROM events.resources") == 1
+        for i in range(len(group)):
+            assert f"AS value_{i}" in query and f"AS valid_{i}" in query
+        assert "status/100=4 AND timestamp >= %(startDate)s" in query
+        assert "status/100=5 AND timestamp < %(startDate)s AND timestamp >= %(timestamp_sub2)s" in query
+        # the previous period of the change alert is included in the scanned window
+        assert "AND timestamp >= %(timestamp_sub2)s AND timestamp <= %(now)s" in query
+        assert params["now"] - params["timestamp_sub2"] == 2 * 15 * 60 * 1000
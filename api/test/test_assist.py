@@ -0,0 +1,62 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+from chalicelib.core import assist, projects
+
+LIVE_SESSIONS = ["1", "2"]
+
+
+class FakeAssist(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        path = self.path.split("/")
+        if path[-1] == "key" and path[-2] == "sockets-list":
+            data = {"total": len(LIVE_SESSIONS), "sessions": LIVE_SESSIONS}
+        elif path[-2] == "key" and path[-3] == "sockets-live":
+            data = {"sessionID": path[-1]} if path[-1] in LIVE_SESSIONS + ["3"] else None
+        else:
+            data = None
+        body = json.dumps({"data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def assist_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAssist)
+    Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(assist, "ASSIST_URL", f"http://127.0.0.1:{server.server_port}/assist/test")
+    monkeypatch.setattr(projects, "get_project_key", lambda project_id: "key")
+    FakeAssist.requests = []
+    getattr(assist, "__live_sessions").invalidate(lambda k, v: True)
+    yield FakeAssist.requests
+    server.shutdown()
+
+
+class TestAssist:
+    def test_is_live(self, assist_server):
+        assert assist.is_live(project_id=1, session_id="1")
+        assert assist.is_live(project_id=1, session_id=2)
+        assert not assist.is_live(project_id=1, session_id="3")
+        # a single listing of the live sessions answers all the checks
+        assert assist_server == ["/assist/test/sockets-list/key"]
+
+    def test_session_exists(self, assist_server):
+        assert assist.is_live(project_id=1, session_id="1")
+        # not answered from the cached list
+        assert assist.session_exists(project_id=1, session_id="1")
+        assert assist.session_exists(project_id=1, session_id="3")
+        assert not assist.session_exists(project_id=1, session_id="4")
+        assert assist_server == ["/assist/test/sockets-list/key", "/assist/test/sockets-live/key/1",
+                                 "/assist/test/sockets-live/key/3", "/assist/test/sockets-live/key/4"]
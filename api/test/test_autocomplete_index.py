@@ -0,0 +1,48 @@
+from time import sleep
+
+from chalicelib.core import autocomplete_index
+
+
+def rows(type, values):
+    return [{"type": type, "value": v} for v in values]
+
+
+class TestAutocompleteIndex:
+    def test_search(self):
+        # the rows come ordered by value with the database collation (en_US ignores the case and the spaces first)
+        index = autocomplete_index.ProjectIndex(rows("CLICK", ["Buy", "Design", "signal", "sign in", "Sign up"])
+                                                + rows("USERCOUNTRY", ["DE", "FR"]))
+        assert index.search(type="CLICK", text="SIGN", limit=5, contains=False) == ["signal", "sign in", "Sign up"]
+        assert index.search(type="CLICK", text="sign", limit=2) == ["signal", "sign in", "Design"]
+        assert index.search(type="CLICK", text="n u", limit=5) == ["Sign up"]
+        assert index.search(type="CLICK", text="sign  up", limit=5) == ["Sign up"]
+        assert index.search(type="INPUT", text="sign", limit=5) == []
+        assert index.in_values(type="USERCOUNTRY", values=["DE", "US"]) == ["DE"]
+
+    def test_get(self, monkeypatch):
+        class Client:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def mogrify(self, query, params):
+                return query
+
+            def execute(self, query):
+                pass
+
+            def fetchall(self):
+                return rows("CLICK", ["Buy"])
+
+        monkeypatch.setattr(autocomplete_index.pg_client, "PostgresClient", Client)
+        # cold miss: SQL is used while the index is loaded in the background
+        assert autocomplete_index.get(project_id=-1, text="b") is None
+        while -1 in getattr(autocomplete_index, "__loading"):
+            sleep(0.01)
+        assert autocomplete_index.get(project_id=-1, text="b").search(type="CLICK", text="b", limit=5) == ["Buy"]
+        assert autocomplete_index.get(project_id=-1, text="b*") is None
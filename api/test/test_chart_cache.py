@@ -0,0 +1,38 @@
+from chalicelib.utils import chart_cache
+
+
+class TestChartCache:
+    def test_get_key(self):
+        payload = {"startTimestamp": 0, "endTimestamp": 7 * 3600 * 1000, "density": 7,
+                   "series": [{"filter": {"startTimestamp": 0, "endTimestamp": 7 * 3600 * 1000}}]}
+        key = chart_cache.get_key(project_id=1, payload=payload, density=7)
+        # the same window 10 minutes later is in the same step
+        shifted = {"startTimestamp": 600 * 1000, "endTimestamp": 7 * 3600 * 1000 + 600 * 1000, "density": 7,
+                   "series": [{"filter": {"endTimestamp": 7 * 3600 * 1000 + 600 * 1000, "startTimestamp": 600 * 1000}}]}
+        assert chart_cache.get_key(project_id=1, payload=shifted, density=7) == key
+        assert chart_cache.get_key(project_id=2, payload=payload, density=7) != key
+        assert chart_cache.get_key(project_id=1, payload={**payload, "density": 8}, density=8) != key
+
+    def test_get_key_live(self, monkeypatch):
+        # a live window and the window of 1h before are rounded to the same day step
+        now = 100 * 24 * 3600 * 1000 + 2 * 3600 * 1000
+        monkeypatch.setattr(chart_cache.TimeUTC, "now", lambda *args, **kwargs: now)
+        live = {"startTimestamp": now - 7 * 24 * 3600 * 1000, "endTimestamp": now}
+        older = {"startTimestamp": live["startTimestamp"] - 3600 * 1000, "endTimestamp": now - 3600 * 1000}
+        assert chart_cache.get_key(project_id=1, payload=live, density=7) \
+               != chart_cache.get_key(project_id=1, payload=older, density=7)
+        assert chart_cache.get_ttl(live["endTimestamp"]) == chart_cache.LIVE_TTL
+        assert chart_cache.get_ttl(older["endTimestamp"]) == chart_cache.TTL
+
+    def test_memory_backend(self):
+        backend = chart_cache.MemoryBackend(max_size=2)
+        backend.set("a", [1], ttl=60)
+        backend.set("b", [2], ttl=60)
+        assert backend.get("a") == [1]
+        backend.set("c", [3], ttl=60)
+        assert backend.get("b") is None
+        assert backend.get("a") == [1]
+        backend.set("d", [4], ttl=-1)
+        assert backend.get("d") is None
+        backend.incr_version("card:1")
+        assert backend.get_version("card:1") == 1
@@ -0,0 +1,56 @@
+import asyncio
+import gzip
+import os
+
+from chalicelib.utils import file_response
+
+
+def get(path, headers=None):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(k.encode(), v.encode()) for k, v in (headers or {}).items()]}
+    response = file_response.RangeFileResponse(path=path, media_type="application/octet-stream")
+    asyncio.run(response(scope, None, send))
+    start = messages[0]
+    return start["status"], dict([(k.decode(), v.decode()) for k, v in start["headers"]]), \
+        b"".join([m["body"] for m in messages[1:]])
+
+
+class TestFileResponse:
+    def test_parse_range(self):
+        assert file_response.parse_range(None, 100) is None
+        assert file_response.parse_range("bytes=0-9", 100) == (0, 9)
+        assert file_response.parse_range("bytes=90-", 100) == (90, 99)
+        assert file_response.parse_range("bytes=90-200", 100) == (90, 99)
+        assert file_response.parse_range("bytes=-10", 100) == (90, 99)
+        assert file_response.parse_range("bytes=0-9,20-29", 100) is None
+        assert file_response.parse_range("bytes=100-", 100) is False
+
+    def test_range(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "dom.mob")
+        with open(path, "wb") as f:
+            f.write(bytes(range(100)))
+        monkeypatch.setattr(file_response.RangeFileResponse, "chunk_size", 7)
+        status, headers, body = get(path)
+        assert status == 200 and body == bytes(range(100)) and headers["content-length"] == "100"
+        status, headers, body = get(path, {"range": "bytes=10-29"})
+        assert status == 206 and body == bytes(range(10, 30))
+        assert headers["content-range"] == "bytes 10-29/100" and headers["content-length"] == "20"
+        status, headers, body = get(path, {"range": "bytes=200-"})
+        assert status == 416 and headers["content-range"] == "bytes */100" and body == b""
+
+    def test_gzip_cache(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "dom.mob")
+        with open(path, "wb") as f:
+            f.write(b"mob" * 1000)
+        monkeypatch.setattr(file_response, "GZIP_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(file_response, "GZIP_MIN_AGE", 0)
+        status, headers, body = get(path, {"accept-encoding": "gzip"})
+        assert headers["content-encoding"] == "gzip" and gzip.decompress(body) == b"mob" * 1000
+        assert len(os.listdir(tmp_path / "cache")) == 1
+        # the cached version is reused
+        status, headers, body = get(path, {"accept-encoding": "gzip"})
+        assert gzip.decompress(body) == b"mob" * 1000 and len(os.listdir(tmp_path / "cache")) == 1
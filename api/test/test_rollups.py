@@ -0,0 +1,166 @@
+import psycopg2
+import pytest
+from psycopg2.extras import RealDictCursor
+
+import schemas
+from chalicelib.core import rollups
+from chalicelib.utils import pg_client
+
+MINUTE = 60 * 1000
+LOAD_TIME = schemas.AlertColumn.performance__page_load_time__average
+
+
+class Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def mogrify(self, query, params):
+        self.queries.append((query, params))
+        return query
+
+    def execute(self, query):
+        pass
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+    def fetchall(self):
+        return self.rows.pop(0)
+
+
+def client(cur):
+    class Client:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return cur
+
+        def __exit__(self, *args):
+            pass
+
+    return Client
+
+
+class TestRollups:
+    def test_get_values(self, monkeypatch):
+        cur = Cursor([[{"covered": True, "metric": "errors.4xx.count", "values_count": 7, "values_sum": 7.0}]])
+        monkeypatch.setattr(rollups.pg_client, "PostgresClient", client(cur))
+        values = rollups.get_values(project_id=1, metrics=["errors.4xx.count", "performance.image_load_time.average"],
+                                    start_timestamp=1_000_030_000, end_timestamp=1_000_900_000)
+        assert values == {schemas.AlertColumn.errors__4xx__count: 7,
+                          schemas.AlertColumn.performance__image_load_time__average: None}
+        query, params = cur.queries[-1]
+        # the buckets start at the first full minute after start_timestamp
+        assert params["first_bucket"] == 1_000_080_000
+        assert len(cur.queries) == 1
+
+    def test_get_values_not_covered(self, monkeypatch):
+        cur = Cursor([[{"covered": False, "metric": None, "values_count": None, "values_sum": None}], []])
+        monkeypatch.setattr(rollups.pg_client, "PostgresClient", client(cur))
+        assert rollups.get_values(project_id=1, metrics=["errors.4xx.count"],
+                                  start_timestamp=1_000_030_000, end_timestamp=1_000_900_000) is None
+        # no state: the rollups were never refreshed
+        assert rollups.get_values(project_id=1, metrics=["errors.4xx.count"],
+                                  start_timestamp=1_000_030_000, end_timestamp=1_000_900_000) is None
+
+
+@pytest.fixture
+def pg(monkeypatch):
+    # the queries run in a transaction that is rolled back, on a database with the openreplay schema
+    try:
+        conn = psycopg2.connect(**pg_client.PG_CONFIG, connect_timeout=2)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL is not reachable: {e}")
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute("SELECT to_regclass('public.metrics_rollups_state') IS NOT NULL AS found;")
+    if not cur.fetchone()["found"]:
+        conn.close()
+        pytest.skip("the database has no rollups tables")
+    monkeypatch.setattr(rollups.pg_client, "PostgresClient", client(cur))
+    cur.execute("DELETE FROM public.metrics_rollups_state WHERE source_table = 'events.pages';")
+    cur.execute("""SELECT EXISTS(SELECT 1
+                                 FROM information_schema.columns
+                                 WHERE table_schema = 'public' AND table_name = 'projects' AND column_name = 'tenant_id')
+                       AS has_tenants;""")
+    if cur.fetchone()["has_tenants"]:
+        cur.execute("""INSERT INTO public.projects (name, active, tenant_id)
+                       SELECT 'rollups test', TRUE, tenant_id FROM public.tenants LIMIT 1
+                       RETURNING project_id;""")
+    else:
+        cur.execute("INSERT INTO public.projects (name, active) VALUES ('rollups test', TRUE) RETURNING project_id;")
+    yield cur, cur.fetchone()["project_id"]
+    conn.rollback()
+    conn.close()
+
+
+def add_session(cur, project_id, session_id, start_ts):
+    cur.execute(cur.mogrify("""INSERT INTO public.sessions (session_id, project_id, tracker_version, start_ts, user_uuid,
+                                                           user_os, user_browser, user_agent, user_device,
+                                                           user_device_type, user_country)
+                               VALUES (%(session_id)s, %(project_id)s, 'test', %(start_ts)s, gen_random_uuid(),
+                                       'test', 'test', 'test', 'test', 'desktop', 'FR');""",
+                            {"session_id": session_id, "project_id": project_id, "start_ts": start_ts}))
+
+
+def add_pages(cur, session_id, pages):
+    # pages: [(timestamp, load_time)]
+    for i, (timestamp, load_time) in enumerate(pages):
+        cur.execute(cur.mogrify("""INSERT INTO events.pages (session_id, message_id, timestamp, host, path, load_time)
+                                   VALUES (%(session_id)s, %(message_id)s, %(timestamp)s, 'test', '/', %(load_time)s);""",
+                                {"session_id": session_id, "message_id": timestamp + i, "timestamp": timestamp,
+                                 "load_time": load_time}))
+
+
+def refresh(monkeypatch, to_timestamp):
+    # refreshes the rollups until to_timestamp
+    monkeypatch.setattr(rollups.TimeUTC, "now", lambda *args, **kwargs: to_timestamp + rollups.DELAY)
+    rollups.refresh()
+
+
+def get_start():
+    t0 = rollups.TimeUTC.now() - 60 * MINUTE
+    return t0 - t0 % MINUTE
+
+
+class TestRollupsQueries:
+    def test_get_values(self, pg, monkeypatch):
+        cur, project_id = pg
+        t0 = get_start()
+        # the first refresh starts the rollups at t0
+        refresh(monkeypatch, t0)
+        # head: started before the first full minute after start_timestamp
+        add_session(cur, project_id, session_id=9_100_000_000_000_000_001, start_ts=t0 + 30_000)
+        add_pages(cur, 9_100_000_000_000_000_001, [(t0 + 40_000, 100), (t0 + 16 * MINUTE, 200)])
+        add_session(cur, project_id, session_id=9_100_000_000_000_000_002, start_ts=t0 + 2 * MINUTE)
+        add_pages(cur, 9_100_000_000_000_000_002, [(t0 + 3 * MINUTE, 300), (t0 + 4 * MINUTE, 0), (t0 + 14 * MINUTE, 400)])
+        refresh(monkeypatch, t0 + 15 * MINUTE)
+        # tail: received since the watermark
+        add_pages(cur, 9_100_000_000_000_000_002, [(t0 + 17 * MINUTE, 500)])
+
+        def get_value():
+            return rollups.get_values(project_id=project_id, metrics=[LOAD_TIME.value],
+                                      start_timestamp=t0 + 10_000, end_timestamp=t0 + 30 * MINUTE)[LOAD_TIME]
+
+        # the 0 load time isn't a value
+        assert get_value() == 300
+        # the events moved from the tail to the rollups are counted once
+        refresh(monkeypatch, t0 + 20 * MINUTE)
+        assert get_value() == 300
+        # an event received after its minute was rolled up is only counted for the head sessions
+        add_pages(cur, 9_100_000_000_000_000_001, [(t0 + 5 * MINUTE, 1000)])
+        add_pages(cur, 9_100_000_000_000_000_002, [(t0 + 5 * MINUTE, 1000)])
+        assert get_value() == 2500 / 6
+
+    def test_get_values_not_covered(self, pg, monkeypatch):
+        cur, project_id = pg
+        t0 = get_start()
+        assert rollups.get_values(project_id=project_id, metrics=[LOAD_TIME.value],
+                                  start_timestamp=t0 + 10_000, end_timestamp=t0 + MINUTE) is None
+        refresh(monkeypatch, t0)
+        # sessions started before the rollups
+        assert rollups.get_values(project_id=project_id, metrics=[LOAD_TIME.value],
+                                  start_timestamp=t0 - MINUTE, end_timestamp=t0 + MINUTE) is None
+        assert rollups.get_values(project_id=project_id, metrics=[LOAD_TIME.value],
+                                  start_timestamp=t0, end_timestamp=t0 + MINUTE) == {LOAD_TIME: None}
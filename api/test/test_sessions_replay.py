@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep, time
+
+from chalicelib.core import sessions_replay
+
+
+def part(value, duration):
+    sleep(duration)
+    return value
+
+
+class TestSessionsReplay:
+    def test_get_parts(self):
+        get_parts = getattr(sessions_replay, "__get_parts")
+        start = time()
+        results = get_parts({"events": (part, {"value": [1], "duration": 0.2}),
+                             "issues": (part, {"value": [2], "duration": 0.2}),
+                             "live": (part, {"value": True, "duration": 1})},
+                            timeouts={"live": (0.3, False)})
+        assert results == {"events": [1], "issues": [2], "live": False}
+        # the parts run concurrently and the slow optional part is not awaited
+        assert time() - start < 0.5
+
+    def test_get_parts_busy_workers(self, monkeypatch):
+        # the live part waits for the only worker, its timeout starts when it runs
+        monkeypatch.setattr(sessions_replay, "__executor", ThreadPoolExecutor(max_workers=1))
+        get_parts = getattr(sessions_replay, "__get_parts")
+        results = get_parts({"events": (part, {"value": [1], "duration": 0.3}),
+                             "live": (part, {"value": True, "duration": 0.05})},
+                            timeouts={"live": (0.2, False)})
+        assert results == {"events": [1], "live": True}
@@ -0,0 +1,54 @@
+import math
+import random
+
+import numpy as np
+
+import schemas
+from chalicelib.core import significance
+
+
+def funnel_rows(n_sessions, seed=0):
+    # 2-stage funnel, the sessions with the issue "i1" drop 80% of the time, the others 10% of the time
+    rnd = random.Random(seed)
+    rows = []
+    for session_id in range(n_sessions):
+        issue = "i1" if rnd.random() < 0.3 else "i2" if rnd.random() < 0.3 else None
+        dropped = rnd.random() < (0.8 if issue == "i1" else 0.1)
+        rows.append({"session_id": session_id, "user_uuid": f"u{session_id % 50}",
+                     "stage1_timestamp": 1000, "stage2_timestamp": None if dropped else 2000,
+                     "issue_id": issue, "issue_type": None if issue is None else "click_rage",
+                     "issue_context": "", "issue_timestamp": None if issue is None else 1500})
+    return rows
+
+
+def stages():
+    return [schemas.SessionSearchEventSchema2(type=schemas.EventType.location, value=[f"/step{i}"],
+                                              operator=schemas.SearchEventOperator._is)
+            for i in range(2)]
+
+
+class TestSignificance:
+    def test_pearson_corr(self):
+        x = np.array([1, 0, 1, 1, 0, 0, 1, 0], dtype=bool)
+        y = np.array([-1, 0, -1, 1, 0, 1, -1, 0])
+        r, confidence, is_sign = significance.pearson_corr(x, y, 3)
+        expected = np.corrcoef(x, y == 1)[0, 1]
+        assert r[0] == 0
+        assert math.isclose(r[1], expected)
+        assert np.isnan(r[2]) and not is_sign[2]
+
+    def test_get_issues(self):
+        columns = significance.get_funnel_columns(funnel_rows(10000), 2)
+        stages_list = significance.get_stages(stages(), columns)
+        assert stages_list[0]["sessionsCount"] == 10000
+        assert stages_list[0]["usersCount"] == 50
+        n_critical, issues, total_drop = significance.get_issues(stages(), columns)
+        transitions = ~np.isnan(columns["stages"][1])
+        issues = {i["issue_id"]: i for i in issues["significant"] + issues["insignificant"]}
+        for i, issue in enumerate(columns["issues"]):
+            # only positive correlations with the conversion are kept
+            expected = max(np.corrcoef(transitions, columns["issue"] == i)[0, 1], 0)
+            assert issues[issue["issue_id"]]["conversion_impact"] == round(expected * 100)
+        assert issues["i1"]["conversion_impact"] == 0
+        assert n_critical == sum(i["affected_sessions"] for i in issues.values() if i["lost_conversions"] is not None)
+        assert total_drop >= 0
@@ -0,0 +1,51 @@
+import pytest
+
+moto = pytest.importorskip("moto")
+
+from decouple import config
+
+from chalicelib.core import sourcemaps, sourcemaps_parser
+from chalicelib.utils.storage import StorageClient, generators
+
+
+@pytest.fixture
+def buckets():
+    with moto.mock_aws():
+        StorageClient.client.create_bucket(Bucket=config("sourcemaps_bucket"))
+        StorageClient.client.create_bucket(Bucket=config("js_cache_bucket"))
+        yield
+
+
+def frame(url, line, column, function=None):
+    return {"fileName": url, "lineNumber": line, "columnNumber": column, "functionName": function}
+
+
+class TestSourcemaps:
+    def test_get_traces_group(self, buckets, monkeypatch):
+        url = "https://app.test/static/main.js"
+        StorageClient.client.put_object(Bucket=config("sourcemaps_bucket"),
+                                        Key=generators.generate_file_key_from_url(1, url), Body=b"map")
+        StorageClient.client.put_object(Bucket=config("js_cache_bucket"), Key="https/app.test/static/main.js",
+                                        Body=b"line1\nline2\nline3")
+        calls = []
+
+        def get_original_trace(key, positions, is_url=False):
+            calls.append(positions)
+            return [{"absPath": "https://app.test/static/src.js", "filename": "/static/src.js",
+                     "lineNo": p["line"], "colNo": 1, "function": "f", "context": []} for p in positions]
+
+        monkeypatch.setattr(sourcemaps_parser, "get_original_trace", get_original_trace)
+        monkeypatch.setattr(sourcemaps, "url_exists", lambda url: False)
+        payload = [frame(url, 1, 10, "a"), frame(url, 2, 20), frame("https://app.test/missing.js", 3, 30)]
+        trace, all_exists = sourcemaps.get_traces_group(project_id=1, payload=payload)
+        assert not all_exists
+        assert [t["function"] for t in trace] == ["a", "f", None]
+        assert trace[0]["context"] == [[1, "line1"]]
+        assert trace[1]["context"] == [[2, "line2"]]
+        assert trace[2]["frame"]["absPath"] == "https://app.test/missing.js"
+        assert calls == [[{"line": 1, "column": 10}, {"line": 2, "column": 20}]]
+
+        # the resolved positions are cached
+        trace, _ = sourcemaps.get_traces_group(project_id=1, payload=[frame(url, 2, 20), frame(url, 4, 40)])
+        assert calls[1:] == [[{"line": 4, "column": 40}]]
+        assert trace[0]["context"] == [[2, "line2"]]
@@ -0,0 +1,39 @@
+import pytest
+
+moto = pytest.importorskip("moto")
+
+from decouple import config
+
+from chalicelib.core import sessions_mobs
+from chalicelib.utils.storage import StorageClient, resolver
+
+
+@pytest.fixture
+def bucket():
+    with moto.mock_aws():
+        StorageClient.client.create_bucket(Bucket=config("sessions_bucket"))
+        yield config("sessions_bucket")
+
+
+class TestStorageResolver:
+    def test_exists_many(self, bucket):
+        StorageClient.client.put_object(Bucket=bucket, Key="resolver-1", Body=b"mob")
+        assert resolver.exists_many(bucket=bucket, keys=["resolver-1", "resolver-2"]) \
+               == {"resolver-1": True, "resolver-2": False}
+
+    def test_exists_many_cached(self, bucket):
+        StorageClient.client.put_object(Bucket=bucket, Key="resolver-3", Body=b"mob")
+        assert resolver.exists_many(bucket=bucket, keys=["resolver-3"]) == {"resolver-3": True}
+        StorageClient.client.delete_object(Bucket=bucket, Key="resolver-3")
+        assert resolver.exists_many(bucket=bucket, keys=["resolver-3"]) == {"resolver-3": True}
+
+    def test_get_replay_urls(self, bucket):
+        session_id = 7110
+        for pattern, default in (("SESSION_MOB_PATTERN_S", "%(sessionId)s"), ("SESSION_MOB_PATTERN_E", "%(sessionId)se")):
+            key = config(pattern, default=default) % {"sessionId": session_id, "projectId": 1}
+            StorageClient.client.put_object(Bucket=bucket, Key=key, Body=b"mob")
+        urls = sessions_mobs.get_replay_urls(project_id=1, session_id=session_id)
+        assert len(urls["domURL"]) == 2
+        assert urls["mobsUrl"] == []
+        urls = sessions_mobs.get_replay_urls(project_id=1, session_id=session_id + 1)
+        assert urls == {"domURL": [], "mobsUrl": []}
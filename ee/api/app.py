@@ -1,5 +1,4 @@
 import logging
-import queue
 import time
 from contextlib import asynccontextmanager
 
@@ -11,10 +10,10 @@ from fastapi.middleware.gzip import GZipMiddleware
 from starlette import status
 from starlette.responses import StreamingResponse, JSONResponse
 
-from chalicelib.core import traces
-from chalicelib.utils import events_queue
+from chalicelib.utils import ch_client
 from chalicelib.utils import helper
 from chalicelib.utils import pg_client
+from chalicelib.utils import write_buffer
 from routers import core, core_dynamic
 from routers import ee
 
@@ -37,12 +36,11 @@ async def lifespan(app: FastAPI):
     ap_logger.setLevel(loglevel)
 
     app.schedule = AsyncIOScheduler()
-    app.queue_system = queue.Queue()
     await pg_client.init()
-    await events_queue.init()
+    await write_buffer.init()
     app.schedule.start()
 
-    for job in core_crons.cron_jobs + core_dynamic_crons.cron_jobs + traces.cron_jobs + ee_crons.ee_cron_jobs:
+    for job in core_crons.cron_jobs + core_dynamic_crons.cron_jobs + ee_crons.ee_cron_jobs:
         app.schedule.add_job(id=job["func"].__name__, **job)
 
     ap_logger.info(">Scheduled jobs:")
@@ -55,9 +53,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logging.info(">>>>> shutting down <<<<<")
     app.schedule.shutdown(wait=True)
-    await traces.process_traces_queue()
-    await events_queue.terminate()
+    await write_buffer.terminate()
     await pg_client.terminate()
+    await ch_client.terminate()
 
 
 app = FastAPI(root_path=config("root_path", default="/api"), docs_url=config("docs_url", default=""),
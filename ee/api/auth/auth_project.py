@@ -24,16 +24,16 @@ class ProjectAuthorizer:
         current_project = None
         if self.project_identifier == "projectId" \
                 and (isinstance(value, int) or (isinstance(value, str) and value.isnumeric())) \
-                and projects.is_authorized(project_id=value, tenant_id=current_user.tenant_id,
-                                           user_id=user_id):
-            current_project = projects.get_project(tenant_id=current_user.tenant_id, project_id=value)
+                and projects.is_authorized_cached(project_id=value, tenant_id=current_user.tenant_id,
+                                                  user_id=user_id):
+            current_project = projects.get_project_cached(tenant_id=current_user.tenant_id, project_id=value)
         elif self.project_identifier == "projectKey":
-            current_project = projects.get_by_project_key(project_key=value)
+            current_project = projects.get_by_project_key_cached(project_key=value)
             if current_project is not None \
                     and request.state.authorizer_identity == "jwt" \
-                    and not projects.is_authorized(project_id=current_project["projectId"],
-                                                   tenant_id=current_user.tenant_id,
-                                                   user_id=user_id):
+                    and not projects.is_authorized_cached(project_id=current_project["projectId"],
+                                                          tenant_id=current_user.tenant_id,
+                                                          user_id=user_id):
                 current_project = None
 
         if current_project is None:
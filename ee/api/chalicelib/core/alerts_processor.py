@@ -1,12 +1,16 @@
 import decimal
 import logging
+import operator
+import re
+from concurrent.futures import ThreadPoolExecutor
+from time import time
 
 from decouple import config
 from pydantic_core._pydantic_core import ValidationError
 
 import schemas
 from chalicelib.core import alerts
-from chalicelib.core import alerts_listener
+from chalicelib.core import alerts_listener, rollups
 from chalicelib.utils import pg_client
 from chalicelib.utils.TimeUTC import TimeUTC
 
@@ -17,6 +21,9 @@ else:
 
 logging.basicConfig(level=config("LOGLEVEL", default=logging.INFO))
 
+# the groups of alerts are evaluated concurrently, each one with its own connection
+__executor = ThreadPoolExecutor(max_workers=config("ALERTS_WORKERS", cast=int, default=4))
+
 LeftToDb = {
     schemas.AlertColumn.performance__dom_content_loaded__average: {
         "table": "events.pages INNER JOIN public.sessions USING(session_id)",
@@ -76,6 +83,14 @@ LeftToDb = {
         "formula": "COUNT(DISTINCT session_id)", "condition": "source!='js_exception'", "joinSessions": False},
 }
 
+Operators = {
+    schemas.MathOperator._equal: operator.eq,
+    schemas.MathOperator._less: operator.lt,
+    schemas.MathOperator._greater: operator.gt,
+    schemas.MathOperator._less_eq: operator.le,
+    schemas.MathOperator._greater_eq: operator.ge,
+}
+
 # This is the frequency of execution for each threshold
 TimeInterval = {
     15: 3,
@@ -190,39 +205,178 @@ def Build(a):
     return q, params
 
 
-def process():
+def __add_filter(formula, condition):
+    # adds a FILTER clause to the first aggregate of the formula, e.g.: COALESCE(AVG(x) FILTER (WHERE ...),0)
+    start = re.search(r"\b(AVG|COUNT|SUM|MIN|MAX)\(", formula, re.IGNORECASE).end()
+    depth = 1
+    for i in range(start, len(formula)):
+        if formula[i] == "(":
+            depth += 1
+        elif formula[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return f"{formula[:i + 1]} FILTER (WHERE {condition}){formula[i + 1:]}"
+    raise ValueError(f"no aggregate found in formula: {formula}")
+
+
+def BuildGroup(alerts_group):
+    """
+    Builds one query for alerts without series that share the same project, table and currentPeriod,
+    each alert's formula is computed over its own condition&window with a FILTER clause
+
+    Returns the query, its params, the columns value_i and valid_i are the results of alerts_group[i]
+    """
+    colDef = LeftToDb[alerts_group[0]["query"]["left"]]
+    now = TimeUTC.now()
+    period = alerts_group[0]["options"]["currentPeriod"] * 60 * 1000
+    params = {"project_id": alerts_group[0]["projectId"], "now": now,
+              "startDate": now - period, "timestamp_sub2": now - 2 * period}
+    time_columns = []
+    if colDef["table"] != "public.sessions":
+        time_columns.append("timestamp")
+    if colDef.get("joinSessions", True):
+        time_columns.append("start_ts")
+    current = [f"{c} >= %(startDate)s AND {c} <= %(now)s" for c in time_columns]
+    previous = [f"{c} < %(startDate)s AND {c} >= %(timestamp_sub2)s" for c in time_columns]
+    only_current = all([a["detectionMethod"] == schemas.AlertDetectionMethod.threshold for a in alerts_group])
+    whole_window = [f"""{c} >= {"%(startDate)s" if only_current else "%(timestamp_sub2)s"} AND {c} <= %(now)s"""
+                    for c in time_columns]
+
+    projection = []
+    for i, a in enumerate(alerts_group):
+        alert_def = LeftToDb[a["query"]["left"]]
+        condition = [alert_def["condition"]] if alert_def.get("condition") else []
+        value = __add_filter(alert_def["formula"], " AND ".join(condition + current) if len(condition + current) > 0
+                             else "TRUE")
+        if a["detectionMethod"] != schemas.AlertDetectionMethod.threshold:
+            previous_value = __add_filter(alert_def["formula"], " AND ".join(condition + previous)
+                                          if len(condition + previous) > 0 else "TRUE")
+            if a["change"] == schemas.AlertDetectionType.change:
+                value = f"(({value})-({previous_value}))"
+            else:
+                value = f"(({value})/NULLIF(({previous_value}),0)-1)*100"
+        projection.append(f"""coalesce({value},0) AS value_{i}, 
+                              coalesce({value},0) {a["query"]["operator"]} {a["query"]["right"]} AS valid_{i}""")
+
+    q = f"""SELECT {", ".join(projection)}
+            FROM {colDef["table"]}
+            WHERE project_id = %(project_id)s 
+                {" ".join(["AND " + w for w in whole_window])}"""
+    return q, params
+
+
+def __process_alert(cur, alert):
+    query, params = Build(alert)
+    try:
+        query = cur.mogrify(query, params)
+    except Exception as e:
+        logging.error(
+            f"!!!Error while building alert query for alertId:{alert['alertId']} name: {alert['name']}")
+        logging.error(e)
+        return cur, None
+    logging.debug(alert)
+    logging.debug(query)
+    try:
+        cur.execute(query)
+        result = cur.fetchone()
+        if result["valid"]:
+            logging.info(f"Valid alert, notifying users, alertId:{alert['alertId']} name: {alert['name']}")
+            return cur, generate_notification(alert, result)
+    except Exception as e:
+        logging.error(
+            f"!!!Error while running alert query for alertId:{alert['alertId']} name: {alert['name']}")
+        logging.error(query)
+        logging.error(e)
+        cur = cur.recreate(rollback=True)
+    return cur, None
+
+
+def __process_from_rollups(alerts_group):
+    # the threshold alerts of the metrics kept in rollups don't need to scan their whole period
+    # returns the notifications and the alerts that still need to be evaluated
+    eligible = [a for a in alerts_group if a["seriesId"] is None
+                and a["detectionMethod"] == schemas.AlertDetectionMethod.threshold
+                and a["query"]["left"] in rollups.METRICS]
+    if len(eligible) == 0:
+        return [], alerts_group
+    now = TimeUTC.now()
+    try:
+        values = rollups.get_values(project_id=eligible[0]["projectId"],
+                                    metrics=list(set([a["query"]["left"] for a in eligible])),
+                                    start_timestamp=now - eligible[0]["options"]["currentPeriod"] * 60 * 1000,
+                                    end_timestamp=now)
+    except Exception as e:
+        logging.error(f"!!!Error while getting the rollups of alertIds:{[a['alertId'] for a in eligible]}")
+        logging.error(e)
+        values = None
+    if values is None:
+        return [], alerts_group
     notifications = []
-    all_alerts = alerts_listener.get_all_alerts()
+    for alert in eligible:
+        value = values[alert["query"]["left"]] or 0
+        if Operators[alert["query"]["operator"]](value, alert["query"]["right"]):
+            logging.info(f"Valid alert, notifying users, alertId:{alert['alertId']} name: {alert['name']}")
+            notifications.append(generate_notification(alert, {"value": value}))
+    return notifications, [a for a in alerts_group if a not in eligible]
+
+
+def __process_group(alerts_group):
+    notifications = []
+    if rollups.ENABLED:
+        notifications, alerts_group = __process_from_rollups(alerts_group)
+        if len(alerts_group) == 0:
+            return notifications
     with pg_client.PostgresClient() as cur:
-        for alert in all_alerts:
-            if can_check(alert):
-                query, params = Build(alert)
-                try:
-                    query = cur.mogrify(query, params)
-                except Exception as e:
-                    logging.error(
-                        f"!!!Error while building alert query for alertId:{alert['alertId']} name: {alert['name']}")
-                    logging.error(e)
-                    continue
-                logging.debug(alert)
+        if len(alerts_group) > 1:
+            try:
+                query = cur.mogrify(*BuildGroup(alerts_group))
                 logging.debug(query)
-                try:
-                    cur.execute(query)
-                    result = cur.fetchone()
-                    if result["valid"]:
+                cur.execute(query)
+                result = cur.fetchone()
+                for i, alert in enumerate(alerts_group):
+                    if result[f"valid_{i}"]:
                         logging.info(f"Valid alert, notifying users, alertId:{alert['alertId']} name: {alert['name']}")
-                        notifications.append(generate_notification(alert, result))
-                except Exception as e:
-                    logging.error(
-                        f"!!!Error while running alert query for alertId:{alert['alertId']} name: {alert['name']}")
-                    logging.error(query)
-                    logging.error(e)
-                    cur = cur.recreate(rollback=True)
-        if len(notifications) > 0:
+                        notifications.append(generate_notification(alert, {"value": result[f"value_{i}"]}))
+                return notifications
+            except Exception as e:
+                logging.error(f"!!!Error while running the query of a group of {len(alerts_group)} alerts, "
+                              f"alertIds:{[a['alertId'] for a in alerts_group]}, running them one by one")
+                logging.error(e)
+                cur = cur.recreate(rollback=True)
+        for alert in alerts_group:
+            cur, notification = __process_alert(cur, alert)
+            if notification is not None:
+                notifications.append(notification)
+    return notifications
+
+
+def process():
+    _now = time()
+    notifications = []
+    all_alerts = alerts_listener.get_all_alerts()
+    # the alerts without series on the same project, table and period are evaluated together,
+    # the alerts of a series have their own query
+    groups = {}
+    n_checked = 0
+    for alert in all_alerts:
+        if can_check(alert):
+            n_checked += 1
+            if alert["seriesId"] is None:
+                key = (alert["projectId"], LeftToDb[alert["query"]["left"]]["table"],
+                       alert["options"]["currentPeriod"])
+            else:
+                key = alert["alertId"]
+            groups[key] = groups.get(key, []) + [alert]
+    for group_notifications in __executor.map(__process_group, groups.values()):
+        notifications += group_notifications
+    if len(notifications) > 0:
+        with pg_client.PostgresClient() as cur:
             cur.execute(
                 cur.mogrify(f"""UPDATE public.alerts 
                                 SET options = options||'{{"lastNotification":{TimeUTC.now()}}}'::jsonb 
                                 WHERE alert_id IN %(ids)s;""", {"ids": tuple([n["alertId"] for n in notifications])}))
+    logging.info(f">>> alerts cycle: {n_checked}/{len(all_alerts)} alerts checked with {len(groups)} queries, "
+                 f"{len(notifications)} triggered in {time() - _now:.2f}s")
     if len(notifications) > 0:
         alerts.process_notifications(notifications)
 
@@ -7,9 +7,9 @@ from fastapi import HTTPException, status
 import schemas
 from chalicelib.core import funnels, issues, click_maps, sessions_insights, sessions_mobs, sessions_favorite, \
     product_analytics, custom_metrics_predefined
-from chalicelib.utils import helper, pg_client
+from chalicelib.utils import helper, pg_client, chart_cache
 from chalicelib.utils.TimeUTC import TimeUTC
-from chalicelib.utils.storage import StorageClient, extra
+from chalicelib.utils.storage import extra
 
 if config("EXP_ERRORS_SEARCH", cast=bool, default=False):
     logging.info(">>> Using experimental error search")
@@ -186,7 +186,7 @@ def __get_table_chart(project_id: int, data: schemas.CardTable, user_id: int):
     return supported.get(data.metric_of, not_supported)(project_id=project_id, data=data, user_id=user_id)
 
 
-def get_chart(project_id: int, data: schemas.CardSchema, user_id: int):
+def __get_chart(project_id: int, data: schemas.CardSchema, user_id: int):
     if data.is_predefined:
         return custom_metrics_predefined.get_metric(key=data.metric_of,
                                                     project_id=project_id,
@@ -203,6 +203,27 @@ def get_chart(project_id: int, data: schemas.CardSchema, user_id: int):
     return supported.get(data.metric_type, not_supported)(project_id=project_id, data=data, user_id=user_id)
 
 
+def __is_user_dependent(data: schemas.CardSchema):
+    # these charts contain the favorite/viewed state of the sessions&errors for the current user
+    return data.metric_type == schemas.MetricType.click_map \
+        or data.metric_type == schemas.MetricType.table \
+        and data.metric_of in (schemas.MetricOfTable.sessions, schemas.MetricOfTable.errors)
+
+
+def __get_chart_key(project_id: int, payload: dict, density: int, card_version: int = 0, user_id: int = None):
+    payload = {**payload, "cardVersion": card_version}
+    if user_id is not None:
+        payload["userId"] = user_id
+    return chart_cache.get_key(project_id=project_id, payload=payload, density=density)
+
+
+def get_chart(project_id: int, data: schemas.CardSchema, user_id: int, card_version: int = 0):
+    key = __get_chart_key(project_id=project_id, payload=data.model_dump(mode="json"), density=data.density,
+                          card_version=card_version, user_id=user_id if __is_user_dependent(data) else None)
+    return chart_cache.get_or_compute(key=key, ttl=chart_cache.get_ttl(data.endTimestamp),
+                                      compute=lambda: __get_chart(project_id=project_id, data=data, user_id=user_id))
+
+
 def __merge_metric_with_data(metric: schemas.CardSchema,
                              data: schemas.CardSessionsSchema) -> schemas.CardSchema:
     metric.startTimestamp = data.startTimestamp
@@ -463,6 +484,7 @@ def update_card(metric_id, user_id, project_id, data: schemas.CardSchema):
             AND (user_id = %(user_id)s OR is_public) 
             RETURNING metric_id;""", params)
         cur.execute(query)
+    chart_cache.invalidate(f"card:{metric_id}")
     return get_card(metric_id=metric_id, project_id=project_id, user_id=user_id)
 
 
@@ -565,6 +587,7 @@ def delete_card(project_id, metric_id, user_id):
                 except Exception as e:
                     logger.warning(f"!!!Error while tagging: {k} to {tag} for clickMap")
                     logger.error(str(e))
+    chart_cache.invalidate(f"card:{metric_id}")
     return {"state": "success"}
 
 
@@ -712,24 +735,21 @@ def make_chart_from_card(project_id, user_id, metric_id, data: schemas.CardSessi
     raw_metric["density"] = data.density
     metric: schemas.CardSchema = schemas.CardSchema(**raw_metric)
 
+    card_version = chart_cache.get_version(f"card:{metric_id}")
+
     if metric.is_predefined:
-        return custom_metrics_predefined.get_metric(key=metric.metric_of,
-                                                    project_id=project_id,
-                                                    data=data.model_dump())
+        key = __get_chart_key(project_id=project_id,
+                              payload={**data.model_dump(mode="json"), "metricOf": metric.metric_of},
+                              density=data.density, card_version=card_version)
+        return chart_cache.get_or_compute(key=key, ttl=chart_cache.get_ttl(data.endTimestamp),
+                                          compute=lambda: custom_metrics_predefined.get_metric(key=metric.metric_of,
+                                                                                               project_id=project_id,
+                                                                                               data=data.model_dump()))
     elif metric.metric_type == schemas.MetricType.click_map:
         if raw_metric["data"]:
-            keys = sessions_mobs. \
-                __get_mob_keys(project_id=project_id, session_id=raw_metric["data"]["sessionId"])
-            mob_exists = False
-            for k in keys:
-                if StorageClient.exists(bucket=config("sessions_bucket"), key=k):
-                    mob_exists = True
-                    break
-            if mob_exists:
-                raw_metric["data"]['domURL'] = sessions_mobs.get_urls(session_id=raw_metric["data"]["sessionId"],
-                                                                      project_id=project_id)
-                raw_metric["data"]['mobsUrl'] = sessions_mobs.get_urls_depercated(
-                    session_id=raw_metric["data"]["sessionId"])
+            urls = sessions_mobs.get_replay_urls(project_id=project_id, session_id=raw_metric["data"]["sessionId"])
+            if len(urls["domURL"]) > 0:
+                raw_metric["data"].update(urls)
                 return raw_metric["data"]
 
-    return get_chart(project_id=project_id, data=metric, user_id=user_id)
+    return get_chart(project_id=project_id, data=metric, user_id=user_id, card_version=card_version)
@@ -5,7 +5,7 @@ import requests
 # from confluent_kafka.admin import AdminClient
 from decouple import config
 
-from chalicelib.utils import pg_client, ch_client
+from chalicelib.utils import pg_client, ch_client, ttl_cache, write_buffer
 from chalicelib.utils.TimeUTC import TimeUTC
 
 
@@ -62,6 +62,11 @@ def __check_database_pg(*_):
         "details": {
             # "version": server_version["server_version"],
             # "schema": schema_version["version"]
+            "pools": pg_client.pool_stats(),
+            # hits/misses of the authorizers' users/projects caches, these would be PG queries otherwise
+            "caches": ttl_cache.stats(),
+            # the traces and signals waiting to be written, dropped when the buffers are full
+            "buffers": write_buffer.stats()
         }
     }
 
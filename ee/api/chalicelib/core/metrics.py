@@ -7,7 +7,7 @@ from chalicelib.utils import helper
 from chalicelib.utils.TimeUTC import TimeUTC
 from chalicelib.utils import ch_client
 from math import isnan
-from chalicelib.utils.metrics_helper import __get_step_size
+from chalicelib.utils.metrics_helper import __get_step_size, __get_histogram_params, __get_histogram_chart
 
 
 def __get_basic_constraints(table_name=None, time_constraint=True, round_start=False, data={}, identifier="project_id"):
@@ -1115,112 +1115,53 @@ def get_pages_response_time_distribution(project_id, startTimestamp=TimeUTC.now(
     ch_sub_query.append("pages.response_time>0")
     meta_condition = __get_meta_constraint(args)
     ch_sub_query += meta_condition
+    quantiles_keys = [50, 90, 95, 99]
 
     with ch_client.ClickHouseClient() as ch:
-        ch_query = f"""SELECT pages.response_time AS response_time,
-                              COUNT(1) AS count
+        ch_query = f"""SELECT COALESCE(avgOrNull(pages.response_time),0) AS avg,
+                              COUNT(1) AS total,
+                              min(pages.response_time) AS min_value,
+                              quantilesExact({",".join([str(i / 100) for i in quantiles_keys])})(pages.response_time) AS values
                         FROM {exp_ch_helper.get_main_events_table(startTimestamp)} AS pages
-                        WHERE {" AND ".join(ch_sub_query)} 
-                        GROUP BY response_time
-                        ORDER BY response_time;"""
+                        WHERE {" AND ".join(ch_sub_query)};"""
         params = {"project_id": project_id,
                   "startTimestamp": startTimestamp,
                   "endTimestamp": endTimestamp, **__get_constraint_values(args)}
-        rows = ch.execute(query=ch_query, params=params)
-        ch_query = f"""SELECT COALESCE(avgOrNull(pages.response_time),0) AS avg
-                        FROM {exp_ch_helper.get_main_events_table(startTimestamp)} AS pages
-                        WHERE {" AND ".join(ch_sub_query)};"""
-        avg = ch.execute(query=ch_query, params=params)[0]["avg"]
-        quantiles_keys = [50, 90, 95, 99]
-        ch_query = f"""SELECT quantilesExact({",".join([str(i / 100) for i in quantiles_keys])})(pages.response_time) AS values
-                        FROM {exp_ch_helper.get_main_events_table(startTimestamp)} AS pages
-                        WHERE {" AND ".join(ch_sub_query)};"""
-        quantiles = ch.execute(query=ch_query, params=params)
-    result = {
-        "value": avg,
-        "total": sum(r["count"] for r in rows),
-        "chart": [],
-        "percentiles": [{
-            "percentile": v,
-            "responseTime": (
-                quantiles[0]["values"][i] if quantiles[0]["values"][i] is not None and not math.isnan(
-                    quantiles[0]["values"][i]) else 0)} for i, v in enumerate(quantiles_keys)
-        ],
-        "extremeValues": [{"count": 0}],
-        "unit": schemas.TemplatePredefinedUnits.millisecond
-    }
-    if len(rows) > 0:
-        rows = helper.list_to_camel_case(rows)
-        _99 = result["percentiles"][-1]["responseTime"]
-        extreme_values_first_index = -1
-        for i, r in enumerate(rows):
-            if r["responseTime"] > _99:
-                extreme_values_first_index = i
-                break
-
-        if extreme_values_first_index >= 0:
-            extreme_values_first_index += 1
-            result["extremeValues"][0]["count"] = sum(r["count"] for r in rows[extreme_values_first_index:])
-            # result["extremeValues"][0]["responseTime"] = rows[extreme_values_first_index]["responseTime"]
-
-            rows = rows[:extreme_values_first_index]
+        stats = ch.execute(query=ch_query, params=params)[0]
+        result = {
+            "value": stats["avg"],
+            "total": stats["total"],
+            "chart": [],
+            "percentiles": [{
+                "percentile": v,
+                "responseTime": (
+                    stats["values"][i] if stats["values"][i] is not None and not math.isnan(
+                        stats["values"][i]) else 0)} for i, v in enumerate(quantiles_keys)
+            ],
+            "extremeValues": [{"count": 0}],
+            "unit": schemas.TemplatePredefinedUnits.millisecond
+        }
+        if stats["total"] == 0:
+            return result
 
-        # ------- Merge points to reduce chart length till density
+        # ------- Group the values up to the 99th percentile in density bins, the rest are the extreme values
         if density < len(quantiles_keys):
             density = len(quantiles_keys)
-
-        while len(rows) > density:
-            true_length = len(rows)
-            rows_partitions = []
-            offset = 0
-            for p in result["percentiles"]:
-                rows_partitions.append([])
-                for r in rows[offset:]:
-                    if r["responseTime"] < p["responseTime"]:
-                        rows_partitions[-1].append(r)
-                        offset += 1
-                    else:
-                        break
-            rows_partitions.append(rows[offset:])
-            # print(f"len rows partition: {len(rows_partitions)}")
-            # for r in rows_partitions:
-            #     print(f"{r[0]}  => {sum(v['count'] for v in r)}")
-
-            largest_partition = 0
-            for i in range(len(rows_partitions)):
-                if len(rows_partitions[i]) > len(rows_partitions[largest_partition]):
-                    largest_partition = i
-            # print(f"largest partition: {len(rows_partitions[largest_partition])}")
-
-            if len(rows_partitions[largest_partition]) <= 2:
-                break
-            # computing lowest merge diff
-            diff = rows[-1]["responseTime"]
-            for i in range(1, len(rows_partitions[largest_partition]) - 1, 1):
-                v1 = rows_partitions[largest_partition][i]
-                v2 = rows_partitions[largest_partition][i + 1]
-                if (v2["responseTime"] - v1["responseTime"]) < diff:
-                    diff = v2["responseTime"] - v1["responseTime"]
-            # print(f"lowest merge diff: {diff}")
-            i = 1
-            while i < len(rows_partitions[largest_partition]) - 1 and true_length > density - 1:
-                v1 = rows_partitions[largest_partition][i]
-                v2 = rows_partitions[largest_partition][i + 1]
-                if (v2["responseTime"] - v1["responseTime"]) == diff:
-                    rows_partitions[largest_partition][i]["count"] += v2["count"]
-                    rows_partitions[largest_partition][i]["responseTime"] = v2["responseTime"]
-                    del rows_partitions[largest_partition][i + 1]
-                    true_length -= 1
-                else:
-                    i += 1
-
-            rows = [r for rp in rows_partitions for r in rp]
-
-        if extreme_values_first_index == len(rows):
-            rows.append({"count": 0, "responseTime": rows[-1]["responseTime"] + 10})
-
-        result["chart"] = rows
-
+        params = {**params, **__get_histogram_params(min_value=stats["min_value"],
+                                                     max_value=int(result["percentiles"][-1]["responseTime"]),
+                                                     density=density)}
+        ch_query = f"""SELECT if(pages.response_time > %(histogram_max)s, %(histogram_bins)s,
+                                 least(intDiv(pages.response_time - %(histogram_min)s, %(histogram_step)s),
+                                       %(histogram_bins)s - 1)) AS bucket,
+                              max(pages.response_time) AS value,
+                              COUNT(1) AS count
+                        FROM {exp_ch_helper.get_main_events_table(startTimestamp)} AS pages
+                        WHERE {" AND ".join(ch_sub_query)}
+                        GROUP BY bucket
+                        ORDER BY bucket;"""
+        rows = ch.execute(query=ch_query, params=params)
+    result["chart"], result["extremeValues"][0]["count"] = __get_histogram_chart(rows=rows, density=density,
+                                                                                 value_key="responseTime")
     return result
 
 
@@ -2587,6 +2528,62 @@ def get_top_metrics_avg_response_time(project_id, startTimestamp=TimeUTC.now(del
     helper.__time_value(results)
     return helper.dict_to_camel_case(results)
 
+# The get_top_metrics_avg_* widgets: the average of a column of the pages and its chart, ignoring the values <= 0
+PAGES_AVG_METRICS = {schemas.MetricOfWebVitals.avg_response_time: "response_time",
+                     schemas.MetricOfWebVitals.avg_first_paint: "first_paint",
+                     schemas.MetricOfWebVitals.avg_dom_content_loaded: "dom_content_loaded_event_time",
+                     schemas.MetricOfWebVitals.avg_till_first_byte: "ttfb",
+                     schemas.MetricOfWebVitals.avg_time_to_interactive: "time_to_interactive"}
+
+
+def get_pages_avg_metrics(project_id, keys, startTimestamp=TimeUTC.now(delta_days=-1),
+                          endTimestamp=TimeUTC.now(), value=None, density=20, **args):
+    # Computes the PAGES_AVG_METRICS of keys with one scan of the pages for the values and one for the charts
+    columns = list(dict.fromkeys(PAGES_AVG_METRICS[k] for k in keys))
+    step_size = __get_step_size(endTimestamp=endTimestamp, startTimestamp=startTimestamp, density=density)
+    ch_sub_query_chart = __get_basic_constraints(table_name="pages", round_start=True, data=args)
+    ch_sub_query_chart.append("pages.event_type='LOCATION'")
+    meta_condition = __get_meta_constraint(args)
+    ch_sub_query_chart += meta_condition
+    ch_sub_query = __get_basic_constraints(table_name="pages", data=args)
+    ch_sub_query.append("pages.event_type='LOCATION'")
+    ch_sub_query += meta_condition
+    any_value = "(" + " OR ".join([f"isNotNull(pages.{c}) AND pages.{c}>0" for c in columns]) + ")"
+    ch_sub_query.append(any_value)
+    ch_sub_query_chart.append(any_value)
+
+    if value is not None:
+        ch_sub_query.append("pages.url_path = %(value)s")
+        ch_sub_query_chart.append("pages.url_path = %(value)s")
+    averages = ",".join([f"COALESCE(avgOrNullIf(pages.{c}, isNotNull(pages.{c}) AND pages.{c}>0),0) AS avg_{c}"
+                         for c in columns])
+    with ch_client.ClickHouseClient() as ch:
+        ch_query = f"""SELECT {averages}
+                       FROM {exp_ch_helper.get_main_events_table(startTimestamp)} AS pages 
+                       WHERE {" AND ".join(ch_sub_query)};"""
+        params = {"step_size": step_size, "project_id": project_id,
+                  "startTimestamp": startTimestamp,
+                  "endTimestamp": endTimestamp,
+                  "value": value, **__get_constraint_values(args)}
+        row = ch.execute(query=ch_query, params=params)[0]
+        ch_query = f"""SELECT toUnixTimestamp(toStartOfInterval(pages.datetime, INTERVAL %(step_size)s second ))*1000 AS timestamp,
+                              {averages}
+                       FROM {exp_ch_helper.get_main_events_table(startTimestamp)} AS pages
+                       WHERE {" AND ".join(ch_sub_query_chart)}
+                       GROUP BY timestamp
+                       ORDER BY timestamp;"""
+        rows = ch.execute(query=ch_query, params=params)
+        rows = __complete_missing_steps(rows=rows, start_time=startTimestamp,
+                                        end_time=endTimestamp,
+                                        density=density, neutral={f"avg_{c}": 0 for c in columns})
+    results = {}
+    for k in keys:
+        c = PAGES_AVG_METRICS[k]
+        results[k] = {"value": row[f"avg_{c}"],
+                      "chart": [{"timestamp": r["timestamp"], "value": r[f"avg_{c}"]} for r in rows]}
+        helper.__time_value(results[k])
+    return results
+
 
 def get_top_metrics_count_requests(project_id, startTimestamp=TimeUTC.now(delta_days=-1),
                                    endTimestamp=TimeUTC.now(), value=None, density=20, **args):
@@ -15,51 +15,58 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def __transform_journey(rows, reverse_path=False):
-    total_100p = 0
-    number_of_step1 = 0
-    for r in rows:
-        if r["event_number_in_session"] > 1:
-            break
-        number_of_step1 += 1
-        total_100p += r["sessions_count"]
-    # for i in range(number_of_step1):
-    #     rows[i]["value"] = 100 / number_of_step1
+def __add_journey_row(r, total_100p, nodes, nodes_values, links, reverse_path):
+    # nodes ::: the index of each node in nodes_values by its key
+    r["value"] = r["sessions_count"] * 100 / total_100p
+    source = f"{r['event_number_in_session']}_{r['event_type']}_{r['e_value']}"
+    sr_idx = nodes.get(source)
+    if sr_idx is None:
+        sr_idx = nodes[source] = len(nodes_values)
+        nodes_values.append({"name": r['e_value'], "eventType": r['event_type'],
+                             "avgTimeFromPrevious": 0, "sessionsCount": 0})
+    if r['next_value']:
+        target = f"{r['event_number_in_session'] + 1}_{r['next_type']}_{r['next_value']}"
+        tg_idx = nodes.get(target)
+        if tg_idx is None:
+            tg_idx = nodes[target] = len(nodes_values)
+            nodes_values.append({"name": r['next_value'], "eventType": r['next_type'],
+                                 "avgTimeFromPrevious": 0, "sessionsCount": 0})
+
+        if r["avg_time_from_previous"] is not None:
+            nodes_values[tg_idx]["avgTimeFromPrevious"] += r["avg_time_from_previous"] * r["sessions_count"]
+            nodes_values[tg_idx]["sessionsCount"] += r["sessions_count"]
+        link = {"eventType": r['event_type'], "sessionsCount": r["sessions_count"],
+                "value": r["value"], "avgTimeFromPrevious": r["avg_time_from_previous"]}
+        if not reverse_path:
+            link["source"] = sr_idx
+            link["target"] = tg_idx
+        else:
+            link["source"] = tg_idx
+            link["target"] = sr_idx
+        links.append(link)
 
-    # for i in range(number_of_step1, len(rows)):
-    for i in range(len(rows)):
-        rows[i]["value"] = rows[i]["sessions_count"] * 100 / total_100p
 
-    nodes = []
+def __transform_journey(rows, reverse_path=False):
+    # rows can be a stream ordered by event_number_in_session: only the rows of the first step are kept
+    # until their total is known, the next ones are processed as they come
+    first_step = []
+    total_100p = None
+    nodes = {}
     nodes_values = []
     links = []
     for r in rows:
-        source = f"{r['event_number_in_session']}_{r['event_type']}_{r['e_value']}"
-        if source not in nodes:
-            nodes.append(source)
-            nodes_values.append({"name": r['e_value'], "eventType": r['event_type'],
-                                 "avgTimeFromPrevious": 0, "sessionsCount": 0})
-        if r['next_value']:
-            target = f"{r['event_number_in_session'] + 1}_{r['next_type']}_{r['next_value']}"
-            if target not in nodes:
-                nodes.append(target)
-                nodes_values.append({"name": r['next_value'], "eventType": r['next_type'],
-                                     "avgTimeFromPrevious": 0, "sessionsCount": 0})
-
-            sr_idx = nodes.index(source)
-            tg_idx = nodes.index(target)
-            if r["avg_time_from_previous"] is not None:
-                nodes_values[tg_idx]["avgTimeFromPrevious"] += r["avg_time_from_previous"] * r["sessions_count"]
-                nodes_values[tg_idx]["sessionsCount"] += r["sessions_count"]
-            link = {"eventType": r['event_type'], "sessionsCount": r["sessions_count"],
-                    "value": r["value"], "avgTimeFromPrevious": r["avg_time_from_previous"]}
-            if not reverse_path:
-                link["source"] = sr_idx
-                link["target"] = tg_idx
-            else:
-                link["source"] = tg_idx
-                link["target"] = sr_idx
-            links.append(link)
+        if total_100p is None:
+            if r["event_number_in_session"] <= 1:
+                first_step.append(r)
+                continue
+            total_100p = sum([f["sessions_count"] for f in first_step])
+            for f in first_step:
+                __add_journey_row(f, total_100p, nodes, nodes_values, links, reverse_path)
+        __add_journey_row(r, total_100p, nodes, nodes_values, links, reverse_path)
+    if total_100p is None:
+        total_100p = sum([f["sessions_count"] for f in first_step])
+        for f in first_step:
+            __add_journey_row(f, total_100p, nodes, nodes_values, links, reverse_path)
     for n in nodes_values:
         if n["sessionsCount"] > 0:
             n["avgTimeFromPrevious"] = n["avgTimeFromPrevious"] / n["sessionsCount"]
@@ -481,13 +488,19 @@ SELECT *
 FROM ({" UNION ALL ".join(projection_query)}) AS chart_steps
 ORDER BY event_number_in_session;"""
         logger.debug("---------Q3-----------")
-        rows = ch.execute(query=ch_query3, params=params)
+        try:
+            journey = __transform_journey(rows=ch.execute_iter(query=ch_query3, params=params),
+                                          reverse_path=reverse)
+        finally:
+            # the connection goes back to the pool, its temporary tables would be kept
+            ch.execute(query=f"DROP TEMPORARY TABLE IF EXISTS pre_ranked_events_{time_key}")
+            ch.execute(query=f"DROP TEMPORARY TABLE IF EXISTS ranked_events_{time_key}")
         if time() - _now > 2:
             logger.warning(f">>>>>>>>>PathAnalysis long query EE ({int(time() - _now)}s)<<<<<<<<<")
             logger.warning(ch.format(ch_query3, params))
             logger.warning("----------------------")
 
-    return __transform_journey(rows=rows, reverse_path=reverse)
+    return journey
 
 #
 # def __compute_weekly_percentage(rows):
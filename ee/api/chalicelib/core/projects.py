@@ -5,9 +5,26 @@ from fastapi import HTTPException, status
 
 import schemas
 from chalicelib.core import users
-from chalicelib.utils import pg_client, helper
+from chalicelib.utils import pg_client, helper, ttl_cache
 from chalicelib.utils.TimeUTC import TimeUTC
 
+# Short-lived copies of the projects read by the authorizer on every request, dropped by the write paths below
+PROJECTS_CACHE = ttl_cache.get_cache("projects")
+
+
+def invalidate_cache(project_id):
+    project_id = int(project_id)
+    # get_by_project_key returns the project_id only
+    PROJECTS_CACHE.invalidate(lambda k, v: k[1] == project_id or k[0] == "key" and v == project_id
+                                           or isinstance(v, dict) and v["projectId"] == project_id)
+
+
+def invalidate_authorizations(tenant_id=None, user_id=None):
+    # Drops the is_authorized results of a tenant (a role changed) or of a user (the user's role changed)
+    PROJECTS_CACHE.invalidate(lambda k, v: k[0] == "authorized"
+                                           and (tenant_id is None or k[2] == tenant_id)
+                                           and (user_id is None or k[3] == user_id))
+
 
 def __exists_by_name(tenant_id: int, name: str, exclude_id: Optional[int]) -> bool:
     with pg_client.PostgresClient() as cur:
@@ -39,7 +56,9 @@ def __update(tenant_id, project_id, changes):
                                 RETURNING project_id,name,gdpr;""",
                             {"project_id": project_id, **changes})
         cur.execute(query=query)
-        return helper.dict_to_camel_case(cur.fetchone())
+        row = cur.fetchone()
+    invalidate_cache(project_id)
+    return helper.dict_to_camel_case(row)
 
 
 def __create(tenant_id, data):
@@ -204,6 +223,7 @@ def delete(tenant_id, user_id, project_id):
                                WHERE project_id = %(project_id)s;""",
                             {"project_id": project_id})
         cur.execute(query=query)
+    invalidate_cache(project_id)
     return {"data": {"state": "success"}}
 
 
@@ -252,6 +272,27 @@ def get_by_project_key(project_key):
         return row["project_id"] if row else None
 
 
+def get_project_cached(tenant_id, project_id):
+    # The authorizer's get_project, only found projects are kept so a new project is visible right away
+    key = ("id", int(project_id), tenant_id)
+    found, row = PROJECTS_CACHE.get(key)
+    if not found:
+        row = get_project(tenant_id=tenant_id, project_id=project_id)
+        if row is not None:
+            PROJECTS_CACHE.set(key, row)
+    return row
+
+
+def get_by_project_key_cached(project_key):
+    key = ("key", project_key)
+    found, row = PROJECTS_CACHE.get(key)
+    if not found:
+        row = get_by_project_key(project_key=project_key)
+        if row is not None:
+            PROJECTS_CACHE.set(key, row)
+    return row
+
+
 def get_project_key(project_id):
     with pg_client.PostgresClient() as cur:
         query = cur.mogrify("""SELECT project_key
@@ -329,6 +370,17 @@ def is_authorized(project_id, tenant_id, user_id=None):
     return row is not None
 
 
+def is_authorized_cached(project_id, tenant_id, user_id=None):
+    if project_id is None or not str(project_id).isdigit():
+        return False
+    key = ("authorized", int(project_id), tenant_id, user_id)
+    found, authorized = PROJECTS_CACHE.get(key)
+    if not found:
+        authorized = is_authorized(project_id=project_id, tenant_id=tenant_id, user_id=user_id)
+        PROJECTS_CACHE.set(key, authorized)
+    return authorized
+
+
 def is_authorized_batch(project_ids, tenant_id):
     if project_ids is None or not len(project_ids):
         return False
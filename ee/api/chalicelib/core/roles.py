@@ -75,7 +75,7 @@ def update(tenant_id, user_id, role_id, data: schemas.RolePayloadSchema):
                                     {"role_id": role_id, **{f"project_id_{i}": p for i, p in enumerate(n_projects)}})
                 cur.execute(query=query)
             row["projects"] = data.projects
-
+    users.invalidate_tenant_cache(tenant_id)
     return helper.dict_to_camel_case(row)
 
 
@@ -1,9 +1,60 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import time
+
+from decouple import config
+
 import schemas
 from chalicelib.core import events, metadata, events_ios, \
     sessions_mobs, issues, resources, assist, sessions_devtool, sessions_notes
 from chalicelib.utils import errors_helper
 from chalicelib.utils import pg_client, helper
 
+logger = logging.getLogger(__name__)
+
+__executor = ThreadPoolExecutor(max_workers=config("REPLAY_WORKERS", cast=int, default=20))
+# the replay doesn't wait longer for assist, the session is considered not live
+LIVE_TIMEOUT = config("REPLAY_LIVE_TIMEOUT", cast=float, default=2)
+
+
+def __get_parts(parts, timeouts=None):
+    """
+    Runs the independent fetches of a session concurrently and returns their results by name,
+    parts: {name: (function, kwargs)}
+    timeouts: {name: (seconds, default)} for the optional parts, the default is returned if a part is slower
+    """
+    timeouts = timeouts or {}
+    start = time()
+    durations = {}
+    started = {name: Event() for name in parts}
+    started_at = {}
+
+    def timed(name, f, kwargs):
+        part_start = started_at[name] = time()
+        started[name].set()
+        try:
+            return f(**kwargs)
+        finally:
+            durations[name] = round((time() - part_start) * 1000)
+
+    futures = {name: __executor.submit(timed, name, f, kwargs) for name, (f, kwargs) in parts.items()}
+    results = {}
+    for name, future in futures.items():
+        if name in timeouts:
+            timeout, default = timeouts[name]
+            # the time spent waiting for a free worker doesn't count
+            started[name].wait()
+            try:
+                results[name] = future.result(timeout=max(0, started_at[name] + timeout - time()))
+            except TimeoutError:
+                logger.warning(f"!! {name} took more than {timeout}s, using the default value")
+                results[name] = default
+        else:
+            results[name] = future.result()
+    logger.debug(f"session parts fetched in {round((time() - start) * 1000)}ms: {durations}")
+    return results
+
 
 def __group_metadata(session, project_metadata):
     meta = {}
@@ -48,49 +99,73 @@ def get_by_id2_pg(project_id, session_id, context: schemas.CurrentContext, full_
         cur.execute(query=query)
 
         data = cur.fetchone()
-        if data is not None:
-            data = helper.dict_to_camel_case(data)
-            if full_data:
-                if data["platform"] == 'ios':
-                    data['events'] = events_ios.get_by_sessionId(project_id=project_id, session_id=session_id)
-                    for e in data['events']:
-                        if e["type"].endswith("_IOS"):
-                            e["type"] = e["type"][:-len("_IOS")]
-                    data['crashes'] = events_ios.get_crashes_by_session_id(session_id=session_id)
-                    data['userEvents'] = events_ios.get_customs_by_sessionId(project_id=project_id,
-                                                                             session_id=session_id)
-                    data['mobsUrl'] = []
-                else:
-                    data['events'] = events.get_by_session_id(project_id=project_id, session_id=session_id,
-                                                              group_clickrage=True)
-                    all_errors = events.get_errors_by_session_id(session_id=session_id, project_id=project_id)
-                    data['stackEvents'] = [e for e in all_errors if e['source'] != "js_exception"]
-                    # to keep only the first stack
-                    # limit the number of errors to reduce the response-body size
-                    data['errors'] = [errors_helper.format_first_stack_frame(e) for e in all_errors
-                                      if e['source'] == "js_exception"][:500]
-                    data['userEvents'] = events.get_customs_by_session_id(project_id=project_id,
-                                                                          session_id=session_id)
-                    data['domURL'] = sessions_mobs.get_urls(session_id=session_id, project_id=project_id,
-                                                            check_existence=False)
-                    data['mobsUrl'] = sessions_mobs.get_urls_depercated(session_id=session_id, check_existence=False)
-                    data['devtoolsURL'] = sessions_devtool.get_urls(session_id=session_id, project_id=project_id,
-                                                                    context=context, check_existence=False)
-                    data['resources'] = resources.get_by_session_id(session_id=session_id, project_id=project_id,
-                                                                    start_ts=data["startTs"], duration=data["duration"])
-
-                data['notes'] = sessions_notes.get_session_notes(tenant_id=context.tenant_id, project_id=project_id,
-                                                                 session_id=session_id, user_id=context.user_id)
-                data['metadata'] = __group_metadata(project_metadata=data.pop("projectMetadata"), session=data)
-                data['issues'] = issues.get_by_session_id(session_id=session_id, project_id=project_id)
-                data['live'] = live and assist.is_live(project_id=project_id, session_id=session_id,
-                                                       project_key=data["projectKey"])
-            data["inDB"] = True
-            return data
-        elif live:
-            return assist.get_live_session_by_id(project_id=project_id, session_id=session_id)
-        else:
-            return None
+    if data is not None:
+        data = helper.dict_to_camel_case(data)
+        if full_data:
+            parts = {"notes": (sessions_notes.get_session_notes,
+                               {"tenant_id": context.tenant_id, "project_id": project_id,
+                                "session_id": session_id, "user_id": context.user_id}),
+                     "issues": (issues.get_by_session_id, {"session_id": session_id, "project_id": project_id})}
+            if live:
+                parts["live"] = (assist.is_live, {"project_id": project_id, "session_id": session_id,
+                                                  "project_key": data["projectKey"]})
+            if data["platform"] == 'ios':
+                parts["events"] = (events_ios.get_by_sessionId,
+                                   {"project_id": project_id, "session_id": session_id})
+                parts["crashes"] = (events_ios.get_crashes_by_session_id, {"session_id": session_id})
+                parts["userEvents"] = (events_ios.get_customs_by_sessionId,
+                                       {"project_id": project_id, "session_id": session_id})
+            else:
+                parts["events"] = (events.get_by_session_id, {"project_id": project_id, "session_id": session_id,
+                                                              "group_clickrage": True})
+                parts["errors"] = (events.get_errors_by_session_id,
+                                   {"session_id": session_id, "project_id": project_id})
+                parts["userEvents"] = (events.get_customs_by_session_id,
+                                       {"project_id": project_id, "session_id": session_id})
+                parts["domURL"] = (sessions_mobs.get_urls, {"session_id": session_id, "project_id": project_id,
+                                                            "check_existence": False})
+                parts["mobsUrl"] = (sessions_mobs.get_urls_depercated,
+                                    {"session_id": session_id, "check_existence": False})
+                parts["devtoolsURL"] = (sessions_devtool.get_urls,
+                                        {"session_id": session_id, "project_id": project_id,
+                                         "context": context, "check_existence": False})
+                parts["resources"] = (resources.get_by_session_id,
+                                      {"session_id": session_id, "project_id": project_id,
+                                       "start_ts": data["startTs"], "duration": data["duration"]})
+            parts = __get_parts(parts, timeouts={"live": (LIVE_TIMEOUT, False)})
+
+            if data["platform"] == 'ios':
+                data['events'] = parts["events"]
+                for e in data['events']:
+                    if e["type"].endswith("_IOS"):
+                        e["type"] = e["type"][:-len("_IOS")]
+                data['crashes'] = parts["crashes"]
+                data['userEvents'] = parts["userEvents"]
+                data['mobsUrl'] = []
+            else:
+                data['events'] = parts["events"]
+                all_errors = parts["errors"]
+                data['stackEvents'] = [e for e in all_errors if e['source'] != "js_exception"]
+                # to keep only the first stack
+                # limit the number of errors to reduce the response-body size
+                data['errors'] = [errors_helper.format_first_stack_frame(e) for e in all_errors
+                                  if e['source'] == "js_exception"][:500]
+                data['userEvents'] = parts["userEvents"]
+                data['domURL'] = parts["domURL"]
+                data['mobsUrl'] = parts["mobsUrl"]
+                data['devtoolsURL'] = parts["devtoolsURL"]
+                data['resources'] = parts["resources"]
+
+            data['notes'] = parts["notes"]
+            data['metadata'] = __group_metadata(project_metadata=data.pop("projectMetadata"), session=data)
+            data['issues'] = parts["issues"]
+            data['live'] = live and parts["live"]
+        data["inDB"] = True
+        return data
+    elif live:
+        return assist.get_live_session_by_id(project_id=project_id, session_id=session_id)
+    else:
+        return None
 
 
 # This function should not use Clickhouse because it doesn't have `file_key`
@@ -126,29 +201,43 @@ def get_replay(project_id, session_id, context: schemas.CurrentContext, full_dat
         cur.execute(query=query)
 
         data = cur.fetchone()
-        if data is not None:
-            data = helper.dict_to_camel_case(data)
-            if full_data:
-                if data["platform"] == 'ios':
-                    data['mobsUrl'] = []
-                    data['videoURL'] = sessions_mobs.get_ios_videos(session_id=session_id, project_id=project_id,
-                                                                    check_existence=False)
-                else:
-                    data['domURL'] = sessions_mobs.get_urls(session_id=session_id, project_id=project_id,
-                                                            check_existence=False)
-                    data['mobsUrl'] = sessions_mobs.get_urls_depercated(session_id=session_id, check_existence=False)
-                    data['devtoolsURL'] = sessions_devtool.get_urls(session_id=session_id, project_id=project_id,
-                                                                    context=context, check_existence=False)
-
-                data['metadata'] = __group_metadata(project_metadata=data.pop("projectMetadata"), session=data)
-                data['live'] = live and assist.is_live(project_id=project_id, session_id=session_id,
-                                                       project_key=data["projectKey"])
-            data["inDB"] = True
-            return data
-        elif live:
-            return assist.get_live_session_by_id(project_id=project_id, session_id=session_id)
-        else:
-            return None
+    if data is not None:
+        data = helper.dict_to_camel_case(data)
+        if full_data:
+            parts = {}
+            if live:
+                parts["live"] = (assist.is_live, {"project_id": project_id, "session_id": session_id,
+                                                  "project_key": data["projectKey"]})
+            if data["platform"] == 'ios':
+                parts["videoURL"] = (sessions_mobs.get_ios_videos,
+                                     {"session_id": session_id, "project_id": project_id,
+                                      "check_existence": False})
+            else:
+                parts["domURL"] = (sessions_mobs.get_urls, {"session_id": session_id, "project_id": project_id,
+                                                            "check_existence": False})
+                parts["mobsUrl"] = (sessions_mobs.get_urls_depercated,
+                                    {"session_id": session_id, "check_existence": False})
+                parts["devtoolsURL"] = (sessions_devtool.get_urls,
+                                        {"session_id": session_id, "project_id": project_id,
+                                         "context": context, "check_existence": False})
+            parts = __get_parts(parts, timeouts={"live": (LIVE_TIMEOUT, False)})
+
+            if data["platform"] == 'ios':
+                data['mobsUrl'] = []
+                data['videoURL'] = parts["videoURL"]
+            else:
+                data['domURL'] = parts["domURL"]
+                data['mobsUrl'] = parts["mobsUrl"]
+                data['devtoolsURL'] = parts["devtoolsURL"]
+
+            data['metadata'] = __group_metadata(project_metadata=data.pop("projectMetadata"), session=data)
+            data['live'] = live and parts["live"]
+        data["inDB"] = True
+        return data
+    elif live:
+        return assist.get_live_session_by_id(project_id=project_id, session_id=session_id)
+    else:
+        return None
 
 
 def get_events(project_id, session_id):
@@ -165,36 +254,50 @@ def get_events(project_id, session_id):
         cur.execute(query=query)
 
         s_data = cur.fetchone()
-        if s_data is not None:
-            s_data = helper.dict_to_camel_case(s_data)
-            data = {}
-            if s_data["platform"] == 'ios':
-                data['events'] = events_ios.get_by_sessionId(project_id=project_id, session_id=session_id)
-                for e in data['events']:
-                    if e["type"].endswith("_IOS"):
-                        e["type"] = e["type"][:-len("_IOS")]
-                data['crashes'] = events_ios.get_crashes_by_session_id(session_id=session_id)
-                data['userEvents'] = events_ios.get_customs_by_session_id(project_id=project_id,
-                                                                          session_id=session_id)
-            else:
-                data['events'] = events.get_by_session_id(project_id=project_id, session_id=session_id,
-                                                          group_clickrage=True)
-                all_errors = events.get_errors_by_session_id(session_id=session_id, project_id=project_id)
-                data['stackEvents'] = [e for e in all_errors if e['source'] != "js_exception"]
-                # to keep only the first stack
-                # limit the number of errors to reduce the response-body size
-                data['errors'] = [errors_helper.format_first_stack_frame(e) for e in all_errors
-                                  if e['source'] == "js_exception"][:500]
-                data['userEvents'] = events.get_customs_by_session_id(project_id=project_id,
-                                                                      session_id=session_id)
-                data['resources'] = resources.get_by_session_id(session_id=session_id, project_id=project_id,
-                                                                start_ts=s_data["startTs"], duration=s_data["duration"])
-
-            data['issues'] = issues.get_by_session_id(session_id=session_id, project_id=project_id)
-            data['issues'] = reduce_issues(data['issues'])
-            return data
+    if s_data is not None:
+        s_data = helper.dict_to_camel_case(s_data)
+        data = {}
+        parts = {"issues": (issues.get_by_session_id, {"session_id": session_id, "project_id": project_id})}
+        if s_data["platform"] == 'ios':
+            parts["events"] = (events_ios.get_by_sessionId, {"project_id": project_id, "session_id": session_id})
+            parts["crashes"] = (events_ios.get_crashes_by_session_id, {"session_id": session_id})
+            parts["userEvents"] = (events_ios.get_customs_by_session_id,
+                                   {"project_id": project_id, "session_id": session_id})
+        else:
+            parts["events"] = (events.get_by_session_id, {"project_id": project_id, "session_id": session_id,
+                                                          "group_clickrage": True})
+            parts["errors"] = (events.get_errors_by_session_id,
+                               {"session_id": session_id, "project_id": project_id})
+            parts["userEvents"] = (events.get_customs_by_session_id,
+                                   {"project_id": project_id, "session_id": session_id})
+            parts["resources"] = (resources.get_by_session_id,
+                                  {"session_id": session_id, "project_id": project_id,
+                                   "start_ts": s_data["startTs"], "duration": s_data["duration"]})
+        parts = __get_parts(parts)
+
+        if s_data["platform"] == 'ios':
+            data['events'] = parts["events"]
+            for e in data['events']:
+                if e["type"].endswith("_IOS"):
+                    e["type"] = e["type"][:-len("_IOS")]
+            data['crashes'] = parts["crashes"]
+            data['userEvents'] = parts["userEvents"]
         else:
-            return None
+            data['events'] = parts["events"]
+            all_errors = parts["errors"]
+            data['stackEvents'] = [e for e in all_errors if e['source'] != "js_exception"]
+            # to keep only the first stack
+            # limit the number of errors to reduce the response-body size
+            data['errors'] = [errors_helper.format_first_stack_frame(e) for e in all_errors
+                              if e['source'] == "js_exception"][:500]
+            data['userEvents'] = parts["userEvents"]
+            data['resources'] = parts["resources"]
+
+        data['issues'] = parts["issues"]
+        data['issues'] = reduce_issues(data['issues'])
+        return data
+    else:
+        return None
 
 
 # To reduce the number of issues in the replay;
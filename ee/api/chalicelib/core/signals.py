@@ -1,11 +1,24 @@
-import schemas
+import json
 import logging
-from chalicelib.utils import events_queue
+
+from decouple import config
+
+import schemas
+from chalicelib.utils import write_buffer
+
+SIGNAL_COLUMNS = ["project_id", "user_id", "timestamp", "action", "source", "category", "data", "session_id"]
+# the signals are written by batches in the background
+__buffer = write_buffer.get_buffer(name="frontend_signals", table="public.frontend_signals", columns=SIGNAL_COLUMNS,
+                                   flush_size=config("SIGNALS_BATCH_SIZE", cast=int, default=100),
+                                   flush_interval=config("SIGNALS_PERIOD", cast=int, default=5 * 60))
 
 
 def handle_frontend_signals_queued(project_id: int, user_id: int, data: schemas.SignalsSchema):
     try:
-        events_queue.global_queue.put((project_id, user_id, data))
+        session_id = int(data.data["sessionId"]) if "sessionId" in data.data else None
+        if not __buffer.put((project_id, user_id, data.timestamp, data.action, data.source, data.category,
+                             json.dumps(data.data), session_id)):
+            return {'errors': ['too many signals, try again later']}
         return {'data': 'insertion succeded'}
     except Exception as e:
         logging.info(f'Error while inserting: {e}')
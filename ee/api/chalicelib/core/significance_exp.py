@@ -19,9 +19,8 @@ todo: remove LIMIT from the query
 
 from typing import List
 import math
-import warnings
-from collections import defaultdict
 
+import numpy as np
 from psycopg2.extras import RealDictRow
 from chalicelib.utils import pg_client, helper
 
@@ -256,203 +255,109 @@ def get_stages_and_events(filter_d: schemas.CardSeriesFilterSchema, project_id)
     return rows
 
 
-def pearson_corr(x: list, y: list):
-    n = len(x)
-    if n != len(y):
-        raise ValueError(f'x and y must have the same length. Got {len(x)} and {len(y)} instead')
+def get_funnel_columns(rows: List[RealDictRow], n_stages) -> dict:
+    """
+    Converts the rows of get_stages_and_events to one array per column, to compute all issues at once
 
-    if n < 2:
-        warnings.warn(f'x and y must have length at least 2. Got {n} instead')
-        return None, None, False
+    stages      ::: (n_stages, n_rows) timestamps of the stages, NaN if the stage was not reached
+    session     ::: index of the session of the row
+    user        ::: index of the user_uuid of the row (a missing user_uuid has its own index: user_none)
+    issue       ::: index of the issue of the row in `issues`, -1 if the row has no issue
+    issues      ::: the issues by index, [{"issue_id", "issue_type", "context"}]
+    """
+    n_rows = len(rows)
+    stage_keys = [f"stage{i + 1}_timestamp" for i in range(n_stages)]
+    stages = np.full((n_stages, n_rows), np.nan)
+    session = np.empty(n_rows, dtype=np.int64)
+    user = np.empty(n_rows, dtype=np.int64)
+    issue = np.full(n_rows, -1, dtype=np.int64)
+    issue_ts = np.full(n_rows, np.nan)
+    sessions_index = {}
+    users_index = {None: 0}
+    issues_index = {}
+    issues = []
+    for i, row in enumerate(rows):
+        for s, k in enumerate(stage_keys):
+            if row[k] is not None:
+                stages[s, i] = row[k]
+        session[i] = sessions_index.setdefault(row["session_id"], len(sessions_index))
+        user[i] = users_index.setdefault(row["user_uuid"], len(users_index))
+        if row["issue_type"] is not None:
+            if row["issue_id"] not in issues_index:
+                issues_index[row["issue_id"]] = len(issues)
+                issues.append({"issue_id": row["issue_id"], "issue_type": row["issue_type"],
+                               "context": row["issue_context"]})
+            issue[i] = issues_index[row["issue_id"]]
+            issue_ts[i] = row["issue_timestamp"]
+
+    return {"stages": stages, "session": session, "user": user, "user_none": 0,
+            "issue": issue, "issue_ts": issue_ts, "issues": issues,
+            "n_sessions": len(sessions_index), "n_users": len(users_index)}
+
+
+def pearson_corr(x: np.ndarray, y: np.ndarray, n_columns: int):
+    """
+    Pearson correlation of the 0/1 array x with each column of a 0/1 matrix,
+    the matrix has one 1 per row at most so it is given by the column of each row: y (-1 for a row of 0s)
+    Only positive correlations are kept (except for n=2), the correlation of a constant column is not defined (NaN)
 
+    Returns three arrays of n_columns: correlation, confidence, is_significant
+    """
+    n = len(x)
+    r = np.full(n_columns, np.nan)
+    confidence = np.full(n_columns, np.nan)
+    is_sign = np.zeros(n_columns, dtype=bool)
+    k = x.sum()
     # If an input is constant, the correlation coefficient is not defined.
-    if all(t == x[0] for t in x) or all(t == y[0] for t in y):
-        warnings.warn("An input array is constant; the correlation coefficent is not defined.")
-        return None, None, False
+    if n < 2 or k == 0 or k == n:
+        return r, confidence, is_sign
 
-    if n == 2:
-        return math.copysign(1, x[1] - x[0]) * math.copysign(1, y[1] - y[0]), 1.0, True
-
-    xmean = sum(x) / len(x)
-    ymean = sum(y) / len(y)
-
-    xm = [el - xmean for el in x]
-    ym = [el - ymean for el in y]
-
-    normxm = math.sqrt((sum([xm[i] * xm[i] for i in range(len(xm))])))
-    normym = math.sqrt((sum([ym[i] * ym[i] for i in range(len(ym))])))
-
-    threshold = 1e-8
-    if normxm < threshold * abs(xmean) or normym < threshold * abs(ymean):
-        # If all the values in x (likewise y) are very close to the mean,
-        # the loss of precision that occurs in the subtraction xm = x - xmean
-        # might result in large errors in r.
-        warnings.warn("An input array is constant; the correlation coefficent is not defined.")
-
-    r = sum(
-        i[0] * i[1] for i in zip([xm[i] / normxm for i in range(len(xm))], [ym[i] / normym for i in range(len(ym))]))
+    in_y = y >= 0
+    counts_y = np.bincount(y[in_y], minlength=n_columns).astype(np.float64)
+    counts_xy = np.bincount(y[in_y], weights=x[in_y], minlength=n_columns)
+    defined = (counts_y > 0) & (counts_y < n)
 
+    if n == 2:
+        # x and y are (0,1) or (1,0), they are either equal or opposite
+        r[defined] = 2 * counts_xy[defined] - 1
+        confidence[defined] = 1.0
+        is_sign[defined] = True
+        return r, confidence, is_sign
+
+    norm_x = np.sqrt(k - k * k / n)
+    norm_y = np.sqrt(counts_y[defined] - counts_y[defined] ** 2 / n)
     # Presumably, if abs(r) > 1, then it is only some small artifact of  floating point arithmetic.
     # However, if r < 0, we don't care, as our problem is to find only positive correlations
-    r = max(min(r, 1.0), 0.0)
+    r[defined] = np.clip((counts_xy[defined] - counts_y[defined] * k / n) / (norm_x * norm_y), 0.0, 1.0)
 
     # approximated confidence
-    if n < 31:
-        t_c = T_VALUES[n]
-    elif n < 50:
-        t_c = 2.02
-    else:
-        t_c = 2
-    if r >= 0.999:
-        confidence = 1
-    else:
-        confidence = r * math.sqrt(n - 2) / math.sqrt(1 - r ** 2)
-
-    if confidence > SIGNIFICANCE_THRSH:
-        return r, confidence, True
-    else:
-        return r, confidence, False
+    with np.errstate(divide="ignore"):
+        confidence[defined] = np.where(r[defined] >= 0.999, 1,
+                                       r[defined] * math.sqrt(n - 2) / np.sqrt(1 - r[defined] ** 2))
+    is_sign[defined] = confidence[defined] > SIGNIFICANCE_THRSH
+    return r, confidence, is_sign
 
 
-# def tuple_or(t: tuple):
-#     x = 0
-#     for el in t:
-#         x |= el # | is for bitwise OR
-#     return x
-#
-# The following function is correct optimization of the previous function because t is a list of 0,1
-def tuple_or(t: tuple):
-    for el in t:
-        if el > 0:
-            return 1
-    return 0
+def __count_distinct(values: np.ndarray, groups: np.ndarray, n_values: int, n_groups: int) -> np.ndarray:
+    # number of distinct values per group
+    pairs = np.unique(groups * n_values + values)
+    return np.bincount(pairs // n_values, minlength=n_groups)
 
 
-def get_transitions_and_issues_of_each_type(rows: List[RealDictRow], all_issues, first_stage, last_stage):
-    """
-    Returns two lists with binary values 0/1:
-
-    transitions ::: if transited from the first stage to the last - 1
-                    else - 0
-    errors      ::: a dictionary WHERE the keys are all unique issues (currently context-wise)
-                    the values are lists
-                    if an issue happened between the first stage to the last - 1
-                    else - 0
-
-    For a small task of calculating a total drop due to issues,
-    we need to disregard the issue type when creating the `errors`-like array.
-    The `all_errors` array can be obtained by logical OR statement applied to all errors by issue
-    The `transitions` array stays the same
-    """
-    transitions = []
-    n_sess_affected = 0
-    errors = {}
-
-    for row in rows:
-        t = 0
-        first_ts = row[f'stage{first_stage}_timestamp']
-        last_ts = row[f'stage{last_stage}_timestamp']
-        if first_ts is None:
-            continue
-        elif last_ts is not None:
-            t = 1
-        transitions.append(t)
+def count_sessions(columns, n_stages):
+    reached = ~np.isnan(columns["stages"])
+    return {i + 1: len(np.unique(columns["session"][reached[i]])) for i in range(n_stages)}
 
-        ic_present = False
-        for error_id in all_issues:
-            if error_id not in errors:
-                errors[error_id] = []
-            ic = 0
-            row_issue_id = row['issue_id']
-            if row_issue_id is not None:
-                if last_ts is None or (first_ts < row['issue_timestamp'] < last_ts):
-                    if error_id == row_issue_id:
-                        ic = 1
-                        ic_present = True
-            errors[error_id].append(ic)
 
-        if ic_present and t:
-            n_sess_affected += 1
+def count_users(columns, n_stages):
+    reached = ~np.isnan(columns["stages"])
+    return {i + 1: len(np.unique(columns["user"][reached[i]])) for i in range(n_stages)}
 
-    all_errors = [tuple_or(t) for t in zip(*errors.values())]
 
-    return transitions, errors, all_errors, n_sess_affected
-
-
-def get_affected_users_for_all_issues(rows, first_stage, last_stage):
-    """
-
-    :param rows:
-    :param first_stage:
-    :param last_stage:
-    :return:
-    """
-    affected_users = defaultdict(lambda: set())
-    affected_sessions = defaultdict(lambda: set())
-    all_issues = {}
-    n_affected_users_dict = defaultdict(lambda: None)
-    n_affected_sessions_dict = defaultdict(lambda: None)
-    n_issues_dict = defaultdict(lambda: 0)
-    issues_by_session = defaultdict(lambda: 0)
-
-    for row in rows:
-
-        # check that the session has reached the first stage of subfunnel:
-        if row[f'stage{first_stage}_timestamp'] is None:
-            continue
-
-        iss = row['issue_type']
-        iss_ts = row['issue_timestamp']
-
-        # check that the issue exists and belongs to subfunnel:
-        if iss is not None and (row[f'stage{last_stage}_timestamp'] is None or
-                                (row[f'stage{first_stage}_timestamp'] < iss_ts < row[f'stage{last_stage}_timestamp'])):
-            if row["issue_id"] not in all_issues:
-                all_issues[row["issue_id"]] = {"context": row['issue_context'], "issue_type": row["issue_type"]}
-            n_issues_dict[row["issue_id"]] += 1
-            if row['user_uuid'] is not None:
-                affected_users[row["issue_id"]].add(row['user_uuid'])
-
-            affected_sessions[row["issue_id"]].add(row['session_id'])
-            issues_by_session[row[f'session_id']] += 1
-
-    if len(affected_users) > 0:
-        n_affected_users_dict.update({
-            iss: len(affected_users[iss]) for iss in affected_users
-        })
-    if len(affected_sessions) > 0:
-        n_affected_sessions_dict.update({
-            iss: len(affected_sessions[iss]) for iss in affected_sessions
-        })
-    return all_issues, n_issues_dict, n_affected_users_dict, n_affected_sessions_dict
-
-
-def count_sessions(rows, n_stages):
-    session_counts = {i: set() for i in range(1, n_stages + 1)}
-    for row in rows:
-        for i in range(1, n_stages + 1):
-            if row[f"stage{i}_timestamp"] is not None:
-                session_counts[i].add(row[f"session_id"])
-
-    session_counts = {i: len(session_counts[i]) for i in session_counts}
-    return session_counts
-
-
-def count_users(rows, n_stages):
-    users_in_stages = {i: set() for i in range(1, n_stages + 1)}
-    for row in rows:
-        for i in range(1, n_stages + 1):
-            if row[f"stage{i}_timestamp"] is not None:
-                users_in_stages[i].add(row["user_uuid"])
-
-    users_count = {i: len(users_in_stages[i]) for i in range(1, n_stages + 1)}
-    return users_count
-
-
-def get_stages(stages, rows):
+def get_stages(stages, columns):
     n_stages = len(stages)
-    session_counts = count_sessions(rows, n_stages)
-    users_counts = count_users(rows, n_stages)
+    session_counts = count_sessions(columns, n_stages)
+    users_counts = count_users(columns, n_stages)
 
     stages_list = []
     for i, stage in enumerate(stages):
@@ -477,11 +382,11 @@ def get_stages(stages, rows):
     return stages_list
 
 
-def get_issues(stages, rows, first_stage=None, last_stage=None, drop_only=False):
+def get_issues(stages, columns, first_stage=None, last_stage=None, drop_only=False):
     """
 
     :param stages:
-    :param rows:
+    :param columns: the output of get_funnel_columns
     :param first_stage: If it's a part of the initial funnel, provide a number of the first stage (starting from 1)
     :param last_stage: If it's a part of the initial funnel, provide a number of the last stage (starting from 1)
     :return:
@@ -501,21 +406,33 @@ def get_issues(stages, rows, first_stage=None, last_stage=None, drop_only=False)
     n_critical_issues = 0
     issues_dict = {"significant": [],
                    "insignificant": []}
-    session_counts = count_sessions(rows, n_stages)
+    session_counts = count_sessions(columns, n_stages)
     drop = session_counts[first_stage] - session_counts[last_stage]
-
-    all_issues, n_issues_dict, affected_users_dict, affected_sessions = get_affected_users_for_all_issues(
-        rows, first_stage, last_stage)
-    transitions, errors, all_errors, n_sess_affected = get_transitions_and_issues_of_each_type(rows,
-                                                                                               all_issues,
-                                                                                               first_stage, last_stage)
-
-    del rows
-
-    if any(all_errors):
-        total_drop_corr, conf, is_sign = pearson_corr(transitions, all_errors)
-        if total_drop_corr is not None and drop is not None:
-            total_drop_due_to_issues = int(total_drop_corr * n_sess_affected)
+    all_issues = columns["issues"]
+    n_issues = len(all_issues)
+
+    # only the rows of the sessions that reached the first stage of the subfunnel
+    first_ts = columns["stages"][first_stage - 1]
+    in_subfunnel = ~np.isnan(first_ts)
+    first_ts = first_ts[in_subfunnel]
+    last_ts = columns["stages"][last_stage - 1][in_subfunnel]
+    issue = columns["issue"][in_subfunnel]
+    issue_ts = columns["issue_ts"][in_subfunnel]
+    # transitions ::: 1 if transited from the first stage to the last, else 0
+    transitions = ~np.isnan(last_ts)
+    # the issue of the row belongs to the subfunnel if it happened between the first and the last stage
+    with np.errstate(invalid="ignore"):
+        has_issue = (issue >= 0) & (~transitions | (first_ts < issue_ts) & (issue_ts < last_ts))
+    # issue ::: the column of the row in the issue-incidence matrix (-1 if none)
+    issue = np.where(has_issue, issue, -1)
+    n_sess_affected = int(np.count_nonzero(has_issue & transitions))
+
+    # For a small task of calculating a total drop due to issues,
+    # we need to disregard the issue type: all the issues are in the same column
+    if has_issue.any():
+        total_drop_corr, _, _ = pearson_corr(transitions, np.where(has_issue, 0, -1), 1)
+        if not np.isnan(total_drop_corr[0]) and drop is not None:
+            total_drop_due_to_issues = int(total_drop_corr[0] * n_sess_affected)
         else:
             total_drop_due_to_issues = 0
     else:
@@ -523,32 +440,40 @@ def get_issues(stages, rows, first_stage=None, last_stage=None, drop_only=False)
 
     if drop_only:
         return total_drop_due_to_issues
-    for issue_id in all_issues:
 
-        if not any(errors[issue_id]):
-            continue
-        r, confidence, is_sign = pearson_corr(transitions, errors[issue_id])
-
-        if r is not None and drop is not None and is_sign:
-            lost_conversions = int(r * affected_sessions[issue_id])
+    issue_rows = issue[has_issue]
+    n_issues_per_id = np.bincount(issue_rows, minlength=n_issues)
+    affected_sessions = __count_distinct(values=columns["session"][in_subfunnel][has_issue], groups=issue_rows,
+                                         n_values=max(columns["n_sessions"], 1), n_groups=n_issues)
+    issue_users = columns["user"][in_subfunnel][has_issue]
+    with_user = issue_users != columns["user_none"]
+    affected_users = __count_distinct(values=issue_users[with_user], groups=issue_rows[with_user],
+                                      n_values=max(columns["n_users"], 1), n_groups=n_issues)
+    r, _, is_sign = pearson_corr(transitions, issue, n_issues)
+
+    # the issues in the order of their first occurrence in the subfunnel
+    found, first_index = np.unique(issue_rows, return_index=True)
+    for i in found[np.argsort(first_index, kind="stable")]:
+        issue_r = 0 if np.isnan(r[i]) else float(r[i])
+        issue_sessions = int(affected_sessions[i])
+        if not np.isnan(r[i]) and drop is not None and is_sign[i]:
+            lost_conversions = int(issue_r * issue_sessions)
         else:
             lost_conversions = None
-        if r is None:
-            r = 0
-        issues_dict['significant' if is_sign else 'insignificant'].append({
-            "type": all_issues[issue_id]["issue_type"],
-            "title": helper.get_issue_title(all_issues[issue_id]["issue_type"]),
-            "affected_sessions": affected_sessions[issue_id],
-            "unaffected_sessions": session_counts[1] - affected_sessions[issue_id],
+        issues_dict['significant' if is_sign[i] else 'insignificant'].append({
+            "type": all_issues[i]["issue_type"],
+            "title": helper.get_issue_title(all_issues[i]["issue_type"]),
+            "affected_sessions": issue_sessions,
+            "unaffected_sessions": session_counts[1] - issue_sessions,
             "lost_conversions": lost_conversions,
-            "affected_users": affected_users_dict[issue_id],
-            "conversion_impact": round(r * 100),
-            "context_string": all_issues[issue_id]["context"],
-            "issue_id": issue_id
+            "affected_users": int(affected_users[i]) if affected_users[i] > 0 else None,
+            "conversion_impact": round(issue_r * 100),
+            "context_string": all_issues[i]["context"],
+            "issue_id": all_issues[i]["issue_id"]
         })
 
-        if is_sign:
-            n_critical_issues += n_issues_dict[issue_id]
+        if is_sign[i]:
+            n_critical_issues += int(n_issues_per_id[i])
     # To limit the number of returned issues to the frontend
     issues_dict["significant"] = issues_dict["significant"][:20]
     issues_dict["insignificant"] = issues_dict["insignificant"][:20]
@@ -590,12 +515,14 @@ def get_top_insights(filter_d: schemas.CardSeriesFilterSchema, project_id):
         return output, 0
     # The result of the multi-stage query
     rows = get_stages_and_events(filter_d=filter_d, project_id=project_id)
-    if len(rows) == 0:
-        return get_stages(stages, []), 0
+    columns = get_funnel_columns(rows, len(stages))
+    del rows
+    if len(columns["session"]) == 0:
+        return get_stages(stages, columns), 0
     # Obtain the first part of the output
-    stages_list = get_stages(stages, rows)
+    stages_list = get_stages(stages, columns)
     # Obtain the second part of the output
-    total_drop_due_to_issues = get_issues(stages, rows,
+    total_drop_due_to_issues = get_issues(stages, columns,
                                           first_stage=1,
                                           last_stage=len(filter_d.events),
                                           drop_only=True)
@@ -609,8 +536,10 @@ def get_issues_list(filter_d: schemas.CardSeriesFilterSchema, project_id, first_
     rows = get_stages_and_events(filter_d=filter_d, project_id=project_id)
     if len(rows) == 0:
         return output
-        # Obtain the second part of the output
-    n_critical_issues, issues_dict, total_drop_due_to_issues = get_issues(stages, rows, first_stage=first_stage,
+    columns = get_funnel_columns(rows, len(stages))
+    del rows
+    # Obtain the second part of the output
+    n_critical_issues, issues_dict, total_drop_due_to_issues = get_issues(stages, columns, first_stage=first_stage,
                                                                           last_stage=last_stage)
     output['total_drop_due_to_issues'] = total_drop_due_to_issues
     # output['critical_issues_count'] = n_critical_issues
@@ -1,16 +1,14 @@
 import json
-import queue
 import re
-from typing import Optional, List
+from typing import Optional
 
 from decouple import config
 from fastapi import Request, Response, BackgroundTasks
 from pydantic import BaseModel, Field
 from starlette.background import BackgroundTask
 
-import app as main_app
 import schemas
-from chalicelib.utils import pg_client, helper
+from chalicelib.utils import pg_client, helper, write_buffer
 from chalicelib.utils.TimeUTC import TimeUTC
 from schemas import CurrentContext
 
@@ -46,6 +44,12 @@ IGNORE_ROUTES = [
 ]
 IGNORE_IN_PAYLOAD = ["token", "password", "authorizationToken", "authHeader", "xQueryKey", "awsSecretAccessKey",
                      "serviceAccountCredentials", "accessKey", "applicationKey", "apiKey"]
+TRACE_COLUMNS = ["user_id", "tenant_id", "created_at", "auth", "action", "method", "path_format", "endpoint",
+                 "payload", "parameters", "status"]
+# the traces are written by batches in the background
+__buffer = write_buffer.get_buffer(name="traces", table="traces", columns=TRACE_COLUMNS,
+                                   flush_size=config("TRACE_BATCH_SIZE", cast=int, default=500),
+                                   flush_interval=config("TRACE_PERIOD", cast=int, default=60))
 
 
 class TraceSchema(BaseModel):
@@ -81,27 +85,6 @@ async def write_trace(trace: TraceSchema):
         )
 
 
-async def write_traces_batch(traces: List[TraceSchema]):
-    if len(traces) == 0:
-        return
-    params = {}
-    values = []
-    for i, t in enumerate(traces):
-        data = __process_trace(t)
-        for key in data.keys():
-            params[f"{key}_{i}"] = data[key]
-        values.append(
-            f"(%(user_id_{i})s, %(tenant_id_{i})s, %(created_at_{i})s, %(auth_{i})s, %(action_{i})s, %(method_{i})s, %(path_format_{i})s, %(endpoint_{i})s, %(payload_{i})s::jsonb, %(parameters_{i})s::jsonb, %(status_{i})s)")
-
-    with pg_client.PostgresClient() as cur:
-        cur.execute(
-            cur.mogrify(
-                f"""INSERT INTO traces(user_id, tenant_id, created_at, auth, action, method, path_format, endpoint, payload, parameters, status)
-                    VALUES {" , ".join(values)};""",
-                params)
-        )
-
-
 async def process_trace(action: str, path_format: str, request: Request, response: Response):
     if not hasattr(request.state, "currentContext"):
         return
@@ -127,10 +110,8 @@ async def process_trace(action: str, path_format: str, request: Request, respons
                                 status=response.status_code,
                                 path_format=path_format,
                                 created_at=TimeUTC.now())
-    if not hasattr(main_app.app, "queue_system"):
-        main_app.app.queue_system = queue.Queue()
-    q: queue.Queue = main_app.app.queue_system
-    q.put(current_trace)
+    data = __process_trace(current_trace)
+    __buffer.put(tuple([data[c] for c in TRACE_COLUMNS]))
 
 
 def trace(action: str, path_format: str, request: Request, response: Response):
@@ -147,16 +128,6 @@ def trace(action: str, path_format: str, request: Request, response: Response):
     response.background.add_task(background_task)
 
 
-async def process_traces_queue():
-    queue_system: queue.Queue = main_app.app.queue_system
-    traces = []
-    while not queue_system.empty():
-        obj = queue_system.get_nowait()
-        traces.append(obj)
-    if len(traces) > 0:
-        await write_traces_batch(traces)
-
-
 def get_all(tenant_id, data: schemas.TrailSearchPayloadSchema):
     with pg_client.PostgresClient() as cur:
         conditions = ["traces.tenant_id=%(tenant_id)s",
@@ -203,8 +174,3 @@ def get_available_actions(tenant_id):
         rows = cur.fetchall()
     return [r["action"] for r in rows]
 
-
-cron_jobs = [
-    {"func": process_traces_queue, "trigger": "interval", "seconds": config("TRACE_PERIOD", cast=int, default=60),
-     "misfire_grace_time": 20}
-]
@@ -10,10 +10,28 @@ from chalicelib.core import authorizers, metadata, projects
 from chalicelib.core import tenants, assist
 from chalicelib.utils import email_helper, smtp
 from chalicelib.utils import helper
-from chalicelib.utils import pg_client
+from chalicelib.utils import pg_client, ttl_cache
 from chalicelib.utils.TimeUTC import TimeUTC
 from chalicelib.core import roles
 
+# Short-lived copies of the rows read by the authorizers on every request, dropped by the write paths below.
+# The drops only reach the current worker: a logout or a deleted user is seen by the others when their copy expires,
+# hence the shorter lifetime of the token checks
+AUTH_CACHE = ttl_cache.get_cache("users_auth", ttl=config("AUTH_REVOCATION_CACHE_TTL", cast=int, default=2))
+USERS_CACHE = ttl_cache.get_cache("users")
+
+
+def invalidate_cache(user_id):
+    AUTH_CACHE.invalidate(lambda k, v: k[0] == user_id)
+    USERS_CACHE.invalidate(lambda k, v: k[0] == user_id)
+    projects.invalidate_authorizations(user_id=user_id)
+
+
+def invalidate_tenant_cache(tenant_id):
+    # The permissions and the projects of a role changed
+    USERS_CACHE.invalidate(lambda k, v: k[1] == tenant_id)
+    projects.invalidate_authorizations(tenant_id=tenant_id)
+
 
 def __generate_invitation_token():
     return secrets.token_urlsafe(64)
@@ -178,6 +196,7 @@ def update(tenant_id, user_id, changes, output=True):
                             WHERE basic_authentication.user_id = %(user_id)s;""",
                             {"tenant_id": tenant_id, "user_id": user_id, **changes})
             )
+    invalidate_cache(user_id)
     if not output:
         return None
     return get(user_id=user_id, tenant_id=tenant_id)
@@ -272,6 +291,14 @@ def get(user_id, tenant_id):
         return helper.dict_to_camel_case(r)
 
 
+def get_cached(user_id, tenant_id):
+    found, r = USERS_CACHE.get((user_id, tenant_id))
+    if not found:
+        r = get(user_id=user_id, tenant_id=tenant_id)
+        USERS_CACHE.set((user_id, tenant_id), r)
+    return r
+
+
 def generate_new_api_key(user_id):
     with pg_client.PostgresClient() as cur:
         cur.execute(
@@ -497,6 +524,7 @@ def delete_member(user_id, tenant_id, id_to_delete):
                                 change_pwd_expire_at= NULL, change_pwd_token= NULL
                            WHERE user_id=%(user_id)s;""",
                         {"user_id": id_to_delete, "tenant_id": tenant_id}))
+    invalidate_cache(id_to_delete)
     return {"data": get_members(tenant_id=tenant_id)}
 
 
@@ -603,7 +631,18 @@ def get_by_invitation_token(token, pass_token=None):
     return helper.dict_to_camel_case(r)
 
 
+def __auth_valid(r, jwt_iat):
+    return r is not None \
+        and (r["service_account"] and not r["has_basic_auth"]
+             or r.get("jwt_iat") is not None \
+             and (abs(jwt_iat - r["jwt_iat"]) <= 1))
+
+
 def auth_exists(user_id, tenant_id, jwt_iat):
+    # Only a cached match is trusted, a token newer than the cached row (login on another worker) is checked in PG
+    found, r = AUTH_CACHE.get((user_id, tenant_id))
+    if found and __auth_valid(r, jwt_iat):
+        return True
     with pg_client.PostgresClient() as cur:
         cur.execute(
             cur.mogrify(
@@ -621,10 +660,8 @@ def auth_exists(user_id, tenant_id, jwt_iat):
                 {"userId": user_id, "tenant_id": tenant_id})
         )
         r = cur.fetchone()
-    return r is not None \
-        and (r["service_account"] and not r["has_basic_auth"]
-             or r.get("jwt_iat") is not None \
-             and (abs(jwt_iat - r["jwt_iat"]) <= 1))
+    AUTH_CACHE.set((user_id, tenant_id), r)
+    return __auth_valid(r, jwt_iat)
 
 
 def refresh_auth_exists(user_id, tenant_id, jwt_jti=None):
@@ -656,7 +693,8 @@ def change_jwt_iat_jti(user_id):
                             {"user_id": user_id})
         cur.execute(query)
         row = cur.fetchone()
-        return row.get("jwt_iat"), row.get("jwt_refresh_jti"), row.get("jwt_refresh_iat")
+    invalidate_cache(user_id)
+    return row.get("jwt_iat"), row.get("jwt_refresh_jti"), row.get("jwt_refresh_iat")
 
 
 def refresh_jwt_iat_jti(user_id):
@@ -671,7 +709,8 @@ def refresh_jwt_iat_jti(user_id):
                             {"user_id": user_id})
         cur.execute(query)
         row = cur.fetchone()
-        return row.get("jwt_iat"), row.get("jwt_refresh_jti"), row.get("jwt_refresh_iat")
+    invalidate_cache(user_id)
+    return row.get("jwt_iat"), row.get("jwt_refresh_jti"), row.get("jwt_refresh_iat")
 
 
 def authenticate(email, password, for_change_password=False) -> dict | bool | None:
@@ -804,6 +843,7 @@ def __hard_delete_user(user_id):
                 WHERE users.user_id = %(user_id)s AND users.deleted_at IS NOT NULL ;""",
             {"user_id": user_id})
         cur.execute(query)
+    invalidate_cache(user_id)
 
 
 def logout(user_id: int):
@@ -814,6 +854,7 @@ def logout(user_id: int):
                WHERE user_id = %(user_id)s;""",
             {"user_id": user_id})
         cur.execute(query)
+    invalidate_cache(user_id)
 
 
 def refresh(user_id: int, tenant_id: int) -> dict:
@@ -916,7 +957,9 @@ def restore_sso_user(user_id, tenant_id, email, admin, name, origin, role_id, in
         cur.execute(
             query
         )
-        return helper.dict_to_camel_case(cur.fetchone())
+        row = cur.fetchone()
+    invalidate_cache(user_id)
+    return helper.dict_to_camel_case(row)
 
 
 def get_user_settings(user_id):
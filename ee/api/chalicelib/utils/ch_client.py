@@ -1,6 +1,9 @@
 import logging
+import queue
+import threading
 
 import clickhouse_driver
+import numpy as np
 from decouple import config
 
 logging.basicConfig(level=config("LOGLEVEL", default=logging.INFO))
@@ -15,29 +18,100 @@ if config('ch_receive_timeout', cast=int, default=-1) > 0:
     settings = {**settings, "receive_timeout": config('ch_receive_timeout', cast=int)}
 
 
+def _make_client(database):
+    extra_args = {}
+    if config("CH_COMPRESSION", cast=bool, default=True):
+        extra_args["compression"] = "lz4"
+    return clickhouse_driver.Client(host=config("ch_host"),
+                                    database=database,
+                                    user=config("ch_user", default="default"),
+                                    password=config("ch_password", default=""),
+                                    port=config("ch_port", cast=int),
+                                    settings=settings,
+                                    **extra_args)
+
+
+class ClickHouseClientPool:
+    """Bounded pool of clickhouse_driver clients for one database, the clients keep their connection open between
+    requests. A client is used by one thread at a time."""
+
+    def __init__(self, database, max_size):
+        self.database = database
+        self.max_size = max_size
+        self.size = 0
+        self.clients = queue.LifoQueue()
+        self.lock = threading.Lock()
+
+    def get(self):
+        try:
+            return self.clients.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.size < self.max_size:
+                self.size += 1
+                return _make_client(self.database)
+        try:
+            return self.clients.get(timeout=config("CH_POOL_TIMEOUT", cast=int, default=30))
+        except queue.Empty:
+            raise TimeoutError(f"no ClickHouse client available for {self.database} after waiting")
+
+    def put(self, client):
+        self.clients.put_nowait(client)
+
+    def close(self):
+        while True:
+            try:
+                self.clients.get_nowait().disconnect()
+            except queue.Empty:
+                break
+        with self.lock:
+            self.size = 0
+
+
+pools: dict[str, ClickHouseClientPool] = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(database) -> ClickHouseClientPool:
+    if database not in pools:
+        with pools_lock:
+            if database not in pools:
+                pools[database] = ClickHouseClientPool(database=database,
+                                                       max_size=config("CH_POOL_SIZE", cast=int, default=20))
+    return pools[database]
+
+
+def _to_array(column, column_type):
+    if column_type.startswith(("Int", "UInt", "Float")):
+        return np.array(column)
+    return np.array(column, dtype=object)
+
+
 class ClickHouseClient:
     __client = None
+    __iterating = False
 
     def __init__(self, database=None):
-        extra_args = {}
-        if config("CH_COMPRESSION", cast=bool, default=True):
-            extra_args["compression"] = "lz4"
-        self.__client = clickhouse_driver.Client(host=config("ch_host"),
-                                                 database=database if database else config("ch_database",
-                                                                                           default="default"),
-                                                 user=config("ch_user", default="default"),
-                                                 password=config("ch_password", default=""),
-                                                 port=config("ch_port", cast=int),
-                                                 settings=settings,
-                                                 **extra_args) \
-            if self.__client is None else self.__client
+        """Borrows a client from the pool of the database, it is returned when the with block exits"""
+        self.__pool = get_pool(database if database else config("ch_database", default="default"))
+        self.__client = self.__pool.get()
 
     def __enter__(self):
         return self
 
-    def execute(self, query, params=None, **args):
+    def execute(self, query, params=None, columnar=False, **args):
+        """Returns the rows as a list of dicts, or if columnar=True a dict of column name -> numpy array"""
+        if self.__iterating:
+            # a previous execute_iter was not consumed until the end
+            self.__client.disconnect()
+            self.__iterating = False
         try:
-            results = self.__client.execute(query=query, params=params, with_column_types=True, **args)
+            results = self.__client.execute(query=query, params=params, with_column_types=True, columnar=columnar,
+                                            **args)
+            if columnar:
+                columns = results[0] if len(results[0]) > 0 else [()] * len(results[1])
+                return {name: _to_array(column, column_type) for (name, column_type), column in zip(results[1], columns)}
             keys = tuple(x for x, y in results[1])
             return [dict(zip(keys, i)) for i in results[0]]
         except Exception as err:
@@ -46,6 +120,21 @@ class ClickHouseClient:
             logging.error("--------------------")
             raise err
 
+    def execute_iter(self, query, params=None, **args):
+        """Yields the rows as dicts while they are received, to be consumed inside the with block"""
+        try:
+            self.__iterating = True
+            rows = self.__client.execute_iter(query=query, params=params, with_column_types=True, **args)
+            keys = tuple(x for x, y in next(rows))
+            for row in rows:
+                yield dict(zip(keys, row))
+            self.__iterating = False
+        except Exception as err:
+            logging.error("--------- CH QUERY EXCEPTION -----------")
+            logging.error(self.format(query=query, params=params))
+            logging.error("--------------------")
+            raise err
+
     def insert(self, query, params=None, **args):
         return self.__client.execute(query=query, params=params, **args)
 
@@ -58,4 +147,15 @@ class ClickHouseClient:
         return self.__client.substitute_params(query, params, self.__client.connection.context)
 
     def __exit__(self, *args):
-        pass
+        if self.__iterating:
+            # the rest of the stream is still pending on this connection
+            self.__client.disconnect()
+        self.__pool.put(self.__client)
+
+
+async def terminate():
+    for database in list(pools.keys()):
+        try:
+            pools.pop(database).close()
+        except Exception as error:
+            logging.error(f"Error while closing the ClickHouse clients of {database}", error)
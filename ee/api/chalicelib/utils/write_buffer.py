@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from threading import Lock
+
+import psycopg
+from decouple import config
+
+from chalicelib.utils import pg_client
+
+logger = logging.getLogger(__name__)
+
+# the errors caused by the values of some rows, the other rows of the batch can be written
+INVALID_ROWS = (psycopg.DataError, psycopg.IntegrityError)
+
+
+class WriteBuffer:
+    # Bounded in-memory buffer of rows to insert into a table, flushed with COPY by a background task
+    # every flush_interval seconds or as soon as flush_size rows are waiting.
+    # put() never blocks the caller (request thread or event loop): when the buffer is full the row is dropped
+    # and counted.
+    # A batch rejected by the database (invalid value, missing foreign key) is split to write its valid rows,
+    # the rows failing alone are dropped and counted as rejected.
+    # A batch that couldn't be written for another reason (database or pool unavailable) is kept for the next flush
+    # as long as there is room for it, after max_attempts failures in a row it is dropped and counted.
+    def __init__(self, name, table, columns, capacity, flush_size, flush_interval, max_attempts, stop_timeout):
+        self.name = name
+        self.copy_query = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.stop_timeout = stop_timeout
+        self.attempts = 0
+        self.rows = deque()
+        self.lock = Lock()
+        self.loop = None
+        self.wakeup = None
+        self.task = None
+        self.stopping = False
+        self.inserted = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.flushes = 0
+        self.failures = 0
+        self.last_flush_ms = 0
+        buffers[name] = self
+
+    def put(self, row):
+        # Returns False if the row was dropped because the buffer is full
+        with self.lock:
+            if len(self.rows) >= self.capacity:
+                self.dropped += 1
+                return False
+            self.rows.append(row)
+            size = len(self.rows)
+        if size == self.flush_size and self.loop is not None:
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+        return True
+
+    def __take(self):
+        with self.lock:
+            return [self.rows.popleft() for _ in range(min(self.flush_size, len(self.rows)))]
+
+    def __give_back(self, rows):
+        # the rows of a failed flush go back to the front, the ones that don't fit anymore are lost
+        with self.lock:
+            room = max(0, self.capacity - len(self.rows))
+            self.dropped += max(0, len(rows) - room)
+            self.rows.extendleft(reversed(rows[:room]))
+
+    def __retry_later(self, rows):
+        self.failures += 1
+        self.attempts += 1
+        if self.attempts < self.max_attempts:
+            self.__give_back(rows)
+            return
+        self.attempts = 0
+        self.dropped += len(rows)
+        logger.error(f"!! {len(rows)} rows of the {self.name} buffer are dropped after {self.max_attempts} attempts")
+
+    async def __copy(self, rows):
+        async with pg_client.AsyncPostgresClient() as cur:
+            async with cur.copy(self.copy_query) as copy:
+                for r in rows:
+                    await copy.write_row(r)
+
+    async def __copy_split(self, rows):
+        # Writes the rows by halves until the invalid ones are isolated,
+        # returns the number of rows written and the ones left because of another error
+        written = 0
+        batches = [rows]
+        while len(batches) > 0:
+            batch = batches.pop()
+            try:
+                await self.__copy(batch)
+                written += len(batch)
+            except INVALID_ROWS as e:
+                if len(batch) == 1:
+                    self.rejected += 1
+                    logger.error(f"!! a row of the {self.name} buffer is dropped: {e}")
+                else:
+                    half = len(batch) // 2
+                    batches += [batch[half:], batch[:half]]
+            except asyncio.CancelledError:
+                self.__give_back(batch + [r for b in reversed(batches) for r in b])
+                raise
+            except Exception as e:
+                logger.error(f"!! couldn't flush the {self.name} buffer: {e}")
+                return written, batch + [r for b in reversed(batches) for r in b]
+        return written, []
+
+    async def flush(self):
+        # Writes the rows present when called, by batches of flush_size; stops at the first batch to retry
+        for _ in range(-(-len(self.rows) // self.flush_size)):
+            rows = self.__take()
+            if len(rows) == 0:
+                break
+            now = time.time()
+            try:
+                await self.__copy(rows)
+                written = len(rows)
+            except INVALID_ROWS as e:
+                self.failures += 1
+                logger.error(f"!! {len(rows)} rows of the {self.name} buffer are rejected, writing them by halves")
+                logger.error(e)
+                written, left = await self.__copy_split(rows)
+                if len(left) > 0:
+                    self.inserted += written
+                    self.__retry_later(left)
+                    break
+            except asyncio.CancelledError:
+                # stop() timed out, the rows are counted with the ones left
+                self.__give_back(rows)
+                raise
+            except Exception as e:
+                logger.error(f"!! couldn't flush {len(rows)} rows of the {self.name} buffer")
+                logger.error(e)
+                self.__retry_later(rows)
+                break
+            self.attempts = 0
+            self.last_flush_ms = round((time.time() - now) * 1000)
+            self.flushes += 1
+            self.inserted += written
+
+    async def __run(self):
+        while not self.stopping:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            await self.flush()
+
+    async def __drain(self):
+        if self.task is not None:
+            await self.task
+        while len(self.rows) > 0:
+            await self.flush()
+            if self.attempts > 0:
+                # the first batch is kept to be retried
+                await asyncio.sleep(1)
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+        self.stopping = False
+        self.task = self.loop.create_task(self.__run())
+
+    async def stop(self):
+        # the background task finishes its current flush, then what is left is written before returning;
+        # after stop_timeout seconds (database unavailable) the flush in progress is cancelled
+        # and the rows not written are dropped
+        if self.task is not None:
+            self.stopping = True
+            self.wakeup.set()
+        try:
+            await asyncio.wait_for(self.__drain(), timeout=self.stop_timeout)
+        except asyncio.TimeoutError:
+            with self.lock:
+                lost = len(self.rows)
+                self.dropped += lost
+                self.rows.clear()
+            logger.error(f"!! {lost} rows of the {self.name} buffer are dropped, not written in {self.stop_timeout}s")
+        self.task = None
+        self.loop = None
+
+    def stats(self):
+        return {"size": len(self.rows), "capacity": self.capacity, "inserted": self.inserted,
+                "dropped": self.dropped, "rejected": self.rejected, "flushes": self.flushes,
+                "failures": self.failures, "lastFlushMs": self.last_flush_ms}
+
+
+buffers: dict[str, WriteBuffer] = {}
+
+
+def get_buffer(name, table, columns, flush_size, flush_interval) -> WriteBuffer:
+    if name not in buffers:
+        WriteBuffer(name=name, table=table, columns=columns,
+                    capacity=config("WRITE_BUFFER_CAPACITY", cast=int, default=10000),
+                    flush_size=flush_size, flush_interval=flush_interval,
+                    max_attempts=config("WRITE_BUFFER_MAX_ATTEMPTS", cast=int, default=3),
+                    stop_timeout=config("WRITE_BUFFER_STOP_TIMEOUT", cast=int, default=10))
+    return buffers[name]
+
+
+def stats():
+    return {name: b.stats() for name, b in buffers.items()}
+
+
+async def init():
+    for b in buffers.values():
+        b.start()
+    logging.info(f"> write buffers started: {', '.join(buffers.keys())}")
+
+
+async def terminate():
+    for b in buffers.values():
+        await b.stop()
+    logging.info("> write buffers flushed")
@@ -4,6 +4,7 @@ rm -rf ./chalicelib/core/alerts.py
 #exp rm -rf ./chalicelib/core/alerts_processor.py
 rm -rf ./chalicelib/core/announcements.py
 rm -rf ./chalicelib/core/autocomplete.py
+rm -rf ./chalicelib/core/autocomplete_index.py
 rm -rf ./chalicelib/core/authorizers.py
 rm -rf ./chalicelib/core/click_maps.py
 rm -rf ./chalicelib/core/collaboration_base.py
@@ -38,6 +39,7 @@ rm -rf ./chalicelib/core/log_tool_stackdriver.py
 rm -rf ./chalicelib/core/log_tool_sumologic.py
 rm -rf ./chalicelib/core/metadata.py
 rm -rf ./chalicelib/core/mobile.py
+rm -rf ./chalicelib/core/rollups.py
 rm -rf ./chalicelib/core/sessions.py
 rm -rf ./chalicelib/core/sessions_assignments.py
 #exp rm -rf ./chalicelib/core/sessions_metas.py
@@ -51,11 +53,13 @@ rm -rf ./chalicelib/utils/html/
 rm -rf ./chalicelib/utils/__init__.py
 rm -rf ./chalicelib/utils/args_transformer.py
 rm -rf ./chalicelib/utils/captcha.py
+rm -rf ./chalicelib/utils/chart_cache.py
 rm -rf ./chalicelib/utils/dev.py
 rm -rf ./chalicelib/utils/email_handler.py
 rm -rf ./chalicelib/utils/email_helper.py
 rm -rf ./chalicelib/utils/errors_helper.py
 rm -rf ./chalicelib/utils/event_filter_definition.py
+rm -rf ./chalicelib/utils/file_response.py
 rm -rf ./chalicelib/utils/github_client_v3.py
 rm -rf ./chalicelib/utils/helper.py
 rm -rf ./chalicelib/utils/jira_client.py
@@ -65,8 +69,10 @@ rm -rf ./chalicelib/utils/smtp.py
 rm -rf ./chalicelib/utils/sql_helper.py
 rm -rf ./chalicelib/utils/strings.py
 rm -rf ./chalicelib/utils/TimeUTC.py
+rm -rf ./chalicelib/utils/ttl_cache.py
 rm -rf ./chalicelib/utils/storage/generators.py
 rm -rf ./chalicelib/utils/storage/interface.py
+rm -rf ./chalicelib/utils/storage/resolver.py
 rm -rf ./chalicelib/utils/storage/s3.py
 rm -rf ./routers/app/__init__.py
 rm -rf ./crons/__init__.py
@@ -75,6 +81,9 @@ rm -rf ./routers/__init__.py
 rm -rf ./chalicelib/core/assist.py
 rm -rf ./auth/__init__.py
 rm -rf ./auth/auth_apikey.py
+rm -rf ./benchmarks/autocomplete_index.py
+rm -rf ./benchmarks/path_analysis.py
+rm -rf ./benchmarks/significance.py
 rm -rf ./build.sh
 rm -rf ./build_crons.sh
 rm -rf ./routers/base.py
@@ -94,4 +103,17 @@ rm -rf ./run-dev.sh
 rm -rf ./run-alerts-dev.sh
 rm -rf ./schemas/overrides.py
 rm -rf ./schemas/schemas.py
-rm -rf ./schemas/transformers_validators.py
\ No newline at end of file
+rm -rf ./schemas/transformers_validators.py
+rm -rf ./test/__init__.py
+rm -rf ./test/conftest.py
+rm -rf ./test/test_alerts_processor.py
+rm -rf ./test/test_assist.py
+rm -rf ./test/test_autocomplete_index.py
+rm -rf ./test/test_chart_cache.py
+rm -rf ./test/test_feature_flag.py
+rm -rf ./test/test_file_response.py
+rm -rf ./test/test_rollups.py
+rm -rf ./test/test_sessions_replay.py
+rm -rf ./test/test_significance.py
+rm -rf ./test/test_sourcemaps.py
+rm -rf ./test/test_storage_resolver.py
\ No newline at end of file
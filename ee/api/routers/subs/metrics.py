@@ -3,7 +3,7 @@ from typing import Union
 from fastapi import Body, Depends, Request
 
 import schemas
-from chalicelib.core import dashboards, custom_metrics, funnels
+from chalicelib.core import dashboards, custom_metrics, custom_metrics_predefined, funnels
 from or_dependencies import OR_context, OR_scope
 from routers.base import get_routers
 
@@ -85,6 +85,13 @@ def try_card(projectId: int, data: schemas.CardSchema = Body(...),
     return {"data": custom_metrics.get_chart(project_id=projectId, data=data, user_id=context.user_id)}
 
 
+@app.post('/{projectId}/cards/batch', tags=["cards"])
+def get_predefined_cards_batch(projectId: int, data: schemas.CardsBatchSchema = Body(...),
+                               context: schemas.CurrentContext = Depends(OR_context)):
+    return {"data": custom_metrics_predefined.get_metrics(keys=data.metrics, project_id=projectId,
+                                                          data=data.model_dump(exclude={"metrics"}))}
+
+
 @app.post('/{projectId}/cards/try/sessions', tags=["cards"])
 def try_card_sessions(projectId: int, data: schemas.CardSessionsSchema = Body(...),
                       context: schemas.CurrentContext = Depends(OR_context)):
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+import pytest
+
+from chalicelib.core import sessions_insights
+
+HOUR = 3600
+
+
+def events(seed=0):
+    # (name, datetime in seconds) over 6h: err0-err9 in both halves, new0-new4 in the last one only,
+    # gone0 in the first one only
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(10):
+        # distinct counts and changes, so the expected order has no ties
+        rows += [(f"err{i}", rnd.randrange(0, 3 * HOUR)) for _ in range(5 + i)]
+        rows += [(f"err{i}", rnd.randrange(3 * HOUR, 6 * HOUR)) for _ in range(3 + (i * 7) % 10 * 2)]
+    for i in range(5):
+        rows += [(f"new{i}", rnd.randrange(3 * HOUR, 6 * HOUR)) for _ in range(i + 1)]
+    rows += [("gone0", 10)] * 50
+    return rows
+
+
+def client(rows):
+    # runs the count by period query on rows
+    class Client:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def format(self, query, params):
+            self.params = params
+            return query
+
+        def execute(self, query, columnar=False):
+            start, current = self.params["previousPeriod"], self.params["currentPeriod"]
+            counts = {}
+            for name, t in rows:
+                if start <= t < current + self.params["step_size"]:
+                    counts.setdefault(name, [0, 0])[0 if t >= current else 1] += 1
+            return {"name": np.array(list(counts.keys()), dtype=object),
+                    "value": np.array([c[0] for c in counts.values()], dtype=np.uint64),
+                    "old_value": np.array([c[1] for c in counts.values()], dtype=np.uint64)}
+
+    return Client
+
+
+class TestSessionsInsights:
+    def test_get_periods(self):
+        get_periods = getattr(sessions_insights, "__get_periods")
+        # the range is split into 2 steps, aligned like toStartOfInterval
+        assert get_periods(0, 6 * HOUR * 1000) == {"step_size": 3 * HOUR, "currentPeriod": 3 * HOUR,
+                                                   "previousPeriod": 0}
+        assert get_periods(1000, 6 * HOUR * 1000 + 1000) == {"step_size": 3 * HOUR, "currentPeriod": 3 * HOUR,
+                                                             "previousPeriod": 0}
+        assert get_periods(0, 1000) is None
+
+    def test_most_errors_by_period(self, monkeypatch):
+        rows = events()
+        monkeypatch.setattr(sessions_insights.ch_client, "ClickHouseClient", client(rows))
+        results = sessions_insights.query_most_errors_by_period(project_id=1, start_time=0,
+                                                                end_time=6 * HOUR * 1000, filters=None)
+        current = {}
+        previous = {}
+        for name, t in rows:
+            period = current if t >= 3 * HOUR else previous
+            period[name] = period.get(name, 0) + 1
+        total = sum(current.values())
+        change = {n: (v - previous[n]) / previous[n] for n, v in current.items() if n in previous}
+        expected = sorted(change, key=lambda n: -change[n])[:3]
+        expected += [n for n in sorted(current, key=lambda n: -current[n])[:3] if n not in expected]
+        new_names = [n for n in sorted(current, key=lambda n: -current[n]) if n not in previous][:3]
+        expected += [n for n in new_names if n not in expected]
+        assert [r["name"] for r in results] == expected
+        for r in results:
+            assert r["value"] == current[r["name"]]
+            assert r["ratio"] == pytest.approx(100 * current[r["name"]] / total)
+            assert r["isNew"] == (r["name"] not in previous)
+            if r["isNew"]:
+                assert r["oldValue"] is None and r["change"] is None
+            else:
+                assert r["oldValue"] == previous[r["name"]]
+                assert r["change"] == pytest.approx(100 * change[r["name"]])
+        assert "gone0" not in [r["name"] for r in results]
+        assert new_names == ["new4", "new3", "new2"]
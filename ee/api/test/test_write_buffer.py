@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import psycopg
+import pytest
+
+from chalicelib.utils import write_buffer
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # the batches "written" by the stubbed COPY: a batch containing "bad" is rejected,
+    # one containing "down" or any batch while down can't be written, while slow the COPY hangs
+    db = SimpleNamespace(batches=[], down=False, slow=False)
+
+    async def copy(self, rows):
+        if db.slow:
+            await asyncio.sleep(10)
+        if "bad" in rows:
+            raise psycopg.IntegrityError("foreign key violation")
+        if db.down or "down" in rows:
+            raise psycopg.OperationalError("connection refused")
+        db.batches.append(list(rows))
+
+    monkeypatch.setattr(write_buffer, "buffers", {})
+    monkeypatch.setattr(write_buffer.WriteBuffer, "_WriteBuffer__copy", copy)
+    return db
+
+
+def buffer(capacity=10, flush_size=3, flush_interval=60, max_attempts=2, stop_timeout=5):
+    return write_buffer.WriteBuffer(name="test", table="test", columns=["value"], capacity=capacity,
+                                    flush_size=flush_size, flush_interval=flush_interval, max_attempts=max_attempts,
+                                    stop_timeout=stop_timeout)
+
+
+class TestWriteBuffer:
+    def test_put_capacity(self, db):
+        b = buffer(capacity=2)
+        assert b.put(1) and b.put(2)
+        assert not b.put(3)
+        assert b.stats()["size"] == 2 and b.stats()["dropped"] == 1
+
+    def test_wakeup_at_flush_size(self, db):
+        async def run():
+            b = buffer(flush_size=3, flush_interval=60)
+            b.start()
+            # from a request thread
+            thread = threading.Thread(target=lambda: [b.put(i) for i in range(4)])
+            thread.start()
+            thread.join()
+            await asyncio.sleep(0.1)
+            assert db.batches == [[0, 1, 2], [3]]
+            await b.stop()
+
+        asyncio.run(run())
+
+    def test_connection_error_keeps_rows(self, db):
+        b = buffer(flush_size=4, max_attempts=3)
+        for v in [1, 2, 3, 4, 5]:
+            b.put(v)
+        db.down = True
+        asyncio.run(b.flush())
+        asyncio.run(b.flush())
+        # the failed batch is kept for the next flush, in the same order, and not split
+        assert db.batches == [] and list(b.rows) == [1, 2, 3, 4, 5]
+        assert b.stats()["failures"] == 2 and b.stats()["rejected"] == 0 and b.stats()["dropped"] == 0
+        db.down = False
+        asyncio.run(b.flush())
+        assert db.batches == [[1, 2, 3, 4], [5]]
+        assert b.stats()["inserted"] == 5 and b.stats()["size"] == 0
+
+    def test_connection_error_max_attempts(self, db):
+        b = buffer(flush_size=4, max_attempts=2)
+        for v in [1, 2, 3, 4, 5]:
+            b.put(v)
+        db.down = True
+        asyncio.run(b.flush())
+        asyncio.run(b.flush())
+        # max_attempts reached: the batch is dropped once, the next one is tried at the next flush
+        assert db.batches == [] and list(b.rows) == [5]
+        assert b.stats()["dropped"] == 4 and b.stats()["rejected"] == 0
+
+    def test_invalid_row_split(self, db):
+        b = buffer(flush_size=4, max_attempts=3)
+        for v in [1, "bad", 3, 4]:
+            b.put(v)
+        # rejected by the database: no retry
+        asyncio.run(b.flush())
+        assert db.batches == [[1], [3, 4]]
+        assert b.stats()["rejected"] == 1 and b.stats()["inserted"] == 3
+
+    def test_connection_error_during_split(self, db):
+        b = buffer(flush_size=4, max_attempts=3)
+        for v in [1, "bad", 3, "down", 5]:
+            b.put(v)
+        asyncio.run(b.flush())
+        # the rows not tried yet are kept, not rejected
+        assert db.batches == [[1]] and list(b.rows) == [3, "down", 5]
+        assert b.stats()["rejected"] == 1 and b.stats()["inserted"] == 1 and b.stats()["dropped"] == 0
+
+    def test_stop_drains(self, db):
+        async def run():
+            b = buffer(flush_size=3, flush_interval=60)
+            b.start()
+            for v in [1, "bad", 3, 4, 5]:
+                b.put(v)
+            await b.stop()
+            assert b.stats()["size"] == 0 and b.stats()["rejected"] == 1
+
+        asyncio.run(run())
+        assert sorted([v for batch in db.batches for v in batch]) == [1, 3, 4, 5]
+
+    @pytest.mark.parametrize("failure", ["down", "slow"])
+    def test_stop_timeout(self, db, failure):
+        async def run():
+            b = buffer(flush_size=3, flush_interval=60, max_attempts=100, stop_timeout=0.5)
+            b.start()
+            setattr(db, failure, True)
+            for v in [1, 2, 3, 4, 5]:
+                b.put(v)
+            now = time.time()
+            await b.stop()
+            assert time.time() - now < 2
+            # the rows of the cancelled flush are counted too
+            assert b.stats()["size"] == 0 and b.stats()["dropped"] == 5 and b.stats()["rejected"] == 0
+
+        asyncio.run(run())
+        assert db.batches == []
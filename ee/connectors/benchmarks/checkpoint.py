@@ -0,0 +1,84 @@
+"""Snapshot and recovery time of WorkerPool checkpoints vs number of open sessions.
+Compares the legacy full json snapshot with the incremental msgpack log (delta of the sessions touched in a loop).
+Checkpoints are kept in memory instead of S3. Run from ee/connectors with the connector env set:
+    python -m benchmarks.checkpoint [changed_ratio]"""
+import io
+import json
+import random
+import sys
+from time import perf_counter
+
+from db.models import Session
+from utils.worker import WorkerPool, session_to_dict
+
+
+class MemoryStore:
+    """Stand-in for DBConnection binary storage"""
+    def __init__(self):
+        self.objects = dict()
+
+    def save_binary(self, binary_data, name, **kwargs):
+        self.objects[name] = binary_data
+
+    def load_binary(self, name):
+        if name not in self.objects:
+            return None
+        return io.BytesIO(self.objects[name])
+
+    def delete_binary(self, name):
+        self.objects.pop(name, None)
+
+
+def make_session(session_id: int) -> Session:
+    s = Session()
+    s.sessionid = session_id
+    s.user_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0'
+    s.user_browser = 'Chrome'
+    s.user_browser_version = '118.0'
+    s.user_country = 'FR'
+    s.user_os = 'Linux'
+    s.session_start_timestamp = 1680000000000 + session_id
+    s.urls_count = random.randint(1, 20)
+    return s
+
+
+def run(changed_ratio: float):
+    for n_sessions in (1000, 10000, 50000):
+        random.seed(0)
+        pool = WorkerPool(n_workers=1, project_filter=[])
+        for session_id in range(n_sessions):
+            pool.sessions[session_id] = make_session(session_id)
+            pool.project_filter_class.sessions_lifespan.add(session_id)
+        store = MemoryStore()
+
+        t = perf_counter()
+        legacy = json.dumps({'version': 'v1.2',
+                             'sessions': [[k, session_to_dict(v)] for k, v in pool.sessions.items()],
+                             'cached_sessions': pool.project_filter_class.sessions_lifespan.session_project,
+                             'events_batch': pool.events_batch.to_dict()}).encode('utf-8')
+        t_legacy = perf_counter() - t
+
+        t = perf_counter()
+        pool.save_snapshot(store)
+        t_base = perf_counter() - t
+
+        pool.changed_sessions = set(random.sample(range(n_sessions), int(n_sessions * changed_ratio)))
+        t = perf_counter()
+        pool.save_snapshot(store)
+        t_delta = perf_counter() - t
+        delta_size = len(store.objects[pool.checkpoint.delta_name(pool.checkpoint.generation, 0)])
+
+        recovered = WorkerPool(n_workers=1, project_filter=[])
+        t = perf_counter()
+        recovered.load_checkpoint(store)
+        t_load = perf_counter() - t
+
+        print(f'{n_sessions} open sessions: legacy json {t_legacy:.3f}s ({len(legacy) / 1e6:.1f}MB), '
+              f'base {t_base:.3f}s ({len(store.objects["checkpoint_v2"]) / 1e6:.1f}MB), '
+              f'delta {t_delta:.3f}s ({delta_size / 1e6:.2f}MB), load {t_load:.3f}s')
+        pool.pool.close()
+        recovered.pool.close()
+
+
+if __name__ == '__main__':
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 0.05)
@@ -0,0 +1,59 @@
+"""Compare row-wise df.to_sql against the bulk loader of the configured CLOUD_SERVICE (pg, clickhouse or snowflake).
+Point the usual connector env (CLOUD_SERVICE, CONNECTION_STRING, ...) at a local stand-in database where the events
+table already exists (see sql/), then run from ee/connectors:
+    python -m benchmarks.loaders [n_rows] [table]"""
+import random
+import sys
+from time import perf_counter
+
+from decouple import config
+
+from db.api import DBConnection
+from db.models import events_table_name
+from db.utils import EventsColumns
+
+DATABASE = config('CLOUD_SERVICE')
+if DATABASE == 'pg':
+    from db.loaders.postgres_loader import copy_to_postgres as bulk_insert
+elif DATABASE == 'clickhouse':
+    from db.loaders.clickhouse_loader import insert_columnar_to_clickhouse as bulk_insert
+elif DATABASE == 'snowflake':
+    from db.loaders.snowflake_loader import stage_to_snowflake as bulk_insert
+else:
+    raise Exception(f"{DATABASE}-database has no bulk loader to benchmark")
+
+
+def make_events(n_rows: int):
+    batch = EventsColumns('normal')
+    for i in range(n_rows):
+        if i % 2:
+            values = [('consolelog_level', 'log'), ('consolelog_value', f'value {i} ' * 4)]
+        else:
+            values = [('clickevent_hesitationtime', random.randint(0, 5000)), ('clickevent_messageid', i),
+                      ('clickevent_label', f'button {i % 50}'), ('clickevent_selector', 'div > a.btn')]
+        batch.append(random.randint(1, 10 ** 15), 1680000000000 + i, values)
+    return batch.to_dataframe()
+
+
+def run(n_rows: int, table: str):
+    random.seed(0)
+    db = DBConnection(DATABASE)
+    df = make_events(n_rows)
+
+    t = perf_counter()
+    df.to_sql(table, db.engine, if_exists='append', index=False)
+    t_to_sql = perf_counter() - t
+
+    t = perf_counter()
+    bulk_insert(db, df, table)
+    t_bulk = perf_counter() - t
+
+    print(f'{DATABASE}: {n_rows} rows into {table}')
+    print(f'to_sql: {t_to_sql:.3f}s ({n_rows / t_to_sql:.0f} rows/s)')
+    print(f'{bulk_insert.__name__}: {t_bulk:.3f}s ({n_rows / t_bulk:.0f} rows/s)')
+    db.close()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+        sys.argv[2] if len(sys.argv) > 2 else events_table_name)
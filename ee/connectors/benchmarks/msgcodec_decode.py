@@ -0,0 +1,85 @@
+"""Compare the BytesIO based decoder (decode_detailed) against the offset based columnar decoder (decode_columnar).
+Run from ee/connectors:
+    python -m benchmarks.msgcodec_decode [n_batches] [messages_per_batch]"""
+import random
+import sys
+from time import perf_counter
+
+from msgcodec.msgcodec import MessageCodec
+
+SELECTED = [1, 4, 21, 22, 25, 27, 31, 32, 39, 48, 59, 64, 69, 78, 125, 126]
+
+
+def encode_uint(x: int) -> bytes:
+    out = bytearray()
+    while x >= 0x80:
+        out.append((x & 0x7f) | 0x80)
+        x >>= 7
+    out.append(x)
+    return bytes(out)
+
+
+def encode_int(x: int) -> bytes:
+    return encode_uint((x << 1) if x >= 0 else ((-x - 1) << 1) | 1)
+
+
+def encode_string(s: str) -> bytes:
+    b = s.encode('utf-8')
+    return encode_uint(len(b)) + b
+
+
+def encode_message(message_id: int, body: bytes) -> bytes:
+    return encode_uint(message_id) + len(body).to_bytes(3, 'little') + body
+
+
+def make_batch(n_messages: int) -> bytes:
+    # BatchMetadata version=1: every following message is length-prefixed
+    batch = bytearray(encode_uint(81) + encode_uint(1) + encode_uint(0) + encode_uint(0)
+                      + encode_int(1680000000000) + encode_string('https://example.com/'))
+    for i in range(n_messages):
+        kind = random.random()
+        if kind < 0.4:
+            # MouseMove (20), not selected
+            body = encode_uint(random.randint(0, 2000)) + encode_uint(random.randint(0, 2000))
+            batch += encode_message(20, body)
+        elif kind < 0.6:
+            # ConsoleLog (22)
+            body = encode_string('log') + encode_string(f'value {i} ' * 5)
+            batch += encode_message(22, body)
+        elif kind < 0.8:
+            # Timestamp (0), not selected
+            batch += encode_message(0, encode_uint(1680000000000 + i))
+        else:
+            # NetworkRequest (21)
+            body = (encode_string('fetch') + encode_string('GET') + encode_string(f'https://example.com/api/{i}')
+                    + encode_string('{}') + encode_string('{"ok": true}') + encode_uint(200)
+                    + encode_uint(1680000000000 + i) + encode_uint(random.randint(1, 500)))
+            batch += encode_message(21, body)
+    return bytes(batch)
+
+
+def run(n_batches: int, messages_per_batch: int):
+    random.seed(0)
+    batches = [make_batch(messages_per_batch) for _ in range(n_batches)]
+    codec = MessageCodec(SELECTED)
+
+    t = perf_counter()
+    detailed = sum(len(codec.decode_detailed(b)) for b in batches)
+    t_detailed = perf_counter() - t
+
+    t = perf_counter()
+    columnar = 0
+    for b in batches:
+        for columns in codec.decode_columnar(b).values():
+            columnar += len(next(iter(columns.values()))) if columns else 0
+    t_columnar = perf_counter() - t
+
+    print(f'{n_batches} batches x {messages_per_batch} messages')
+    print(f'decode_detailed: {t_detailed:.3f}s ({detailed} messages)')
+    print(f'decode_columnar: {t_columnar:.3f}s ({columnar} messages)')
+    print(f'speedup: {t_detailed / t_columnar:.2f}x')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500)
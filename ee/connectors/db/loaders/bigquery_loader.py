@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 
+from google.cloud import bigquery
 from google.oauth2.service_account import Credentials
 
 # obtain the JSON file:
@@ -29,6 +30,21 @@ def insert_to_bigquery(df, table):
               credentials=credentials)
 
 
+def merge_to_bigquery(df, table, key='sessionid'):
+    """Replaces a staging table with the rows and applies them with a single MERGE"""
+    dataset = os.environ['dataset']
+    project_id = os.environ['project_id']
+    staging = f'{table}_staging'
+    set_clause = ', '.join(f'{c} = s.{c}' for c in df.columns if c != key)
+    df.to_gbq(destination_table=f"{dataset}.{staging}",
+              project_id=project_id,
+              if_exists='replace',
+              credentials=credentials)
+    client = bigquery.Client(project=project_id, credentials=credentials)
+    client.query(f"MERGE `{project_id}.{dataset}.{table}` t USING `{project_id}.{dataset}.{staging}` s "
+                 f"ON t.{key} = s.{key} WHEN MATCHED THEN UPDATE SET {set_clause}").result()
+
+
 def transit_insert_to_bigquery(db, batch):
     ...
 
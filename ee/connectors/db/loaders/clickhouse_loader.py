@@ -1,4 +1,49 @@
+from clickhouse_driver import Client
+from decouple import config
+
+_bulk_load = config('BULK_LOAD', default=True, cast=bool)
+
 
 def insert_to_clickhouse(db, df, table: str):
-    df.to_sql(table, db.engine, if_exists='append', index=False)
+    if _bulk_load:
+        insert_columnar_to_clickhouse(db, df, table)
+    else:
+        df.to_sql(table, db.engine, if_exists='append', index=False)
+
+
+def _get_native_client(db) -> Client:
+    client = getattr(db, '_native_client', None)
+    if client is None:
+        url = db.engine.url
+        client = Client(host=url.host, port=url.port or 9000, database=url.database or 'default',
+                        user=url.username or 'default', password=url.password or '')
+        db._native_client = client
+    return client
+
+
+def insert_columnar_to_clickhouse(db, df, table: str):
+    """Sends the DataFrame column by column over the native protocol in a single INSERT"""
+    columns = ','.join(f'`{c}`' for c in df.columns)
+    data = [df[c].astype(object).where(df[c].notna(), None).tolist() for c in df.columns]
+    _get_native_client(db).execute(f'INSERT INTO {table} ({columns}) VALUES', data, columnar=True)
+
 
+def update_clickhouse(db, df, table: str, key: str = 'sessionid'):
+    """Loads the rows into a Join engine staging table and applies them with a single ALTER TABLE ... UPDATE
+    mutation. Mutations don't work on Buffer tables, so the update targets the MergeTree table behind it
+    (CLICKHOUSE_UPDATE_TABLE, by default the table name without its _buffer suffix). The Buffer table is flushed
+    first: the rows still waiting in it when the mutation runs would not get the update."""
+    target = config('CLICKHOUSE_UPDATE_TABLE', default=table[:-len('_buffer')] if table.endswith('_buffer') else table)
+    staging = f'{target}_staging'
+    set_clause = ', '.join(f"`{c}` = joinGet('{staging}', '{c}', `{key}`)" for c in df.columns if c != key)
+    client = _get_native_client(db)
+    if table != target:
+        client.execute(f'OPTIMIZE TABLE {table}')
+    client.execute(f'DROP TABLE IF EXISTS {staging}')
+    client.execute(f'CREATE TABLE {staging} ENGINE = Join(ANY, LEFT, `{key}`) AS SELECT * FROM {target} WHERE 0')
+    try:
+        insert_columnar_to_clickhouse(db, df, staging)
+        client.execute(f'ALTER TABLE {target} UPDATE {set_clause} WHERE `{key}` IN (SELECT `{key}` FROM {staging})',
+                       settings={'mutations_sync': 1})
+    finally:
+        client.execute(f'DROP TABLE IF EXISTS {staging}')
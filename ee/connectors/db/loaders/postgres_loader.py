@@ -1,3 +1,57 @@
+import csv
+import io
+
+from decouple import config
+from pandas.api.types import is_string_dtype
+
+_bulk_load = config('BULK_LOAD', default=True, cast=bool)
+
 
 def insert_to_postgres(db, df, table: str):
-    df.to_sql(table, db.engine, if_exists='append', index=False)
+    if _bulk_load:
+        copy_to_postgres(db, df, table)
+    else:
+        df.to_sql(table, db.engine, if_exists='append', index=False)
+
+
+def _copy_df(cur, df, table: str):
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_NONNUMERIC)
+    buffer.seek(0)
+    columns = ','.join(f'"{c}"' for c in df.columns)
+    # Every non numeric value is quoted, so only "" in non string columns is read as NULL
+    non_string = ','.join(f'"{c}"' for c in df.columns if not is_string_dtype(df[c].dtype))
+    options = f'FORMAT csv, FORCE_NULL ({non_string})' if non_string else 'FORMAT csv'
+    cur.copy_expert(f'COPY {table} ({columns}) FROM STDIN WITH ({options})', buffer)
+
+
+def copy_to_postgres(db, df, table: str):
+    """Streams the DataFrame as CSV through COPY FROM STDIN (one statement per batch instead of row INSERTs)"""
+    conn = db.engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            _copy_df(cur, df, table)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def update_postgres(db, df, table: str, key: str = 'sessionid'):
+    """COPYs the rows into a temporary staging table and applies them with a single UPDATE ... FROM"""
+    staging = table.split('.')[-1] + '_staging'
+    set_clause = ', '.join(f'"{c}" = s."{c}"' for c in df.columns if c != key)
+    conn = db.engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f'CREATE TEMP TABLE {staging} (LIKE {table}) ON COMMIT DROP')
+            _copy_df(cur, df, staging)
+            cur.execute(f'UPDATE {table} AS t SET {set_clause} FROM {staging} AS s WHERE t."{key}" = s."{key}"')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -17,3 +17,18 @@ def insert_df(pr, df, table):
                           redshift_table_name=table,
                           append=True,
                           delimiter='|')
+
+
+def transit_update_to_redshift(db, df, table, key='sessionid'):
+    """Loads the rows into a staging table through S3 and applies them with a single UPDATE ... FROM"""
+    staging = f'{table}_staging'
+    set_clause = ', '.join(f'{c} = s.{c}' for c in df.columns if c != key)
+    pr = db.pdredshift
+    try:
+        pr.exec_commit(f'CREATE TABLE IF NOT EXISTS {staging} (LIKE {table})')
+        pr.exec_commit(f'DELETE FROM {staging}')
+        insert_df(pr, df, staging)
+        pr.exec_commit(f'UPDATE {table} SET {set_clause} FROM {staging} s WHERE {table}.{key} = s.{key}')
+    except InternalError_ as e:
+        print(repr(e))
+        print("update failed. check stl_load_errors")
@@ -1,5 +1,40 @@
+from decouple import config
+from snowflake.connector.pandas_tools import write_pandas
+
+_bulk_load = config('BULK_LOAD', default=True, cast=bool)
+
 
 def insert_to_snowflake(db, df, table):
-    df.to_sql(table, db.engine, if_exists='append', index=False)
+    if _bulk_load:
+        stage_to_snowflake(db, df, table)
+    else:
+        df.to_sql(table, db.engine, if_exists='append', index=False)
+
+
+def stage_to_snowflake(db, df, table):
+    """Uploads the DataFrame as parquet files to the table stage and loads them with COPY INTO"""
+    conn = db.engine.raw_connection()
+    try:
+        success, n_chunks, n_rows, _ = write_pandas(conn.connection, df, table_name=table,
+                                                    quote_identifiers=False)
+        if not success:
+            raise ValueError(f'Snowflake COPY INTO {table} failed ({n_rows} rows in {n_chunks} chunks)')
+    finally:
+        conn.close()
 
 
+def merge_to_snowflake(db, df, table, key='sessionid'):
+    """Stages the rows into a temporary table and applies them with a single MERGE"""
+    staging = f'{table}_staging'
+    set_clause = ', '.join(f'{c} = s.{c}' for c in df.columns if c != key)
+    conn = db.engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f'CREATE TEMPORARY TABLE IF NOT EXISTS {staging} LIKE {table}')
+        cur.execute(f'TRUNCATE TABLE {staging}')
+        write_pandas(conn.connection, df, table_name=staging, quote_identifiers=False)
+        cur.execute(f'MERGE INTO {table} t USING {staging} s ON t.{key} = s.{key} '
+                    f'WHEN MATCHED THEN UPDATE SET {set_clause}')
+        conn.commit()
+    finally:
+        conn.close()
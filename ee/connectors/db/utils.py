@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from db.models import DetailedEvent, Event, Session, DATABASE
 
@@ -184,6 +185,8 @@ for col in Session.__dict__:
 
 
 def get_df_from_batch(batch, level):
+    if isinstance(batch, EventsColumns):
+        return batch.to_dataframe()
     if level == 'normal':
         df = pd.DataFrame([b.__dict__ for b in batch], columns=events_col)
     if level == 'detailed':
@@ -195,7 +198,10 @@ def get_df_from_batch(batch, level):
         df = df.drop('_sa_instance_state', axis=1)
     except KeyError:
         pass
+    return _format_df(df, level)
 
+
+def _format_df(df, level):
     if level == 'normal':
         current_types = dtypes_events
         #df['clickevent_hesitationtime'] = df['clickevent_hesitationtime'].fillna(0)
@@ -239,3 +245,88 @@ def get_df_from_batch(batch, level):
                     df[x] = df[x].str.slice(0, 255)
                 df[x] = df[x].str.replace("|", "")
     return df
+
+
+class EventsColumns:
+    """Columnar accumulator of events rows. Values are appended straight into per column arrays
+    (sparse: row positions + values) and typed once in to_dataframe, so no ORM instance is built
+    per message. Pickles and serializes (to_dict/from_dict) as plain lists."""
+
+    def __init__(self, level: str):
+        self.level = level
+        self.columns = events_col if level == 'normal' else detailed_events_col
+        self.size = 0
+        self.sessionid = list()
+        self.received_at = list()
+        self.rows = {column: list() for column in self.columns}
+        self.values = {column: list() for column in self.columns}
+
+    def __len__(self):
+        return self.size
+
+    def append(self, session_id: int, received_at: int, values):
+        """Adds one row from an iterable of (column, value), None values are left empty"""
+        row = self.size
+        for column, value in values:
+            if value is not None:
+                self.rows[column].append(row)
+                self.values[column].append(value)
+        self.sessionid.append(session_id)
+        self.received_at.append(received_at)
+        self.size += 1
+
+    def extend(self, other: 'EventsColumns'):
+        """Appends all rows of another batch with the same level"""
+        offset = self.size
+        for column in self.columns:
+            self.rows[column].extend([row + offset for row in other.rows[column]])
+            self.values[column].extend(other.values[column])
+        self.sessionid.extend(other.sessionid)
+        self.received_at.extend(other.received_at)
+        self.size += other.size
+
+    def _column_array(self, column: str, dtype: str):
+        rows = self.rows[column]
+        values = self.values[column]
+        if dtype in ('Int64', 'boolean'):
+            data = np.zeros(self.size, dtype='int64' if dtype == 'Int64' else 'bool')
+            mask = np.ones(self.size, dtype='bool')
+            if rows:
+                data[rows] = values
+                mask[rows] = False
+            if dtype == 'Int64':
+                return pd.arrays.IntegerArray(data, mask)
+            return pd.arrays.BooleanArray(data, mask)
+        data = np.full(self.size, None, dtype='object')
+        if rows:
+            data[rows] = values
+        return pd.array(data, dtype=dtype)
+
+    def to_dataframe(self):
+        current_types = dtypes_events if self.level == 'normal' else dtypes_detailed_events
+        data = dict()
+        for column in self.columns:
+            if column == 'sessionid':
+                data[column] = pd.array(self.sessionid, dtype='Int64')
+            elif column == 'received_at':
+                data[column] = pd.array(self.received_at, dtype='Int64')
+            elif column == 'batch_order_number':
+                data[column] = pd.array(np.arange(self.size), dtype='Int64')
+            else:
+                data[column] = self._column_array(column, current_types.get(column, 'object'))
+        return _format_df(pd.DataFrame(data, columns=self.columns), self.level)
+
+    def to_dict(self):
+        return {'level': self.level, 'size': self.size, 'sessionid': self.sessionid,
+                'received_at': self.received_at, 'rows': self.rows, 'values': self.values}
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        batch = cls(d['level'])
+        batch.size = d['size']
+        batch.sessionid = d['sessionid']
+        batch.received_at = d['received_at']
+        for column in batch.columns:
+            batch.rows[column] = d['rows'].get(column, list())
+            batch.values[column] = d['values'].get(column, list())
+        return batch
@@ -3,21 +3,21 @@ from decouple import config
 DATABASE = config('CLOUD_SERVICE')
 
 from db.api import DBConnection
-from db.utils import get_df_from_batch, dtypes_sessions
+from db.utils import get_df_from_batch
 from db.tables import *
 
 if DATABASE == 'redshift':
-    from db.loaders.redshift_loader import transit_insert_to_redshift
+    from db.loaders.redshift_loader import transit_insert_to_redshift, transit_update_to_redshift
     import pandas as pd
 elif DATABASE == 'clickhouse':
-    from db.loaders.clickhouse_loader import insert_to_clickhouse
+    from db.loaders.clickhouse_loader import insert_to_clickhouse, update_clickhouse
 elif DATABASE == 'pg':
-    from db.loaders.postgres_loader import insert_to_postgres
+    from db.loaders.postgres_loader import insert_to_postgres, update_postgres
 elif DATABASE == 'bigquery':
-    from db.loaders.bigquery_loader import insert_to_bigquery
+    from db.loaders.bigquery_loader import insert_to_bigquery, merge_to_bigquery
     from bigquery_utils.create_table import create_tables_bigquery
 elif DATABASE == 'snowflake':
-    from db.loaders.snowflake_loader import insert_to_snowflake
+    from db.loaders.snowflake_loader import insert_to_snowflake, merge_to_snowflake
 else:
     raise Exception(f"{DATABASE}-database not supported")
 
@@ -67,26 +67,23 @@ def insert_batch(db: DBConnection, batch, table, level='normal'):
 
 
 def update_batch(db: DBConnection, batch, table):
+    """Applies the whole batch of updated sessions at once: the rows are bulk loaded into a staging table
+    and merged into the sessions table with a single UPDATE ... FROM / MERGE"""
     if len(batch) == 0:
         return
     df = get_df_from_batch(batch, level='sessions')
-    base_query = f"UPDATE {table} SET"
-    for column_name, column_type in dtypes_sessions.items():
-        if column_name == 'sessionid':
-            continue
-        elif column_type == 'string':
-            df[column_name] = df[column_name].fillna('NULL')
-            base_query += f" {column_name} = " + "'{" + f"{column_name}" + "}',"
-        else:
-            df[column_name] = df[column_name].fillna(0)
-            base_query += f" {column_name} = " + "{" + f"{column_name}" + "},"
-    base_query = base_query[:-1] + " WHERE sessionid = {sessionid};"
-    for i in range(len(df)):
-        if db.config == 'redshift':
-            params = dict(df.iloc[i])
-            query = base_query.format(**params)
-            try:
-                db.pdredshift.exec_commit(query)
-            except Exception as e:
-                print('[ERROR] Error while executing query')
-                print(repr(e))
+
+    if db.config == 'redshift':
+        transit_update_to_redshift(db=db, df=df, table=table)
+
+    if db.config == 'clickhouse':
+        update_clickhouse(db=db, df=df, table=table)
+
+    if db.config == 'pg':
+        update_postgres(db=db, df=df, table=table)
+
+    if db.config == 'bigquery':
+        merge_to_bigquery(df=df, table=table)
+
+    if db.config == 'snowflake':
+        merge_to_snowflake(db=db, df=df, table=table)
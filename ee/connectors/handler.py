@@ -1,6 +1,7 @@
 from typing import Optional, Union
 
 from db.models import Event, DetailedEvent, Session
+from db.utils import EventsColumns
 from messages import *
 
 
@@ -824,3 +825,87 @@ def handle_message(message: Message) -> Optional[DetailedEvent]:
         n.iosperformanceaggregated_maxbattery = message.max_battery
         return n
     return None
+
+
+# Columns filled by each event message (message id -> ((column, attribute), ...)), used by the columnar
+# events batch (db.utils.EventsColumns). Keep in sync with handle_normal_message and handle_message:
+# only messages listed in the worker events_messages and columns present in the events tables matter.
+normal_events_columns = {
+    # ConsoleLog
+    22: (('consolelog_level', 'level'), ('consolelog_value', 'value')),
+    # CustomEvent
+    27: (('customevent_name', 'name'), ('customevent_payload', 'payload')),
+    # CustomIssue
+    64: (('customissue_name', 'name'), ('customissue_payload', 'payload')),
+    # MouseClick
+    69: (('clickevent_hesitationtime', 'hesitation_time'), ('clickevent_messageid', 'id'),
+         ('clickevent_label', 'label'), ('clickevent_selector', 'selector')),
+    # IssueEvent
+    125: (('issueevent_timestamp', 'timestamp'), ('issueevent_type', 'type'),
+          ('issueevent_context_string', 'context_string'), ('issueevent_context', 'context'),
+          ('issueevent_payload', 'payload'), ('issueevent_url', 'url')),
+}
+
+detailed_events_columns = {
+    # SessionStart
+    1: (('sessionstart_trackerversion', 'tracker_version'), ('sessionstart_revid', 'rev_id'),
+        ('sessionstart_timestamp', 'timestamp'), ('sessionstart_useruuid', 'user_uuid'),
+        ('sessionstart_useragent', 'user_agent'), ('sessionstart_useros', 'user_os'),
+        ('sessionstart_userosversion', 'user_os_version'), ('sessionstart_userbrowser', 'user_browser'),
+        ('sessionstart_userbrowserversion', 'user_browser_version'), ('sessionstart_userdevice', 'user_device'),
+        ('sessionstart_userdevicetype', 'user_device_type'),
+        ('sessionstart_userdevicememorysize', 'user_device_memory_size'),
+        ('sessionstart_userdeviceheapsize', 'user_device_heap_size'),
+        ('sessionstart_usercountry', 'user_country')),
+    # SetPageLocation
+    4: (('setpagelocation_url', 'url'), ('setpagelocation_referrer', 'referrer'),
+        ('setpagelocation_navigationstart', 'navigation_start')),
+    # ConsoleLog
+    22: (('consolelog_level', 'level'), ('consolelog_value', 'value')),
+    # CustomEvent
+    27: (('customevent_name', 'name'), ('customevent_payload', 'payload')),
+    # PageEvent
+    31: (('pageevent_messageid', 'message_id'), ('pageevent_timestamp', 'timestamp'), ('pageevent_url', 'url'),
+         ('pageevent_referrer', 'referrer'), ('pageevent_loaded', 'loaded'),
+         ('pageevent_requeststart', 'request_start'), ('pageevent_responsestart', 'response_start'),
+         ('pageevent_responseend', 'response_end'),
+         ('pageevent_domcontentloadedeventstart', 'dom_content_loaded_event_start'),
+         ('pageevent_domcontentloadedeventend', 'dom_content_loaded_event_end'),
+         ('pageevent_loadeventstart', 'load_event_start'), ('pageevent_loadeventend', 'load_event_end'),
+         ('pageevent_firstpaint', 'first_paint'), ('pageevent_firstcontentfulpaint', 'first_contentful_paint'),
+         ('pageevent_speedindex', 'speed_index')),
+    # InputEvent
+    32: (('inputevent_messageid', 'message_id'), ('inputevent_timestamp', 'timestamp'),
+         ('inputevent_value', 'value'), ('inputevent_valuemasked', 'value_masked'), ('inputevent_label', 'label')),
+    # Fetch
+    39: (('fetch_method', 'method'), ('fetch_url', 'url'), ('fetch_request', 'request'), ('fetch_status', 'status'),
+         ('fetch_timestamp', 'timestamp'), ('fetch_duration', 'duration')),
+    # GraphQL
+    48: (('graphql_operationkind', 'operation_kind'), ('graphql_operationname', 'operation_name'),
+         ('graphql_variables', 'variables'), ('graphql_response', 'response')),
+    # LongTask (no column in the events table)
+    59: (),
+    # CustomIssue
+    64: (('customissue_name', 'name'), ('customissue_payload', 'payload')),
+    # MouseClick
+    69: (('mouseclick_id', 'id'), ('mouseclick_hesitationtime', 'hesitation_time'), ('mouseclick_label', 'label')),
+    # JSException
+    78: (('jsexception_name', 'name'), ('jsexception_message', 'message'), ('jsexception_payload', 'payload'),
+         ('jsexception_metadata', 'metadata')),
+    # IssueEvent
+    125: (('issueevent_message_id', 'message_id'), ('issueevent_timestamp', 'timestamp'), ('issueevent_type', 'type'),
+          ('issueevent_context_string', 'context_string'), ('issueevent_context', 'context'),
+          ('issueevent_payload', 'payload'), ('issueevent_url', 'url')),
+    # SessionEnd
+    126: (('sessionend_timestamp', 'timestamp'), ('sessionend_encryption_key', 'encryption_key')),
+}
+
+
+def append_event_columns(batch: EventsColumns, session_id: int, message: Message, received_at: int) -> bool:
+    """Appends the event row of message to a columnar batch, returns False if message is not an event"""
+    message_columns = normal_events_columns if batch.level == 'normal' else detailed_events_columns
+    spec = message_columns.get(message.__id__)
+    if spec is None:
+        return False
+    batch.append(session_id, received_at, [(column, getattr(message, attribute)) for column, attribute in spec])
+    return True
@@ -1,4 +1,5 @@
 import io
+from typing import Tuple
 
 class Codec:
     """
@@ -76,3 +77,48 @@ class Codec:
             return s.decode("utf-8", errors="replace").replace("\x00", "\uFFFD")
         except UnicodeDecodeError:
             return None
+
+    # Offset based primitives. They work directly over a bytes/memoryview buffer and
+    # return (value, new_position), avoiding the BytesIO round trip per byte.
+
+    @staticmethod
+    def read_boolean_at(buf, pos: int) -> Tuple[bool, int]:
+        return buf[pos] == 1, pos + 1
+
+    @staticmethod
+    def read_uint_at(buf, pos: int) -> Tuple[int, int]:
+        num = buf[pos]
+        if num < 0x80:
+            return num, pos + 1
+        x = num & 0x7f
+        s = 7
+        i = 1
+        while True:
+            pos += 1
+            num = buf[pos]
+            if num < 0x80:
+                if i > 9 or (i == 9 and num > 1):
+                    raise OverflowError()
+                return x | num << s, pos + 1
+            x |= (num & 0x7f) << s
+            s += 7
+            i += 1
+
+    @staticmethod
+    def read_size_at(buf, pos: int) -> Tuple[int, int]:
+        return buf[pos] | buf[pos + 1] << 8 | buf[pos + 2] << 16, pos + 3
+
+    @staticmethod
+    def read_int_at(buf, pos: int) -> Tuple[int, int]:
+        ux, pos = Codec.read_uint_at(buf, pos)
+        x = ux >> 1
+        if ux & 1 != 0:
+            x = - x - 1
+        return x, pos
+
+    @staticmethod
+    def read_string_at(buf, pos: int) -> Tuple[str, int]:
+        length, pos = Codec.read_uint_at(buf, pos)
+        end = pos + length
+        s = bytes(buf[pos:end])
+        return s.decode("utf-8", errors="replace").replace("\x00", "\uFFFD"), end
@@ -2,9 +2,14 @@
 
 from msgcodec.codec import Codec
 from msgcodec.messages import *
-from typing import List
+from typing import Dict, List, Tuple
 import io
 
+_read_boolean_at = Codec.read_boolean_at
+_read_uint_at = Codec.read_uint_at
+_read_int_at = Codec.read_int_at
+_read_string_at = Codec.read_string_at
+
 class MessageCodec(Codec):
 
     def __init__(self, msg_selector: List[int] = list()):
@@ -74,6 +79,55 @@ class MessageCodec(Codec):
                 break
         return messages_list
 
+    def decode_columnar(self, b) -> Dict[int, Dict[str, list]]:
+        """
+        Decode a whole batch into column lists grouped by message id: {message_id: {attribute: [values]}}.
+        Works over a memoryview with an offset cursor (no BytesIO) and, in the length-prefixed format,
+        skips messages outside msg_selector by their size without decoding them.
+        Returns the same messages as decode_detailed, transposed.
+        """
+        buf = memoryview(b)
+        columns = dict()
+        end = len(buf)
+        try:
+            message_id, pos = _read_uint_at(buf, 0)
+            row, pos = ROW_READERS[message_id](buf, pos)
+        except (IndexError, KeyError):
+            print('[WARN] Broken batch')
+            return columns
+        self._append_row(columns, message_id, row)
+        if message_id == 80:
+            # Old BatchMeta
+            mode = 0
+        elif message_id == 81:
+            # New BatchMeta
+            mode = 0 if row[0] == 0 else 1
+        else:
+            return columns
+        msg_selector = set(self.msg_selector)
+        while pos < end:
+            try:
+                message_id, pos = _read_uint_at(buf, pos)
+                if mode == 1:
+                    r_size, pos = self.read_size_at(buf, pos)
+                    if message_id not in msg_selector:
+                        pos += r_size
+                        continue
+                row, pos = ROW_READERS[message_id](buf, pos)
+            except (IndexError, KeyError):
+                break
+            self._append_row(columns, message_id, row)
+        return columns
+
+    @staticmethod
+    def _append_row(columns: Dict[int, Dict[str, list]], message_id: int, row: tuple):
+        try:
+            message_columns = columns[message_id]
+        except KeyError:
+            message_columns = columns[message_id] = {name: list() for name in COLUMN_NAMES[message_id]}
+        for column, value in zip(message_columns.values(), row):
+            column.append(value)
+
     def handler(self, reader: io.BytesIO, mode=0) -> Message:
         message_id = self.read_message_id(reader)
         #print(f'[INFO-context] Current mode {mode}')
@@ -909,3 +963,1034 @@ class MessageCodec(Codec):
                 payload=self.read_string(reader)
             )
 
+
+
+
+def _read_timestamp_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    return (timestamp,), pos
+
+
+def _read_session_start_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    project_id, pos = _read_uint_at(buf, pos)
+    tracker_version, pos = _read_string_at(buf, pos)
+    rev_id, pos = _read_string_at(buf, pos)
+    user_uuid, pos = _read_string_at(buf, pos)
+    user_agent, pos = _read_string_at(buf, pos)
+    user_os, pos = _read_string_at(buf, pos)
+    user_os_version, pos = _read_string_at(buf, pos)
+    user_browser, pos = _read_string_at(buf, pos)
+    user_browser_version, pos = _read_string_at(buf, pos)
+    user_device, pos = _read_string_at(buf, pos)
+    user_device_type, pos = _read_string_at(buf, pos)
+    user_device_memory_size, pos = _read_uint_at(buf, pos)
+    user_device_heap_size, pos = _read_uint_at(buf, pos)
+    user_country, pos = _read_string_at(buf, pos)
+    user_id, pos = _read_string_at(buf, pos)
+    return (timestamp, project_id, tracker_version, rev_id, user_uuid, user_agent, user_os, user_os_version, user_browser, user_browser_version, user_device, user_device_type, user_device_memory_size, user_device_heap_size, user_country, user_id), pos
+
+
+def _read_session_end_deprecated_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    return (timestamp,), pos
+
+
+def _read_set_page_location_row(buf, pos: int) -> Tuple[tuple, int]:
+    url, pos = _read_string_at(buf, pos)
+    referrer, pos = _read_string_at(buf, pos)
+    navigation_start, pos = _read_uint_at(buf, pos)
+    return (url, referrer, navigation_start), pos
+
+
+def _read_set_viewport_size_row(buf, pos: int) -> Tuple[tuple, int]:
+    width, pos = _read_uint_at(buf, pos)
+    height, pos = _read_uint_at(buf, pos)
+    return (width, height), pos
+
+
+def _read_set_viewport_scroll_row(buf, pos: int) -> Tuple[tuple, int]:
+    x, pos = _read_int_at(buf, pos)
+    y, pos = _read_int_at(buf, pos)
+    return (x, y), pos
+
+
+def _read_create_document_row(buf, pos: int) -> Tuple[tuple, int]:
+    return (), pos
+
+
+def _read_create_element_node_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    parent_id, pos = _read_uint_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    tag, pos = _read_string_at(buf, pos)
+    svg, pos = _read_boolean_at(buf, pos)
+    return (id, parent_id, index, tag, svg), pos
+
+
+def _read_create_text_node_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    parent_id, pos = _read_uint_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    return (id, parent_id, index), pos
+
+
+def _read_move_node_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    parent_id, pos = _read_uint_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    return (id, parent_id, index), pos
+
+
+def _read_remove_node_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    return (id,), pos
+
+
+def _read_set_node_attribute_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    name, pos = _read_string_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    return (id, name, value), pos
+
+
+def _read_remove_node_attribute_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    name, pos = _read_string_at(buf, pos)
+    return (id, name), pos
+
+
+def _read_set_node_data_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    data, pos = _read_string_at(buf, pos)
+    return (id, data), pos
+
+
+def _read_set_css_data_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    data, pos = _read_string_at(buf, pos)
+    return (id, data), pos
+
+
+def _read_set_node_scroll_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    x, pos = _read_int_at(buf, pos)
+    y, pos = _read_int_at(buf, pos)
+    return (id, x, y), pos
+
+
+def _read_set_input_target_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    label, pos = _read_string_at(buf, pos)
+    return (id, label), pos
+
+
+def _read_set_input_value_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    mask, pos = _read_int_at(buf, pos)
+    return (id, value, mask), pos
+
+
+def _read_set_input_checked_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    checked, pos = _read_boolean_at(buf, pos)
+    return (id, checked), pos
+
+
+def _read_mouse_move_row(buf, pos: int) -> Tuple[tuple, int]:
+    x, pos = _read_uint_at(buf, pos)
+    y, pos = _read_uint_at(buf, pos)
+    return (x, y), pos
+
+
+def _read_network_request_deprecated_row(buf, pos: int) -> Tuple[tuple, int]:
+    type, pos = _read_string_at(buf, pos)
+    method, pos = _read_string_at(buf, pos)
+    url, pos = _read_string_at(buf, pos)
+    request, pos = _read_string_at(buf, pos)
+    response, pos = _read_string_at(buf, pos)
+    status, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_uint_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    return (type, method, url, request, response, status, timestamp, duration), pos
+
+
+def _read_console_log_row(buf, pos: int) -> Tuple[tuple, int]:
+    level, pos = _read_string_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    return (level, value), pos
+
+
+def _read_page_load_timing_row(buf, pos: int) -> Tuple[tuple, int]:
+    request_start, pos = _read_uint_at(buf, pos)
+    response_start, pos = _read_uint_at(buf, pos)
+    response_end, pos = _read_uint_at(buf, pos)
+    dom_content_loaded_event_start, pos = _read_uint_at(buf, pos)
+    dom_content_loaded_event_end, pos = _read_uint_at(buf, pos)
+    load_event_start, pos = _read_uint_at(buf, pos)
+    load_event_end, pos = _read_uint_at(buf, pos)
+    first_paint, pos = _read_uint_at(buf, pos)
+    first_contentful_paint, pos = _read_uint_at(buf, pos)
+    return (request_start, response_start, response_end, dom_content_loaded_event_start, dom_content_loaded_event_end, load_event_start, load_event_end, first_paint, first_contentful_paint), pos
+
+
+def _read_page_render_timing_row(buf, pos: int) -> Tuple[tuple, int]:
+    speed_index, pos = _read_uint_at(buf, pos)
+    visually_complete, pos = _read_uint_at(buf, pos)
+    time_to_interactive, pos = _read_uint_at(buf, pos)
+    return (speed_index, visually_complete, time_to_interactive), pos
+
+
+def _read_js_exception_deprecated_row(buf, pos: int) -> Tuple[tuple, int]:
+    name, pos = _read_string_at(buf, pos)
+    message, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    return (name, message, payload), pos
+
+
+def _read_integration_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    source, pos = _read_string_at(buf, pos)
+    name, pos = _read_string_at(buf, pos)
+    message, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    return (timestamp, source, name, message, payload), pos
+
+
+def _read_custom_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    name, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    return (name, payload), pos
+
+
+def _read_user_id_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_string_at(buf, pos)
+    return (id,), pos
+
+
+def _read_user_anonymous_id_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_string_at(buf, pos)
+    return (id,), pos
+
+
+def _read_metadata_row(buf, pos: int) -> Tuple[tuple, int]:
+    key, pos = _read_string_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    return (key, value), pos
+
+
+def _read_page_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    message_id, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_uint_at(buf, pos)
+    url, pos = _read_string_at(buf, pos)
+    referrer, pos = _read_string_at(buf, pos)
+    loaded, pos = _read_boolean_at(buf, pos)
+    request_start, pos = _read_uint_at(buf, pos)
+    response_start, pos = _read_uint_at(buf, pos)
+    response_end, pos = _read_uint_at(buf, pos)
+    dom_content_loaded_event_start, pos = _read_uint_at(buf, pos)
+    dom_content_loaded_event_end, pos = _read_uint_at(buf, pos)
+    load_event_start, pos = _read_uint_at(buf, pos)
+    load_event_end, pos = _read_uint_at(buf, pos)
+    first_paint, pos = _read_uint_at(buf, pos)
+    first_contentful_paint, pos = _read_uint_at(buf, pos)
+    speed_index, pos = _read_uint_at(buf, pos)
+    visually_complete, pos = _read_uint_at(buf, pos)
+    time_to_interactive, pos = _read_uint_at(buf, pos)
+    return (message_id, timestamp, url, referrer, loaded, request_start, response_start, response_end, dom_content_loaded_event_start, dom_content_loaded_event_end, load_event_start, load_event_end, first_paint, first_contentful_paint, speed_index, visually_complete, time_to_interactive), pos
+
+
+def _read_input_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    message_id, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_uint_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    value_masked, pos = _read_boolean_at(buf, pos)
+    label, pos = _read_string_at(buf, pos)
+    return (message_id, timestamp, value, value_masked, label), pos
+
+
+def _read_css_insert_rule_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    rule, pos = _read_string_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    return (id, rule, index), pos
+
+
+def _read_css_delete_rule_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    return (id, index), pos
+
+
+def _read_fetch_row(buf, pos: int) -> Tuple[tuple, int]:
+    method, pos = _read_string_at(buf, pos)
+    url, pos = _read_string_at(buf, pos)
+    request, pos = _read_string_at(buf, pos)
+    response, pos = _read_string_at(buf, pos)
+    status, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_uint_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    return (method, url, request, response, status, timestamp, duration), pos
+
+
+def _read_profiler_row(buf, pos: int) -> Tuple[tuple, int]:
+    name, pos = _read_string_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    args, pos = _read_string_at(buf, pos)
+    result, pos = _read_string_at(buf, pos)
+    return (name, duration, args, result), pos
+
+
+def _read_o_table_row(buf, pos: int) -> Tuple[tuple, int]:
+    key, pos = _read_string_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    return (key, value), pos
+
+
+def _read_state_action_row(buf, pos: int) -> Tuple[tuple, int]:
+    type, pos = _read_string_at(buf, pos)
+    return (type,), pos
+
+
+def _read_redux_row(buf, pos: int) -> Tuple[tuple, int]:
+    action, pos = _read_string_at(buf, pos)
+    state, pos = _read_string_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    return (action, state, duration), pos
+
+
+def _read_vuex_row(buf, pos: int) -> Tuple[tuple, int]:
+    mutation, pos = _read_string_at(buf, pos)
+    state, pos = _read_string_at(buf, pos)
+    return (mutation, state), pos
+
+
+def _read_mob_x_row(buf, pos: int) -> Tuple[tuple, int]:
+    type, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    return (type, payload), pos
+
+
+def _read_ng_rx_row(buf, pos: int) -> Tuple[tuple, int]:
+    action, pos = _read_string_at(buf, pos)
+    state, pos = _read_string_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    return (action, state, duration), pos
+
+
+def _read_graph_ql_row(buf, pos: int) -> Tuple[tuple, int]:
+    operation_kind, pos = _read_string_at(buf, pos)
+    operation_name, pos = _read_string_at(buf, pos)
+    variables, pos = _read_string_at(buf, pos)
+    response, pos = _read_string_at(buf, pos)
+    return (operation_kind, operation_name, variables, response), pos
+
+
+def _read_performance_track_row(buf, pos: int) -> Tuple[tuple, int]:
+    frames, pos = _read_int_at(buf, pos)
+    ticks, pos = _read_int_at(buf, pos)
+    total_js_heap_size, pos = _read_uint_at(buf, pos)
+    used_js_heap_size, pos = _read_uint_at(buf, pos)
+    return (frames, ticks, total_js_heap_size, used_js_heap_size), pos
+
+
+def _read_string_dict_row(buf, pos: int) -> Tuple[tuple, int]:
+    key, pos = _read_uint_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    return (key, value), pos
+
+
+def _read_set_node_attribute_dict_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    name_key, pos = _read_uint_at(buf, pos)
+    value_key, pos = _read_uint_at(buf, pos)
+    return (id, name_key, value_key), pos
+
+
+def _read_resource_timing_deprecated_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    ttfb, pos = _read_uint_at(buf, pos)
+    header_size, pos = _read_uint_at(buf, pos)
+    encoded_body_size, pos = _read_uint_at(buf, pos)
+    decoded_body_size, pos = _read_uint_at(buf, pos)
+    url, pos = _read_string_at(buf, pos)
+    initiator, pos = _read_string_at(buf, pos)
+    return (timestamp, duration, ttfb, header_size, encoded_body_size, decoded_body_size, url, initiator), pos
+
+
+def _read_connection_information_row(buf, pos: int) -> Tuple[tuple, int]:
+    downlink, pos = _read_uint_at(buf, pos)
+    type, pos = _read_string_at(buf, pos)
+    return (downlink, type), pos
+
+
+def _read_set_page_visibility_row(buf, pos: int) -> Tuple[tuple, int]:
+    hidden, pos = _read_boolean_at(buf, pos)
+    return (hidden,), pos
+
+
+def _read_performance_track_aggr_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp_start, pos = _read_uint_at(buf, pos)
+    timestamp_end, pos = _read_uint_at(buf, pos)
+    min_fps, pos = _read_uint_at(buf, pos)
+    avg_fps, pos = _read_uint_at(buf, pos)
+    max_fps, pos = _read_uint_at(buf, pos)
+    min_cpu, pos = _read_uint_at(buf, pos)
+    avg_cpu, pos = _read_uint_at(buf, pos)
+    max_cpu, pos = _read_uint_at(buf, pos)
+    min_total_js_heap_size, pos = _read_uint_at(buf, pos)
+    avg_total_js_heap_size, pos = _read_uint_at(buf, pos)
+    max_total_js_heap_size, pos = _read_uint_at(buf, pos)
+    min_used_js_heap_size, pos = _read_uint_at(buf, pos)
+    avg_used_js_heap_size, pos = _read_uint_at(buf, pos)
+    max_used_js_heap_size, pos = _read_uint_at(buf, pos)
+    return (timestamp_start, timestamp_end, min_fps, avg_fps, max_fps, min_cpu, avg_cpu, max_cpu, min_total_js_heap_size, avg_total_js_heap_size, max_total_js_heap_size, min_used_js_heap_size, avg_used_js_heap_size, max_used_js_heap_size), pos
+
+
+def _read_load_font_face_row(buf, pos: int) -> Tuple[tuple, int]:
+    parent_id, pos = _read_uint_at(buf, pos)
+    family, pos = _read_string_at(buf, pos)
+    source, pos = _read_string_at(buf, pos)
+    descriptors, pos = _read_string_at(buf, pos)
+    return (parent_id, family, source, descriptors), pos
+
+
+def _read_set_node_focus_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_int_at(buf, pos)
+    return (id,), pos
+
+
+def _read_long_task_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    context, pos = _read_uint_at(buf, pos)
+    container_type, pos = _read_uint_at(buf, pos)
+    container_src, pos = _read_string_at(buf, pos)
+    container_id, pos = _read_string_at(buf, pos)
+    container_name, pos = _read_string_at(buf, pos)
+    return (timestamp, duration, context, container_type, container_src, container_id, container_name), pos
+
+
+def _read_set_node_attribute_url_based_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    name, pos = _read_string_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    base_url, pos = _read_string_at(buf, pos)
+    return (id, name, value, base_url), pos
+
+
+def _read_set_css_data_url_based_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    data, pos = _read_string_at(buf, pos)
+    base_url, pos = _read_string_at(buf, pos)
+    return (id, data, base_url), pos
+
+
+def _read_issue_event_deprecated_row(buf, pos: int) -> Tuple[tuple, int]:
+    message_id, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_uint_at(buf, pos)
+    type, pos = _read_string_at(buf, pos)
+    context_string, pos = _read_string_at(buf, pos)
+    context, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    return (message_id, timestamp, type, context_string, context, payload), pos
+
+
+def _read_technical_info_row(buf, pos: int) -> Tuple[tuple, int]:
+    type, pos = _read_string_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    return (type, value), pos
+
+
+def _read_custom_issue_row(buf, pos: int) -> Tuple[tuple, int]:
+    name, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    return (name, payload), pos
+
+
+def _read_asset_cache_row(buf, pos: int) -> Tuple[tuple, int]:
+    url, pos = _read_string_at(buf, pos)
+    return (url,), pos
+
+
+def _read_css_insert_rule_url_based_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    rule, pos = _read_string_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    base_url, pos = _read_string_at(buf, pos)
+    return (id, rule, index, base_url), pos
+
+
+def _read_mouse_click_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    hesitation_time, pos = _read_uint_at(buf, pos)
+    label, pos = _read_string_at(buf, pos)
+    selector, pos = _read_string_at(buf, pos)
+    return (id, hesitation_time, label, selector), pos
+
+
+def _read_create_i_frame_document_row(buf, pos: int) -> Tuple[tuple, int]:
+    frame_id, pos = _read_uint_at(buf, pos)
+    id, pos = _read_uint_at(buf, pos)
+    return (frame_id, id), pos
+
+
+def _read_adopted_ss_replace_url_based_row(buf, pos: int) -> Tuple[tuple, int]:
+    sheet_id, pos = _read_uint_at(buf, pos)
+    text, pos = _read_string_at(buf, pos)
+    base_url, pos = _read_string_at(buf, pos)
+    return (sheet_id, text, base_url), pos
+
+
+def _read_adopted_ss_replace_row(buf, pos: int) -> Tuple[tuple, int]:
+    sheet_id, pos = _read_uint_at(buf, pos)
+    text, pos = _read_string_at(buf, pos)
+    return (sheet_id, text), pos
+
+
+def _read_adopted_ss_insert_rule_url_based_row(buf, pos: int) -> Tuple[tuple, int]:
+    sheet_id, pos = _read_uint_at(buf, pos)
+    rule, pos = _read_string_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    base_url, pos = _read_string_at(buf, pos)
+    return (sheet_id, rule, index, base_url), pos
+
+
+def _read_adopted_ss_insert_rule_row(buf, pos: int) -> Tuple[tuple, int]:
+    sheet_id, pos = _read_uint_at(buf, pos)
+    rule, pos = _read_string_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    return (sheet_id, rule, index), pos
+
+
+def _read_adopted_ss_delete_rule_row(buf, pos: int) -> Tuple[tuple, int]:
+    sheet_id, pos = _read_uint_at(buf, pos)
+    index, pos = _read_uint_at(buf, pos)
+    return (sheet_id, index), pos
+
+
+def _read_adopted_ss_add_owner_row(buf, pos: int) -> Tuple[tuple, int]:
+    sheet_id, pos = _read_uint_at(buf, pos)
+    id, pos = _read_uint_at(buf, pos)
+    return (sheet_id, id), pos
+
+
+def _read_adopted_ss_remove_owner_row(buf, pos: int) -> Tuple[tuple, int]:
+    sheet_id, pos = _read_uint_at(buf, pos)
+    id, pos = _read_uint_at(buf, pos)
+    return (sheet_id, id), pos
+
+
+def _read_js_exception_row(buf, pos: int) -> Tuple[tuple, int]:
+    name, pos = _read_string_at(buf, pos)
+    message, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    metadata, pos = _read_string_at(buf, pos)
+    return (name, message, payload, metadata), pos
+
+
+def _read_zustand_row(buf, pos: int) -> Tuple[tuple, int]:
+    mutation, pos = _read_string_at(buf, pos)
+    state, pos = _read_string_at(buf, pos)
+    return (mutation, state), pos
+
+
+def _read_batch_meta_row(buf, pos: int) -> Tuple[tuple, int]:
+    page_no, pos = _read_uint_at(buf, pos)
+    first_index, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_int_at(buf, pos)
+    return (page_no, first_index, timestamp), pos
+
+
+def _read_batch_metadata_row(buf, pos: int) -> Tuple[tuple, int]:
+    version, pos = _read_uint_at(buf, pos)
+    page_no, pos = _read_uint_at(buf, pos)
+    first_index, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_int_at(buf, pos)
+    location, pos = _read_string_at(buf, pos)
+    return (version, page_no, first_index, timestamp, location), pos
+
+
+def _read_partitioned_message_row(buf, pos: int) -> Tuple[tuple, int]:
+    part_no, pos = _read_uint_at(buf, pos)
+    part_total, pos = _read_uint_at(buf, pos)
+    return (part_no, part_total), pos
+
+
+def _read_network_request_row(buf, pos: int) -> Tuple[tuple, int]:
+    type, pos = _read_string_at(buf, pos)
+    method, pos = _read_string_at(buf, pos)
+    url, pos = _read_string_at(buf, pos)
+    request, pos = _read_string_at(buf, pos)
+    response, pos = _read_string_at(buf, pos)
+    status, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_uint_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    transferred_body_size, pos = _read_uint_at(buf, pos)
+    return (type, method, url, request, response, status, timestamp, duration, transferred_body_size), pos
+
+
+def _read_input_change_row(buf, pos: int) -> Tuple[tuple, int]:
+    id, pos = _read_uint_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    value_masked, pos = _read_boolean_at(buf, pos)
+    label, pos = _read_string_at(buf, pos)
+    hesitation_time, pos = _read_int_at(buf, pos)
+    input_duration, pos = _read_int_at(buf, pos)
+    return (id, value, value_masked, label, hesitation_time, input_duration), pos
+
+
+def _read_selection_change_row(buf, pos: int) -> Tuple[tuple, int]:
+    selection_start, pos = _read_uint_at(buf, pos)
+    selection_end, pos = _read_uint_at(buf, pos)
+    selection, pos = _read_string_at(buf, pos)
+    return (selection_start, selection_end, selection), pos
+
+
+def _read_mouse_thrashing_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    return (timestamp,), pos
+
+
+def _read_unbind_nodes_row(buf, pos: int) -> Tuple[tuple, int]:
+    total_removed_percent, pos = _read_uint_at(buf, pos)
+    return (total_removed_percent,), pos
+
+
+def _read_resource_timing_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    ttfb, pos = _read_uint_at(buf, pos)
+    header_size, pos = _read_uint_at(buf, pos)
+    encoded_body_size, pos = _read_uint_at(buf, pos)
+    decoded_body_size, pos = _read_uint_at(buf, pos)
+    url, pos = _read_string_at(buf, pos)
+    initiator, pos = _read_string_at(buf, pos)
+    transferred_size, pos = _read_uint_at(buf, pos)
+    cached, pos = _read_boolean_at(buf, pos)
+    return (timestamp, duration, ttfb, header_size, encoded_body_size, decoded_body_size, url, initiator, transferred_size, cached), pos
+
+
+def _read_tab_change_row(buf, pos: int) -> Tuple[tuple, int]:
+    tab_id, pos = _read_string_at(buf, pos)
+    return (tab_id,), pos
+
+
+def _read_tab_data_row(buf, pos: int) -> Tuple[tuple, int]:
+    tab_id, pos = _read_string_at(buf, pos)
+    return (tab_id,), pos
+
+
+def _read_issue_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    message_id, pos = _read_uint_at(buf, pos)
+    timestamp, pos = _read_uint_at(buf, pos)
+    type, pos = _read_string_at(buf, pos)
+    context_string, pos = _read_string_at(buf, pos)
+    context, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    url, pos = _read_string_at(buf, pos)
+    return (message_id, timestamp, type, context_string, context, payload, url), pos
+
+
+def _read_session_end_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    encryption_key, pos = _read_string_at(buf, pos)
+    return (timestamp, encryption_key), pos
+
+
+def _read_session_search_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    partition, pos = _read_uint_at(buf, pos)
+    return (timestamp, partition), pos
+
+
+def _read_ios_session_start_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    project_id, pos = _read_uint_at(buf, pos)
+    tracker_version, pos = _read_string_at(buf, pos)
+    rev_id, pos = _read_string_at(buf, pos)
+    user_uuid, pos = _read_string_at(buf, pos)
+    user_os, pos = _read_string_at(buf, pos)
+    user_os_version, pos = _read_string_at(buf, pos)
+    user_device, pos = _read_string_at(buf, pos)
+    user_device_type, pos = _read_string_at(buf, pos)
+    user_country, pos = _read_string_at(buf, pos)
+    return (timestamp, project_id, tracker_version, rev_id, user_uuid, user_os, user_os_version, user_device, user_device_type, user_country), pos
+
+
+def _read_ios_session_end_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    return (timestamp,), pos
+
+
+def _read_ios_metadata_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    key, pos = _read_string_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    return (timestamp, length, key, value), pos
+
+
+def _read_ios_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    name, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    return (timestamp, length, name, payload), pos
+
+
+def _read_ios_user_id_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    id, pos = _read_string_at(buf, pos)
+    return (timestamp, length, id), pos
+
+
+def _read_ios_user_anonymous_id_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    id, pos = _read_string_at(buf, pos)
+    return (timestamp, length, id), pos
+
+
+def _read_ios_screen_changes_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    x, pos = _read_uint_at(buf, pos)
+    y, pos = _read_uint_at(buf, pos)
+    width, pos = _read_uint_at(buf, pos)
+    height, pos = _read_uint_at(buf, pos)
+    return (timestamp, length, x, y, width, height), pos
+
+
+def _read_ios_crash_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    name, pos = _read_string_at(buf, pos)
+    reason, pos = _read_string_at(buf, pos)
+    stacktrace, pos = _read_string_at(buf, pos)
+    return (timestamp, length, name, reason, stacktrace), pos
+
+
+def _read_ios_view_component_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    screen_name, pos = _read_string_at(buf, pos)
+    view_name, pos = _read_string_at(buf, pos)
+    visible, pos = _read_boolean_at(buf, pos)
+    return (timestamp, length, screen_name, view_name, visible), pos
+
+
+def _read_ios_click_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    label, pos = _read_string_at(buf, pos)
+    x, pos = _read_uint_at(buf, pos)
+    y, pos = _read_uint_at(buf, pos)
+    return (timestamp, length, label, x, y), pos
+
+
+def _read_ios_input_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    value, pos = _read_string_at(buf, pos)
+    value_masked, pos = _read_boolean_at(buf, pos)
+    label, pos = _read_string_at(buf, pos)
+    return (timestamp, length, value, value_masked, label), pos
+
+
+def _read_ios_performance_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    name, pos = _read_string_at(buf, pos)
+    value, pos = _read_uint_at(buf, pos)
+    return (timestamp, length, name, value), pos
+
+
+def _read_ios_log_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    severity, pos = _read_string_at(buf, pos)
+    content, pos = _read_string_at(buf, pos)
+    return (timestamp, length, severity, content), pos
+
+
+def _read_ios_internal_error_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    content, pos = _read_string_at(buf, pos)
+    return (timestamp, length, content), pos
+
+
+def _read_ios_network_call_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    type, pos = _read_string_at(buf, pos)
+    method, pos = _read_string_at(buf, pos)
+    url, pos = _read_string_at(buf, pos)
+    request, pos = _read_string_at(buf, pos)
+    response, pos = _read_string_at(buf, pos)
+    status, pos = _read_uint_at(buf, pos)
+    duration, pos = _read_uint_at(buf, pos)
+    return (timestamp, length, type, method, url, request, response, status, duration), pos
+
+
+def _read_ios_swipe_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    label, pos = _read_string_at(buf, pos)
+    x, pos = _read_uint_at(buf, pos)
+    y, pos = _read_uint_at(buf, pos)
+    direction, pos = _read_string_at(buf, pos)
+    return (timestamp, length, label, x, y, direction), pos
+
+
+def _read_ios_batch_meta_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    length, pos = _read_uint_at(buf, pos)
+    first_index, pos = _read_uint_at(buf, pos)
+    return (timestamp, length, first_index), pos
+
+
+def _read_ios_performance_aggregated_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp_start, pos = _read_uint_at(buf, pos)
+    timestamp_end, pos = _read_uint_at(buf, pos)
+    min_fps, pos = _read_uint_at(buf, pos)
+    avg_fps, pos = _read_uint_at(buf, pos)
+    max_fps, pos = _read_uint_at(buf, pos)
+    min_cpu, pos = _read_uint_at(buf, pos)
+    avg_cpu, pos = _read_uint_at(buf, pos)
+    max_cpu, pos = _read_uint_at(buf, pos)
+    min_memory, pos = _read_uint_at(buf, pos)
+    avg_memory, pos = _read_uint_at(buf, pos)
+    max_memory, pos = _read_uint_at(buf, pos)
+    min_battery, pos = _read_uint_at(buf, pos)
+    avg_battery, pos = _read_uint_at(buf, pos)
+    max_battery, pos = _read_uint_at(buf, pos)
+    return (timestamp_start, timestamp_end, min_fps, avg_fps, max_fps, min_cpu, avg_cpu, max_cpu, min_memory, avg_memory, max_memory, min_battery, avg_battery, max_battery), pos
+
+
+def _read_ios_issue_event_row(buf, pos: int) -> Tuple[tuple, int]:
+    timestamp, pos = _read_uint_at(buf, pos)
+    type, pos = _read_string_at(buf, pos)
+    context_string, pos = _read_string_at(buf, pos)
+    context, pos = _read_string_at(buf, pos)
+    payload, pos = _read_string_at(buf, pos)
+    return (timestamp, type, context_string, context, payload), pos
+
+
+COLUMN_NAMES = {
+    0: ('timestamp',),
+    1: ('timestamp', 'project_id', 'tracker_version', 'rev_id', 'user_uuid', 'user_agent', 'user_os', 'user_os_version', 'user_browser', 'user_browser_version', 'user_device', 'user_device_type', 'user_device_memory_size', 'user_device_heap_size', 'user_country', 'user_id'),
+    3: ('timestamp',),
+    4: ('url', 'referrer', 'navigation_start'),
+    5: ('width', 'height'),
+    6: ('x', 'y'),
+    7: (),
+    8: ('id', 'parent_id', 'index', 'tag', 'svg'),
+    9: ('id', 'parent_id', 'index'),
+    10: ('id', 'parent_id', 'index'),
+    11: ('id',),
+    12: ('id', 'name', 'value'),
+    13: ('id', 'name'),
+    14: ('id', 'data'),
+    15: ('id', 'data'),
+    16: ('id', 'x', 'y'),
+    17: ('id', 'label'),
+    18: ('id', 'value', 'mask'),
+    19: ('id', 'checked'),
+    20: ('x', 'y'),
+    21: ('type', 'method', 'url', 'request', 'response', 'status', 'timestamp', 'duration'),
+    22: ('level', 'value'),
+    23: ('request_start', 'response_start', 'response_end', 'dom_content_loaded_event_start', 'dom_content_loaded_event_end', 'load_event_start', 'load_event_end', 'first_paint', 'first_contentful_paint'),
+    24: ('speed_index', 'visually_complete', 'time_to_interactive'),
+    25: ('name', 'message', 'payload'),
+    26: ('timestamp', 'source', 'name', 'message', 'payload'),
+    27: ('name', 'payload'),
+    28: ('id',),
+    29: ('id',),
+    30: ('key', 'value'),
+    31: ('message_id', 'timestamp', 'url', 'referrer', 'loaded', 'request_start', 'response_start', 'response_end', 'dom_content_loaded_event_start', 'dom_content_loaded_event_end', 'load_event_start', 'load_event_end', 'first_paint', 'first_contentful_paint', 'speed_index', 'visually_complete', 'time_to_interactive'),
+    32: ('message_id', 'timestamp', 'value', 'value_masked', 'label'),
+    37: ('id', 'rule', 'index'),
+    38: ('id', 'index'),
+    39: ('method', 'url', 'request', 'response', 'status', 'timestamp', 'duration'),
+    40: ('name', 'duration', 'args', 'result'),
+    41: ('key', 'value'),
+    42: ('type',),
+    44: ('action', 'state', 'duration'),
+    45: ('mutation', 'state'),
+    46: ('type', 'payload'),
+    47: ('action', 'state', 'duration'),
+    48: ('operation_kind', 'operation_name', 'variables', 'response'),
+    49: ('frames', 'ticks', 'total_js_heap_size', 'used_js_heap_size'),
+    50: ('key', 'value'),
+    51: ('id', 'name_key', 'value_key'),
+    53: ('timestamp', 'duration', 'ttfb', 'header_size', 'encoded_body_size', 'decoded_body_size', 'url', 'initiator'),
+    54: ('downlink', 'type'),
+    55: ('hidden',),
+    56: ('timestamp_start', 'timestamp_end', 'min_fps', 'avg_fps', 'max_fps', 'min_cpu', 'avg_cpu', 'max_cpu', 'min_total_js_heap_size', 'avg_total_js_heap_size', 'max_total_js_heap_size', 'min_used_js_heap_size', 'avg_used_js_heap_size', 'max_used_js_heap_size'),
+    57: ('parent_id', 'family', 'source', 'descriptors'),
+    58: ('id',),
+    59: ('timestamp', 'duration', 'context', 'container_type', 'container_src', 'container_id', 'container_name'),
+    60: ('id', 'name', 'value', 'base_url'),
+    61: ('id', 'data', 'base_url'),
+    62: ('message_id', 'timestamp', 'type', 'context_string', 'context', 'payload'),
+    63: ('type', 'value'),
+    64: ('name', 'payload'),
+    66: ('url',),
+    67: ('id', 'rule', 'index', 'base_url'),
+    69: ('id', 'hesitation_time', 'label', 'selector'),
+    70: ('frame_id', 'id'),
+    71: ('sheet_id', 'text', 'base_url'),
+    72: ('sheet_id', 'text'),
+    73: ('sheet_id', 'rule', 'index', 'base_url'),
+    74: ('sheet_id', 'rule', 'index'),
+    75: ('sheet_id', 'index'),
+    76: ('sheet_id', 'id'),
+    77: ('sheet_id', 'id'),
+    78: ('name', 'message', 'payload', 'metadata'),
+    79: ('mutation', 'state'),
+    80: ('page_no', 'first_index', 'timestamp'),
+    81: ('version', 'page_no', 'first_index', 'timestamp', 'location'),
+    82: ('part_no', 'part_total'),
+    83: ('type', 'method', 'url', 'request', 'response', 'status', 'timestamp', 'duration', 'transferred_body_size'),
+    112: ('id', 'value', 'value_masked', 'label', 'hesitation_time', 'input_duration'),
+    113: ('selection_start', 'selection_end', 'selection'),
+    114: ('timestamp',),
+    115: ('total_removed_percent',),
+    116: ('timestamp', 'duration', 'ttfb', 'header_size', 'encoded_body_size', 'decoded_body_size', 'url', 'initiator', 'transferred_size', 'cached'),
+    117: ('tab_id',),
+    118: ('tab_id',),
+    125: ('message_id', 'timestamp', 'type', 'context_string', 'context', 'payload', 'url'),
+    126: ('timestamp', 'encryption_key'),
+    127: ('timestamp', 'partition'),
+    90: ('timestamp', 'project_id', 'tracker_version', 'rev_id', 'user_uuid', 'user_os', 'user_os_version', 'user_device', 'user_device_type', 'user_country'),
+    91: ('timestamp',),
+    92: ('timestamp', 'length', 'key', 'value'),
+    93: ('timestamp', 'length', 'name', 'payload'),
+    94: ('timestamp', 'length', 'id'),
+    95: ('timestamp', 'length', 'id'),
+    96: ('timestamp', 'length', 'x', 'y', 'width', 'height'),
+    97: ('timestamp', 'length', 'name', 'reason', 'stacktrace'),
+    98: ('timestamp', 'length', 'screen_name', 'view_name', 'visible'),
+    100: ('timestamp', 'length', 'label', 'x', 'y'),
+    101: ('timestamp', 'length', 'value', 'value_masked', 'label'),
+    102: ('timestamp', 'length', 'name', 'value'),
+    103: ('timestamp', 'length', 'severity', 'content'),
+    104: ('timestamp', 'length', 'content'),
+    105: ('timestamp', 'length', 'type', 'method', 'url', 'request', 'response', 'status', 'duration'),
+    106: ('timestamp', 'length', 'label', 'x', 'y', 'direction'),
+    107: ('timestamp', 'length', 'first_index'),
+    110: ('timestamp_start', 'timestamp_end', 'min_fps', 'avg_fps', 'max_fps', 'min_cpu', 'avg_cpu', 'max_cpu', 'min_memory', 'avg_memory', 'max_memory', 'min_battery', 'avg_battery', 'max_battery'),
+    111: ('timestamp', 'type', 'context_string', 'context', 'payload'),
+}
+
+ROW_READERS = {
+    0: _read_timestamp_row,
+    1: _read_session_start_row,
+    3: _read_session_end_deprecated_row,
+    4: _read_set_page_location_row,
+    5: _read_set_viewport_size_row,
+    6: _read_set_viewport_scroll_row,
+    7: _read_create_document_row,
+    8: _read_create_element_node_row,
+    9: _read_create_text_node_row,
+    10: _read_move_node_row,
+    11: _read_remove_node_row,
+    12: _read_set_node_attribute_row,
+    13: _read_remove_node_attribute_row,
+    14: _read_set_node_data_row,
+    15: _read_set_css_data_row,
+    16: _read_set_node_scroll_row,
+    17: _read_set_input_target_row,
+    18: _read_set_input_value_row,
+    19: _read_set_input_checked_row,
+    20: _read_mouse_move_row,
+    21: _read_network_request_deprecated_row,
+    22: _read_console_log_row,
+    23: _read_page_load_timing_row,
+    24: _read_page_render_timing_row,
+    25: _read_js_exception_deprecated_row,
+    26: _read_integration_event_row,
+    27: _read_custom_event_row,
+    28: _read_user_id_row,
+    29: _read_user_anonymous_id_row,
+    30: _read_metadata_row,
+    31: _read_page_event_row,
+    32: _read_input_event_row,
+    37: _read_css_insert_rule_row,
+    38: _read_css_delete_rule_row,
+    39: _read_fetch_row,
+    40: _read_profiler_row,
+    41: _read_o_table_row,
+    42: _read_state_action_row,
+    44: _read_redux_row,
+    45: _read_vuex_row,
+    46: _read_mob_x_row,
+    47: _read_ng_rx_row,
+    48: _read_graph_ql_row,
+    49: _read_performance_track_row,
+    50: _read_string_dict_row,
+    51: _read_set_node_attribute_dict_row,
+    53: _read_resource_timing_deprecated_row,
+    54: _read_connection_information_row,
+    55: _read_set_page_visibility_row,
+    56: _read_performance_track_aggr_row,
+    57: _read_load_font_face_row,
+    58: _read_set_node_focus_row,
+    59: _read_long_task_row,
+    60: _read_set_node_attribute_url_based_row,
+    61: _read_set_css_data_url_based_row,
+    62: _read_issue_event_deprecated_row,
+    63: _read_technical_info_row,
+    64: _read_custom_issue_row,
+    66: _read_asset_cache_row,
+    67: _read_css_insert_rule_url_based_row,
+    69: _read_mouse_click_row,
+    70: _read_create_i_frame_document_row,
+    71: _read_adopted_ss_replace_url_based_row,
+    72: _read_adopted_ss_replace_row,
+    73: _read_adopted_ss_insert_rule_url_based_row,
+    74: _read_adopted_ss_insert_rule_row,
+    75: _read_adopted_ss_delete_rule_row,
+    76: _read_adopted_ss_add_owner_row,
+    77: _read_adopted_ss_remove_owner_row,
+    78: _read_js_exception_row,
+    79: _read_zustand_row,
+    80: _read_batch_meta_row,
+    81: _read_batch_metadata_row,
+    82: _read_partitioned_message_row,
+    83: _read_network_request_row,
+    112: _read_input_change_row,
+    113: _read_selection_change_row,
+    114: _read_mouse_thrashing_row,
+    115: _read_unbind_nodes_row,
+    116: _read_resource_timing_row,
+    117: _read_tab_change_row,
+    118: _read_tab_data_row,
+    125: _read_issue_event_row,
+    126: _read_session_end_row,
+    127: _read_session_search_row,
+    90: _read_ios_session_start_row,
+    91: _read_ios_session_end_row,
+    92: _read_ios_metadata_row,
+    93: _read_ios_event_row,
+    94: _read_ios_user_id_row,
+    95: _read_ios_user_anonymous_id_row,
+    96: _read_ios_screen_changes_row,
+    97: _read_ios_crash_row,
+    98: _read_ios_view_component_event_row,
+    100: _read_ios_click_event_row,
+    101: _read_ios_input_event_row,
+    102: _read_ios_performance_event_row,
+    103: _read_ios_log_row,
+    104: _read_ios_internal_error_row,
+    105: _read_ios_network_call_row,
+    106: _read_ios_swipe_event_row,
+    107: _read_ios_batch_meta_row,
+    110: _read_ios_performance_aggregated_row,
+    111: _read_ios_issue_event_row,
+}
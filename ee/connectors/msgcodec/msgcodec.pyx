@@ -14,6 +14,879 @@ cdef class PyMsg:
 
 ctypedef object PyBytesIO
 
+# Offset based primitives over a typed memoryview, used by MessageCodec.decode_columnar.
+# The cursor is advanced in place; reading past the end raises IndexError.
+
+cdef inline bint _read_boolean_at(const unsigned char[:] buf, Py_ssize_t* pos) except? 0:
+    cdef bint b = buf[pos[0]] == 1
+    pos[0] += 1
+    return b
+
+cdef inline unsigned long _read_uint_at(const unsigned char[:] buf, Py_ssize_t* pos) except? 0:
+    cdef unsigned long x = 0
+    cdef unsigned int s = 0
+    cdef int i = 0
+    cdef unsigned long num
+    while True:
+        num = buf[pos[0]]
+        pos[0] += 1
+        if num < 0x80:
+            if i > 9 or (i == 9 and num > 1):
+                raise OverflowError()
+            return x | num << s
+        x |= (num & 0x7f) << s
+        s += 7
+        i += 1
+
+cdef inline unsigned long _read_size_at(const unsigned char[:] buf, Py_ssize_t* pos) except? 0:
+    cdef unsigned long size = buf[pos[0]] | buf[pos[0] + 1] << 8 | buf[pos[0] + 2] << 16
+    pos[0] += 3
+    return size
+
+cdef inline long _read_int_at(const unsigned char[:] buf, Py_ssize_t* pos) except? 0:
+    cdef unsigned long ux = _read_uint_at(buf, pos)
+    cdef long x = <long>(ux >> 1)
+    if ux & 1 != 0:
+        x = - x - 1
+    return x
+
+cdef inline str _read_string_at(const unsigned char[:] buf, Py_ssize_t* pos):
+    cdef Py_ssize_t length = <Py_ssize_t>_read_uint_at(buf, pos)
+    cdef Py_ssize_t start = pos[0]
+    cdef Py_ssize_t end = min(start + length, buf.shape[0])
+    pos[0] = end
+    return bytes(buf[start:end]).decode("utf-8", errors="replace").replace("\x00", "\uFFFD")
+
+cdef tuple _read_row(const unsigned char[:] buf, Py_ssize_t* pos, unsigned long message_id):
+
+    if message_id == 0:
+        timestamp = _read_uint_at(buf, pos)
+        return (timestamp,)
+
+    if message_id == 1:
+        timestamp = _read_uint_at(buf, pos)
+        project_id = _read_uint_at(buf, pos)
+        tracker_version = _read_string_at(buf, pos)
+        rev_id = _read_string_at(buf, pos)
+        user_uuid = _read_string_at(buf, pos)
+        user_agent = _read_string_at(buf, pos)
+        user_os = _read_string_at(buf, pos)
+        user_os_version = _read_string_at(buf, pos)
+        user_browser = _read_string_at(buf, pos)
+        user_browser_version = _read_string_at(buf, pos)
+        user_device = _read_string_at(buf, pos)
+        user_device_type = _read_string_at(buf, pos)
+        user_device_memory_size = _read_uint_at(buf, pos)
+        user_device_heap_size = _read_uint_at(buf, pos)
+        user_country = _read_string_at(buf, pos)
+        user_id = _read_string_at(buf, pos)
+        return (timestamp, project_id, tracker_version, rev_id, user_uuid, user_agent, user_os, user_os_version, user_browser, user_browser_version, user_device, user_device_type, user_device_memory_size, user_device_heap_size, user_country, user_id)
+
+    if message_id == 3:
+        timestamp = _read_uint_at(buf, pos)
+        return (timestamp,)
+
+    if message_id == 4:
+        url = _read_string_at(buf, pos)
+        referrer = _read_string_at(buf, pos)
+        navigation_start = _read_uint_at(buf, pos)
+        return (url, referrer, navigation_start)
+
+    if message_id == 5:
+        width = _read_uint_at(buf, pos)
+        height = _read_uint_at(buf, pos)
+        return (width, height)
+
+    if message_id == 6:
+        x = _read_int_at(buf, pos)
+        y = _read_int_at(buf, pos)
+        return (x, y)
+
+    if message_id == 7:
+        return ()
+
+    if message_id == 8:
+        id = _read_uint_at(buf, pos)
+        parent_id = _read_uint_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        tag = _read_string_at(buf, pos)
+        svg = _read_boolean_at(buf, pos)
+        return (id, parent_id, index, tag, svg)
+
+    if message_id == 9:
+        id = _read_uint_at(buf, pos)
+        parent_id = _read_uint_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        return (id, parent_id, index)
+
+    if message_id == 10:
+        id = _read_uint_at(buf, pos)
+        parent_id = _read_uint_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        return (id, parent_id, index)
+
+    if message_id == 11:
+        id = _read_uint_at(buf, pos)
+        return (id,)
+
+    if message_id == 12:
+        id = _read_uint_at(buf, pos)
+        name = _read_string_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        return (id, name, value)
+
+    if message_id == 13:
+        id = _read_uint_at(buf, pos)
+        name = _read_string_at(buf, pos)
+        return (id, name)
+
+    if message_id == 14:
+        id = _read_uint_at(buf, pos)
+        data = _read_string_at(buf, pos)
+        return (id, data)
+
+    if message_id == 15:
+        id = _read_uint_at(buf, pos)
+        data = _read_string_at(buf, pos)
+        return (id, data)
+
+    if message_id == 16:
+        id = _read_uint_at(buf, pos)
+        x = _read_int_at(buf, pos)
+        y = _read_int_at(buf, pos)
+        return (id, x, y)
+
+    if message_id == 17:
+        id = _read_uint_at(buf, pos)
+        label = _read_string_at(buf, pos)
+        return (id, label)
+
+    if message_id == 18:
+        id = _read_uint_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        mask = _read_int_at(buf, pos)
+        return (id, value, mask)
+
+    if message_id == 19:
+        id = _read_uint_at(buf, pos)
+        checked = _read_boolean_at(buf, pos)
+        return (id, checked)
+
+    if message_id == 20:
+        x = _read_uint_at(buf, pos)
+        y = _read_uint_at(buf, pos)
+        return (x, y)
+
+    if message_id == 21:
+        type = _read_string_at(buf, pos)
+        method = _read_string_at(buf, pos)
+        url = _read_string_at(buf, pos)
+        request = _read_string_at(buf, pos)
+        response = _read_string_at(buf, pos)
+        status = _read_uint_at(buf, pos)
+        timestamp = _read_uint_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        return (type, method, url, request, response, status, timestamp, duration)
+
+    if message_id == 22:
+        level = _read_string_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        return (level, value)
+
+    if message_id == 23:
+        request_start = _read_uint_at(buf, pos)
+        response_start = _read_uint_at(buf, pos)
+        response_end = _read_uint_at(buf, pos)
+        dom_content_loaded_event_start = _read_uint_at(buf, pos)
+        dom_content_loaded_event_end = _read_uint_at(buf, pos)
+        load_event_start = _read_uint_at(buf, pos)
+        load_event_end = _read_uint_at(buf, pos)
+        first_paint = _read_uint_at(buf, pos)
+        first_contentful_paint = _read_uint_at(buf, pos)
+        return (request_start, response_start, response_end, dom_content_loaded_event_start, dom_content_loaded_event_end, load_event_start, load_event_end, first_paint, first_contentful_paint)
+
+    if message_id == 24:
+        speed_index = _read_uint_at(buf, pos)
+        visually_complete = _read_uint_at(buf, pos)
+        time_to_interactive = _read_uint_at(buf, pos)
+        return (speed_index, visually_complete, time_to_interactive)
+
+    if message_id == 25:
+        name = _read_string_at(buf, pos)
+        message = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        return (name, message, payload)
+
+    if message_id == 26:
+        timestamp = _read_uint_at(buf, pos)
+        source = _read_string_at(buf, pos)
+        name = _read_string_at(buf, pos)
+        message = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        return (timestamp, source, name, message, payload)
+
+    if message_id == 27:
+        name = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        return (name, payload)
+
+    if message_id == 28:
+        id = _read_string_at(buf, pos)
+        return (id,)
+
+    if message_id == 29:
+        id = _read_string_at(buf, pos)
+        return (id,)
+
+    if message_id == 30:
+        key = _read_string_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        return (key, value)
+
+    if message_id == 31:
+        message_id = _read_uint_at(buf, pos)
+        timestamp = _read_uint_at(buf, pos)
+        url = _read_string_at(buf, pos)
+        referrer = _read_string_at(buf, pos)
+        loaded = _read_boolean_at(buf, pos)
+        request_start = _read_uint_at(buf, pos)
+        response_start = _read_uint_at(buf, pos)
+        response_end = _read_uint_at(buf, pos)
+        dom_content_loaded_event_start = _read_uint_at(buf, pos)
+        dom_content_loaded_event_end = _read_uint_at(buf, pos)
+        load_event_start = _read_uint_at(buf, pos)
+        load_event_end = _read_uint_at(buf, pos)
+        first_paint = _read_uint_at(buf, pos)
+        first_contentful_paint = _read_uint_at(buf, pos)
+        speed_index = _read_uint_at(buf, pos)
+        visually_complete = _read_uint_at(buf, pos)
+        time_to_interactive = _read_uint_at(buf, pos)
+        return (message_id, timestamp, url, referrer, loaded, request_start, response_start, response_end, dom_content_loaded_event_start, dom_content_loaded_event_end, load_event_start, load_event_end, first_paint, first_contentful_paint, speed_index, visually_complete, time_to_interactive)
+
+    if message_id == 32:
+        message_id = _read_uint_at(buf, pos)
+        timestamp = _read_uint_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        value_masked = _read_boolean_at(buf, pos)
+        label = _read_string_at(buf, pos)
+        return (message_id, timestamp, value, value_masked, label)
+
+    if message_id == 37:
+        id = _read_uint_at(buf, pos)
+        rule = _read_string_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        return (id, rule, index)
+
+    if message_id == 38:
+        id = _read_uint_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        return (id, index)
+
+    if message_id == 39:
+        method = _read_string_at(buf, pos)
+        url = _read_string_at(buf, pos)
+        request = _read_string_at(buf, pos)
+        response = _read_string_at(buf, pos)
+        status = _read_uint_at(buf, pos)
+        timestamp = _read_uint_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        return (method, url, request, response, status, timestamp, duration)
+
+    if message_id == 40:
+        name = _read_string_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        args = _read_string_at(buf, pos)
+        result = _read_string_at(buf, pos)
+        return (name, duration, args, result)
+
+    if message_id == 41:
+        key = _read_string_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        return (key, value)
+
+    if message_id == 42:
+        type = _read_string_at(buf, pos)
+        return (type,)
+
+    if message_id == 44:
+        action = _read_string_at(buf, pos)
+        state = _read_string_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        return (action, state, duration)
+
+    if message_id == 45:
+        mutation = _read_string_at(buf, pos)
+        state = _read_string_at(buf, pos)
+        return (mutation, state)
+
+    if message_id == 46:
+        type = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        return (type, payload)
+
+    if message_id == 47:
+        action = _read_string_at(buf, pos)
+        state = _read_string_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        return (action, state, duration)
+
+    if message_id == 48:
+        operation_kind = _read_string_at(buf, pos)
+        operation_name = _read_string_at(buf, pos)
+        variables = _read_string_at(buf, pos)
+        response = _read_string_at(buf, pos)
+        return (operation_kind, operation_name, variables, response)
+
+    if message_id == 49:
+        frames = _read_int_at(buf, pos)
+        ticks = _read_int_at(buf, pos)
+        total_js_heap_size = _read_uint_at(buf, pos)
+        used_js_heap_size = _read_uint_at(buf, pos)
+        return (frames, ticks, total_js_heap_size, used_js_heap_size)
+
+    if message_id == 50:
+        key = _read_uint_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        return (key, value)
+
+    if message_id == 51:
+        id = _read_uint_at(buf, pos)
+        name_key = _read_uint_at(buf, pos)
+        value_key = _read_uint_at(buf, pos)
+        return (id, name_key, value_key)
+
+    if message_id == 53:
+        timestamp = _read_uint_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        ttfb = _read_uint_at(buf, pos)
+        header_size = _read_uint_at(buf, pos)
+        encoded_body_size = _read_uint_at(buf, pos)
+        decoded_body_size = _read_uint_at(buf, pos)
+        url = _read_string_at(buf, pos)
+        initiator = _read_string_at(buf, pos)
+        return (timestamp, duration, ttfb, header_size, encoded_body_size, decoded_body_size, url, initiator)
+
+    if message_id == 54:
+        downlink = _read_uint_at(buf, pos)
+        type = _read_string_at(buf, pos)
+        return (downlink, type)
+
+    if message_id == 55:
+        hidden = _read_boolean_at(buf, pos)
+        return (hidden,)
+
+    if message_id == 56:
+        timestamp_start = _read_uint_at(buf, pos)
+        timestamp_end = _read_uint_at(buf, pos)
+        min_fps = _read_uint_at(buf, pos)
+        avg_fps = _read_uint_at(buf, pos)
+        max_fps = _read_uint_at(buf, pos)
+        min_cpu = _read_uint_at(buf, pos)
+        avg_cpu = _read_uint_at(buf, pos)
+        max_cpu = _read_uint_at(buf, pos)
+        min_total_js_heap_size = _read_uint_at(buf, pos)
+        avg_total_js_heap_size = _read_uint_at(buf, pos)
+        max_total_js_heap_size = _read_uint_at(buf, pos)
+        min_used_js_heap_size = _read_uint_at(buf, pos)
+        avg_used_js_heap_size = _read_uint_at(buf, pos)
+        max_used_js_heap_size = _read_uint_at(buf, pos)
+        return (timestamp_start, timestamp_end, min_fps, avg_fps, max_fps, min_cpu, avg_cpu, max_cpu, min_total_js_heap_size, avg_total_js_heap_size, max_total_js_heap_size, min_used_js_heap_size, avg_used_js_heap_size, max_used_js_heap_size)
+
+    if message_id == 57:
+        parent_id = _read_uint_at(buf, pos)
+        family = _read_string_at(buf, pos)
+        source = _read_string_at(buf, pos)
+        descriptors = _read_string_at(buf, pos)
+        return (parent_id, family, source, descriptors)
+
+    if message_id == 58:
+        id = _read_int_at(buf, pos)
+        return (id,)
+
+    if message_id == 59:
+        timestamp = _read_uint_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        context = _read_uint_at(buf, pos)
+        container_type = _read_uint_at(buf, pos)
+        container_src = _read_string_at(buf, pos)
+        container_id = _read_string_at(buf, pos)
+        container_name = _read_string_at(buf, pos)
+        return (timestamp, duration, context, container_type, container_src, container_id, container_name)
+
+    if message_id == 60:
+        id = _read_uint_at(buf, pos)
+        name = _read_string_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        base_url = _read_string_at(buf, pos)
+        return (id, name, value, base_url)
+
+    if message_id == 61:
+        id = _read_uint_at(buf, pos)
+        data = _read_string_at(buf, pos)
+        base_url = _read_string_at(buf, pos)
+        return (id, data, base_url)
+
+    if message_id == 62:
+        message_id = _read_uint_at(buf, pos)
+        timestamp = _read_uint_at(buf, pos)
+        type = _read_string_at(buf, pos)
+        context_string = _read_string_at(buf, pos)
+        context = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        return (message_id, timestamp, type, context_string, context, payload)
+
+    if message_id == 63:
+        type = _read_string_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        return (type, value)
+
+    if message_id == 64:
+        name = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        return (name, payload)
+
+    if message_id == 66:
+        url = _read_string_at(buf, pos)
+        return (url,)
+
+    if message_id == 67:
+        id = _read_uint_at(buf, pos)
+        rule = _read_string_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        base_url = _read_string_at(buf, pos)
+        return (id, rule, index, base_url)
+
+    if message_id == 69:
+        id = _read_uint_at(buf, pos)
+        hesitation_time = _read_uint_at(buf, pos)
+        label = _read_string_at(buf, pos)
+        selector = _read_string_at(buf, pos)
+        return (id, hesitation_time, label, selector)
+
+    if message_id == 70:
+        frame_id = _read_uint_at(buf, pos)
+        id = _read_uint_at(buf, pos)
+        return (frame_id, id)
+
+    if message_id == 71:
+        sheet_id = _read_uint_at(buf, pos)
+        text = _read_string_at(buf, pos)
+        base_url = _read_string_at(buf, pos)
+        return (sheet_id, text, base_url)
+
+    if message_id == 72:
+        sheet_id = _read_uint_at(buf, pos)
+        text = _read_string_at(buf, pos)
+        return (sheet_id, text)
+
+    if message_id == 73:
+        sheet_id = _read_uint_at(buf, pos)
+        rule = _read_string_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        base_url = _read_string_at(buf, pos)
+        return (sheet_id, rule, index, base_url)
+
+    if message_id == 74:
+        sheet_id = _read_uint_at(buf, pos)
+        rule = _read_string_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        return (sheet_id, rule, index)
+
+    if message_id == 75:
+        sheet_id = _read_uint_at(buf, pos)
+        index = _read_uint_at(buf, pos)
+        return (sheet_id, index)
+
+    if message_id == 76:
+        sheet_id = _read_uint_at(buf, pos)
+        id = _read_uint_at(buf, pos)
+        return (sheet_id, id)
+
+    if message_id == 77:
+        sheet_id = _read_uint_at(buf, pos)
+        id = _read_uint_at(buf, pos)
+        return (sheet_id, id)
+
+    if message_id == 78:
+        name = _read_string_at(buf, pos)
+        message = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        metadata = _read_string_at(buf, pos)
+        return (name, message, payload, metadata)
+
+    if message_id == 79:
+        mutation = _read_string_at(buf, pos)
+        state = _read_string_at(buf, pos)
+        return (mutation, state)
+
+    if message_id == 80:
+        page_no = _read_uint_at(buf, pos)
+        first_index = _read_uint_at(buf, pos)
+        timestamp = _read_int_at(buf, pos)
+        return (page_no, first_index, timestamp)
+
+    if message_id == 81:
+        version = _read_uint_at(buf, pos)
+        page_no = _read_uint_at(buf, pos)
+        first_index = _read_uint_at(buf, pos)
+        timestamp = _read_int_at(buf, pos)
+        location = _read_string_at(buf, pos)
+        return (version, page_no, first_index, timestamp, location)
+
+    if message_id == 82:
+        part_no = _read_uint_at(buf, pos)
+        part_total = _read_uint_at(buf, pos)
+        return (part_no, part_total)
+
+    if message_id == 83:
+        type = _read_string_at(buf, pos)
+        method = _read_string_at(buf, pos)
+        url = _read_string_at(buf, pos)
+        request = _read_string_at(buf, pos)
+        response = _read_string_at(buf, pos)
+        status = _read_uint_at(buf, pos)
+        timestamp = _read_uint_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        transferred_body_size = _read_uint_at(buf, pos)
+        return (type, method, url, request, response, status, timestamp, duration, transferred_body_size)
+
+    if message_id == 112:
+        id = _read_uint_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        value_masked = _read_boolean_at(buf, pos)
+        label = _read_string_at(buf, pos)
+        hesitation_time = _read_int_at(buf, pos)
+        input_duration = _read_int_at(buf, pos)
+        return (id, value, value_masked, label, hesitation_time, input_duration)
+
+    if message_id == 113:
+        selection_start = _read_uint_at(buf, pos)
+        selection_end = _read_uint_at(buf, pos)
+        selection = _read_string_at(buf, pos)
+        return (selection_start, selection_end, selection)
+
+    if message_id == 114:
+        timestamp = _read_uint_at(buf, pos)
+        return (timestamp,)
+
+    if message_id == 115:
+        total_removed_percent = _read_uint_at(buf, pos)
+        return (total_removed_percent,)
+
+    if message_id == 116:
+        timestamp = _read_uint_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        ttfb = _read_uint_at(buf, pos)
+        header_size = _read_uint_at(buf, pos)
+        encoded_body_size = _read_uint_at(buf, pos)
+        decoded_body_size = _read_uint_at(buf, pos)
+        url = _read_string_at(buf, pos)
+        initiator = _read_string_at(buf, pos)
+        transferred_size = _read_uint_at(buf, pos)
+        cached = _read_boolean_at(buf, pos)
+        return (timestamp, duration, ttfb, header_size, encoded_body_size, decoded_body_size, url, initiator, transferred_size, cached)
+
+    if message_id == 117:
+        tab_id = _read_string_at(buf, pos)
+        return (tab_id,)
+
+    if message_id == 118:
+        tab_id = _read_string_at(buf, pos)
+        return (tab_id,)
+
+    if message_id == 125:
+        message_id = _read_uint_at(buf, pos)
+        timestamp = _read_uint_at(buf, pos)
+        type = _read_string_at(buf, pos)
+        context_string = _read_string_at(buf, pos)
+        context = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        url = _read_string_at(buf, pos)
+        return (message_id, timestamp, type, context_string, context, payload, url)
+
+    if message_id == 126:
+        timestamp = _read_uint_at(buf, pos)
+        encryption_key = _read_string_at(buf, pos)
+        return (timestamp, encryption_key)
+
+    if message_id == 127:
+        timestamp = _read_uint_at(buf, pos)
+        partition = _read_uint_at(buf, pos)
+        return (timestamp, partition)
+
+    if message_id == 90:
+        timestamp = _read_uint_at(buf, pos)
+        project_id = _read_uint_at(buf, pos)
+        tracker_version = _read_string_at(buf, pos)
+        rev_id = _read_string_at(buf, pos)
+        user_uuid = _read_string_at(buf, pos)
+        user_os = _read_string_at(buf, pos)
+        user_os_version = _read_string_at(buf, pos)
+        user_device = _read_string_at(buf, pos)
+        user_device_type = _read_string_at(buf, pos)
+        user_country = _read_string_at(buf, pos)
+        return (timestamp, project_id, tracker_version, rev_id, user_uuid, user_os, user_os_version, user_device, user_device_type, user_country)
+
+    if message_id == 91:
+        timestamp = _read_uint_at(buf, pos)
+        return (timestamp,)
+
+    if message_id == 92:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        key = _read_string_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        return (timestamp, length, key, value)
+
+    if message_id == 93:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        name = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        return (timestamp, length, name, payload)
+
+    if message_id == 94:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        id = _read_string_at(buf, pos)
+        return (timestamp, length, id)
+
+    if message_id == 95:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        id = _read_string_at(buf, pos)
+        return (timestamp, length, id)
+
+    if message_id == 96:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        x = _read_uint_at(buf, pos)
+        y = _read_uint_at(buf, pos)
+        width = _read_uint_at(buf, pos)
+        height = _read_uint_at(buf, pos)
+        return (timestamp, length, x, y, width, height)
+
+    if message_id == 97:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        name = _read_string_at(buf, pos)
+        reason = _read_string_at(buf, pos)
+        stacktrace = _read_string_at(buf, pos)
+        return (timestamp, length, name, reason, stacktrace)
+
+    if message_id == 98:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        screen_name = _read_string_at(buf, pos)
+        view_name = _read_string_at(buf, pos)
+        visible = _read_boolean_at(buf, pos)
+        return (timestamp, length, screen_name, view_name, visible)
+
+    if message_id == 100:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        label = _read_string_at(buf, pos)
+        x = _read_uint_at(buf, pos)
+        y = _read_uint_at(buf, pos)
+        return (timestamp, length, label, x, y)
+
+    if message_id == 101:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        value = _read_string_at(buf, pos)
+        value_masked = _read_boolean_at(buf, pos)
+        label = _read_string_at(buf, pos)
+        return (timestamp, length, value, value_masked, label)
+
+    if message_id == 102:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        name = _read_string_at(buf, pos)
+        value = _read_uint_at(buf, pos)
+        return (timestamp, length, name, value)
+
+    if message_id == 103:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        severity = _read_string_at(buf, pos)
+        content = _read_string_at(buf, pos)
+        return (timestamp, length, severity, content)
+
+    if message_id == 104:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        content = _read_string_at(buf, pos)
+        return (timestamp, length, content)
+
+    if message_id == 105:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        type = _read_string_at(buf, pos)
+        method = _read_string_at(buf, pos)
+        url = _read_string_at(buf, pos)
+        request = _read_string_at(buf, pos)
+        response = _read_string_at(buf, pos)
+        status = _read_uint_at(buf, pos)
+        duration = _read_uint_at(buf, pos)
+        return (timestamp, length, type, method, url, request, response, status, duration)
+
+    if message_id == 106:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        label = _read_string_at(buf, pos)
+        x = _read_uint_at(buf, pos)
+        y = _read_uint_at(buf, pos)
+        direction = _read_string_at(buf, pos)
+        return (timestamp, length, label, x, y, direction)
+
+    if message_id == 107:
+        timestamp = _read_uint_at(buf, pos)
+        length = _read_uint_at(buf, pos)
+        first_index = _read_uint_at(buf, pos)
+        return (timestamp, length, first_index)
+
+    if message_id == 110:
+        timestamp_start = _read_uint_at(buf, pos)
+        timestamp_end = _read_uint_at(buf, pos)
+        min_fps = _read_uint_at(buf, pos)
+        avg_fps = _read_uint_at(buf, pos)
+        max_fps = _read_uint_at(buf, pos)
+        min_cpu = _read_uint_at(buf, pos)
+        avg_cpu = _read_uint_at(buf, pos)
+        max_cpu = _read_uint_at(buf, pos)
+        min_memory = _read_uint_at(buf, pos)
+        avg_memory = _read_uint_at(buf, pos)
+        max_memory = _read_uint_at(buf, pos)
+        min_battery = _read_uint_at(buf, pos)
+        avg_battery = _read_uint_at(buf, pos)
+        max_battery = _read_uint_at(buf, pos)
+        return (timestamp_start, timestamp_end, min_fps, avg_fps, max_fps, min_cpu, avg_cpu, max_cpu, min_memory, avg_memory, max_memory, min_battery, avg_battery, max_battery)
+
+    if message_id == 111:
+        timestamp = _read_uint_at(buf, pos)
+        type = _read_string_at(buf, pos)
+        context_string = _read_string_at(buf, pos)
+        context = _read_string_at(buf, pos)
+        payload = _read_string_at(buf, pos)
+        return (timestamp, type, context_string, context, payload)
+
+    raise KeyError(message_id)
+
+COLUMN_NAMES = {
+    0: ('timestamp',),
+    1: ('timestamp', 'project_id', 'tracker_version', 'rev_id', 'user_uuid', 'user_agent', 'user_os', 'user_os_version', 'user_browser', 'user_browser_version', 'user_device', 'user_device_type', 'user_device_memory_size', 'user_device_heap_size', 'user_country', 'user_id'),
+    3: ('timestamp',),
+    4: ('url', 'referrer', 'navigation_start'),
+    5: ('width', 'height'),
+    6: ('x', 'y'),
+    7: (),
+    8: ('id', 'parent_id', 'index', 'tag', 'svg'),
+    9: ('id', 'parent_id', 'index'),
+    10: ('id', 'parent_id', 'index'),
+    11: ('id',),
+    12: ('id', 'name', 'value'),
+    13: ('id', 'name'),
+    14: ('id', 'data'),
+    15: ('id', 'data'),
+    16: ('id', 'x', 'y'),
+    17: ('id', 'label'),
+    18: ('id', 'value', 'mask'),
+    19: ('id', 'checked'),
+    20: ('x', 'y'),
+    21: ('type', 'method', 'url', 'request', 'response', 'status', 'timestamp', 'duration'),
+    22: ('level', 'value'),
+    23: ('request_start', 'response_start', 'response_end', 'dom_content_loaded_event_start', 'dom_content_loaded_event_end', 'load_event_start', 'load_event_end', 'first_paint', 'first_contentful_paint'),
+    24: ('speed_index', 'visually_complete', 'time_to_interactive'),
+    25: ('name', 'message', 'payload'),
+    26: ('timestamp', 'source', 'name', 'message', 'payload'),
+    27: ('name', 'payload'),
+    28: ('id',),
+    29: ('id',),
+    30: ('key', 'value'),
+    31: ('message_id', 'timestamp', 'url', 'referrer', 'loaded', 'request_start', 'response_start', 'response_end', 'dom_content_loaded_event_start', 'dom_content_loaded_event_end', 'load_event_start', 'load_event_end', 'first_paint', 'first_contentful_paint', 'speed_index', 'visually_complete', 'time_to_interactive'),
+    32: ('message_id', 'timestamp', 'value', 'value_masked', 'label'),
+    37: ('id', 'rule', 'index'),
+    38: ('id', 'index'),
+    39: ('method', 'url', 'request', 'response', 'status', 'timestamp', 'duration'),
+    40: ('name', 'duration', 'args', 'result'),
+    41: ('key', 'value'),
+    42: ('type',),
+    44: ('action', 'state', 'duration'),
+    45: ('mutation', 'state'),
+    46: ('type', 'payload'),
+    47: ('action', 'state', 'duration'),
+    48: ('operation_kind', 'operation_name', 'variables', 'response'),
+    49: ('frames', 'ticks', 'total_js_heap_size', 'used_js_heap_size'),
+    50: ('key', 'value'),
+    51: ('id', 'name_key', 'value_key'),
+    53: ('timestamp', 'duration', 'ttfb', 'header_size', 'encoded_body_size', 'decoded_body_size', 'url', 'initiator'),
+    54: ('downlink', 'type'),
+    55: ('hidden',),
+    56: ('timestamp_start', 'timestamp_end', 'min_fps', 'avg_fps', 'max_fps', 'min_cpu', 'avg_cpu', 'max_cpu', 'min_total_js_heap_size', 'avg_total_js_heap_size', 'max_total_js_heap_size', 'min_used_js_heap_size', 'avg_used_js_heap_size', 'max_used_js_heap_size'),
+    57: ('parent_id', 'family', 'source', 'descriptors'),
+    58: ('id',),
+    59: ('timestamp', 'duration', 'context', 'container_type', 'container_src', 'container_id', 'container_name'),
+    60: ('id', 'name', 'value', 'base_url'),
+    61: ('id', 'data', 'base_url'),
+    62: ('message_id', 'timestamp', 'type', 'context_string', 'context', 'payload'),
+    63: ('type', 'value'),
+    64: ('name', 'payload'),
+    66: ('url',),
+    67: ('id', 'rule', 'index', 'base_url'),
+    69: ('id', 'hesitation_time', 'label', 'selector'),
+    70: ('frame_id', 'id'),
+    71: ('sheet_id', 'text', 'base_url'),
+    72: ('sheet_id', 'text'),
+    73: ('sheet_id', 'rule', 'index', 'base_url'),
+    74: ('sheet_id', 'rule', 'index'),
+    75: ('sheet_id', 'index'),
+    76: ('sheet_id', 'id'),
+    77: ('sheet_id', 'id'),
+    78: ('name', 'message', 'payload', 'metadata'),
+    79: ('mutation', 'state'),
+    80: ('page_no', 'first_index', 'timestamp'),
+    81: ('version', 'page_no', 'first_index', 'timestamp', 'location'),
+    82: ('part_no', 'part_total'),
+    83: ('type', 'method', 'url', 'request', 'response', 'status', 'timestamp', 'duration', 'transferred_body_size'),
+    112: ('id', 'value', 'value_masked', 'label', 'hesitation_time', 'input_duration'),
+    113: ('selection_start', 'selection_end', 'selection'),
+    114: ('timestamp',),
+    115: ('total_removed_percent',),
+    116: ('timestamp', 'duration', 'ttfb', 'header_size', 'encoded_body_size', 'decoded_body_size', 'url', 'initiator', 'transferred_size', 'cached'),
+    117: ('tab_id',),
+    118: ('tab_id',),
+    125: ('message_id', 'timestamp', 'type', 'context_string', 'context', 'payload', 'url'),
+    126: ('timestamp', 'encryption_key'),
+    127: ('timestamp', 'partition'),
+    90: ('timestamp', 'project_id', 'tracker_version', 'rev_id', 'user_uuid', 'user_os', 'user_os_version', 'user_device', 'user_device_type', 'user_country'),
+    91: ('timestamp',),
+    92: ('timestamp', 'length', 'key', 'value'),
+    93: ('timestamp', 'length', 'name', 'payload'),
+    94: ('timestamp', 'length', 'id'),
+    95: ('timestamp', 'length', 'id'),
+    96: ('timestamp', 'length', 'x', 'y', 'width', 'height'),
+    97: ('timestamp', 'length', 'name', 'reason', 'stacktrace'),
+    98: ('timestamp', 'length', 'screen_name', 'view_name', 'visible'),
+    100: ('timestamp', 'length', 'label', 'x', 'y'),
+    101: ('timestamp', 'length', 'value', 'value_masked', 'label'),
+    102: ('timestamp', 'length', 'name', 'value'),
+    103: ('timestamp', 'length', 'severity', 'content'),
+    104: ('timestamp', 'length', 'content'),
+    105: ('timestamp', 'length', 'type', 'method', 'url', 'request', 'response', 'status', 'duration'),
+    106: ('timestamp', 'length', 'label', 'x', 'y', 'direction'),
+    107: ('timestamp', 'length', 'first_index'),
+    110: ('timestamp_start', 'timestamp_end', 'min_fps', 'avg_fps', 'max_fps', 'min_cpu', 'avg_cpu', 'max_cpu', 'min_memory', 'avg_memory', 'max_memory', 'min_battery', 'avg_battery', 'max_battery'),
+    111: ('timestamp', 'type', 'context_string', 'context', 'payload'),
+}
+
+cdef void _append_row(dict columns, unsigned long message_id, tuple row):
+    cdef dict message_columns = columns.get(message_id)
+    if message_columns is None:
+        message_columns = {name: list() for name in COLUMN_NAMES[message_id]}
+        columns[message_id] = message_columns
+    for column, value in zip(message_columns.values(), row):
+        (<list>column).append(value)
+
 cdef class MessageCodec:
     """
     Implements encode/decode primitives
@@ -172,6 +1045,52 @@ cdef class MessageCodec:
                 break
         return messages_list
 
+    def decode_columnar(self, b):
+        """
+        Decode a whole batch into column lists grouped by message id: {message_id: {attribute: [values]}}.
+        Works over a memoryview with an offset cursor (no BytesIO) and, in the length-prefixed format,
+        skips messages outside msg_selector by their size without decoding them.
+        Returns the same messages as decode_detailed, transposed.
+        """
+        cdef const unsigned char[:] buf = b
+        cdef Py_ssize_t pos = 0
+        cdef Py_ssize_t end = buf.shape[0]
+        cdef unsigned long message_id
+        cdef unsigned long r_size
+        cdef int mode
+        cdef tuple row
+        cdef dict columns = dict()
+        cdef set msg_selector
+        try:
+            message_id = _read_uint_at(buf, &pos)
+            row = _read_row(buf, &pos, message_id)
+        except (IndexError, KeyError):
+            print('[WARN] Broken batch')
+            return columns
+        _append_row(columns, message_id, row)
+        if message_id == 80:
+            # Old BatchMeta
+            mode = 0
+        elif message_id == 81:
+            # New BatchMeta
+            mode = 0 if row[0] == 0 else 1
+        else:
+            return columns
+        msg_selector = set(self.msg_selector)
+        while pos < end:
+            try:
+                message_id = _read_uint_at(buf, &pos)
+                if mode == 1:
+                    r_size = _read_size_at(buf, &pos)
+                    if message_id not in msg_selector:
+                        pos += r_size
+                        continue
+                row = _read_row(buf, &pos, message_id)
+            except (IndexError, KeyError):
+                break
+            _append_row(columns, message_id, row)
+        return columns
+
     def handler(self, PyBytesIO reader, int mode = 0):
         cdef unsigned long message_id = MessageCodec.read_message_id(reader)
         cdef int r_size
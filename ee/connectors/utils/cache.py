@@ -1,21 +1,133 @@
 from utils.pg_client import PostgresClient
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from decouple import config
 from time import time
 import json
 
 
-def _project_from_session(sessionId):
-    """Search projectId of requested sessionId in PG table sessions"""
+def _projects_from_sessions(sessionIds: list[int]) -> dict:
+    """Search projectId of requested sessionIds in PG table sessions, in a single query"""
     with PostgresClient() as conn:
-         conn.execute(
-                 conn.mogrify("SELECT project_id FROM sessions WHERE session_id=%(sessionId)s LIMIT 1",
-                             {'sessionId': sessionId})
-                 )
-         res = conn.fetchone()
-    if res is None:
-        print(f'[WARN] sessionid {sessionId} not found in sessions table')
-        return None
-    return res['project_id']
+        conn.execute("SELECT session_id, project_id FROM sessions WHERE session_id = ANY(%(sessionIds)s)",
+                     {'sessionIds': sessionIds})
+        res = conn.fetchall()
+    return {row['session_id']: row['project_id'] for row in res}
+
+
+class TTLCache:
+
+    def __init__(self, ttl: int, max_size: int, sliding: bool = True):
+        """Bounded cache whose entries expire ttl seconds after being set (or last read if sliding).
+        Entries are kept ordered by that time, so expiring and evicting the least recently used entries
+        when max_size is reached only pops from the front."""
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sliding = sliding
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Returns (found, value)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, None
+        current_time = time()
+        if current_time - entry[0] > self.ttl:
+            del self.entries[key]
+            return False, None
+        if self.sliding:
+            self.entries[key] = (current_time, entry[1])
+            self.entries.move_to_end(key)
+        return True, entry[1]
+
+    def set(self, key, value):
+        self.entries[key] = (time(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def expire(self):
+        """Deletes the entries that reached ttl"""
+        limit = time() - self.ttl
+        while self.entries:
+            key, (timestamp, _) = next(iter(self.entries.items()))
+            if timestamp > limit:
+                break
+            del self.entries[key]
+
+    def items(self):
+        return [(key, value) for key, (_, value) in self.entries.items()]
+
+
+class ProjectLookup:
+
+    def __init__(self):
+        """Cached sessionId -> projectId lookups. Unknown sessions are resolved with one query per batch, which can
+        be started in background (prefetch) while messages are still being read. Sessions not found in PG are
+        cached as well, for a shorter time since their row can be inserted later.
+        env:
+            PROJECT_CACHE_TTL: lifetime of a cached project since its last use (default 900 seconds)
+            PROJECT_CACHE_SIZE: max number of cached sessions (default 200000)
+            PROJECT_MISS_TTL: lifetime of a session not found in PG (default 60 seconds)"""
+        max_size = config('PROJECT_CACHE_SIZE', default=200000, cast=int)
+        self.projects = TTLCache(config('PROJECT_CACHE_TTL', default=900, cast=int), max_size)
+        self.missing = TTLCache(config('PROJECT_MISS_TTL', default=60, cast=int), max_size, sliding=False)
+        self.executor = None
+        self.pending = list()
+
+    def cached(self, sessionId: int):
+        """Returns (found, projectId), projectId is None for sessions not found in PG"""
+        found, projectId = self.projects.get(sessionId)
+        if found:
+            return True, projectId
+        found, _ = self.missing.get(sessionId)
+        return found, None
+
+    def store(self, projects: dict):
+        for sessionId, projectId in projects.items():
+            self.projects.set(sessionId, projectId)
+
+    def _store_fetched(self, sessionIds: list[int], projects: dict):
+        self.store(projects)
+        for sessionId in sessionIds:
+            if sessionId not in projects:
+                self.missing.set(sessionId, None)
+
+    def prefetch(self, sessionIds: list[int]):
+        """Starts the lookup of sessionIds in background, results are stored on the next call to lookup"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending.append((sessionIds, self.executor.submit(_projects_from_sessions, sessionIds)))
+
+    def lookup(self, sessionIds: list[int]) -> dict:
+        """Returns the projectId (or None if not found) of each sessionId, querying PG only for the uncached ones"""
+        while self.pending:
+            fetched_ids, future = self.pending.pop()
+            try:
+                self._store_fetched(fetched_ids, future.result())
+            except Exception as e:
+                print('[WARN] Error while prefetching projects', repr(e))
+        response = dict()
+        unknown = list()
+        for sessionId in set(sessionIds):
+            found, projectId = self.cached(sessionId)
+            if found:
+                response[sessionId] = projectId
+            else:
+                unknown.append(sessionId)
+        if unknown:
+            projects = _projects_from_sessions(unknown)
+            self._store_fetched(unknown, projects)
+            for sessionId in unknown:
+                response[sessionId] = projects.get(sessionId)
+        return response
+
+    def expire(self):
+        self.projects.expire()
+        self.missing.expire()
 
 
 class CachedSessions:
@@ -65,57 +177,43 @@ class CachedSessions:
 class ProjectFilter:
 
     def __init__(self, filter=list()):
-        """Filters all sessions that comes from selected projects. This class reads from PG to find projectId and uses cache to avoid duplicated requests.
-        env:
-            max_cache_size: max allowed cache lenght - starts cleanup when oversize
-            cache_lifespan: max lifetime of cached - if surpased it is deleted in cleanup phase"""
+        """Filters all sessions that comes from selected projects. This class reads from PG to find projectId and uses
+        a ProjectLookup cache to avoid duplicated requests."""
         self.filter = filter
-        self.cache = dict()
+        self.projects = ProjectLookup()
         self.cached_sessions = CachedSessions()
         self.to_clean = list()
         self.count_bad = 0
-        self.max_cache_size = config('max_cache_size', default=50, cast=int)
-        self.cache_lifespan = config('cache_lifespan', default=900, cast=int)
 
     def is_valid(self, sessionId):
         """Verify if sessionId is from selected project"""
         if len(self.filter)==0:
             return True
-        elif sessionId in self.cache.keys():
-            return self.cache[sessionId][1]
-        else:
-            found_project_id = _project_from_session(sessionId)
-            if found_project_id is None:
+        found, project_id = self.projects.cached(sessionId)
+        if not found:
+            project_id = self.projects.lookup([sessionId])[sessionId]
+            if project_id is None:
                 self.count_bad += 1
-                return False
-            else:
-                project_is_valid = found_project_id in self.filter
-                self.cache[sessionId] = [time(), project_is_valid]
-                return project_is_valid
-
-    def cleanup(self):
-        """Deletes cache when reached cache_lifespan value"""
-        current_time = time()
-        self.cache = {sessionid: values for sessionid, values in self.cache.items() if current_time - values[0] < self.cache_lifespan}
+        return project_id is not None and project_id in self.filter
 
     def handle_clean(self):
-        """Verifies and execute cleanup if needed"""
+        """Deletes the expired cached projects"""
         if len(self.filter) == 0:
             return
-        elif len(self.cache) > self.max_cache_size:
-            self.cleanup()
+        self.projects.expire()
 
     def load_checkpoint(self, db):
         file = db.load_binary(name='checkpoint')
         checkpoint = json.loads(file.getvalue().decode('utf-8'))
         file.close()
-        self.cache = checkpoint['cache']
+        if 'projects' in checkpoint.keys():
+            self.projects.store({sessionId: projectId for sessionId, projectId in checkpoint['projects']})
         self.to_clean = checkpoint['to_clean']
         self.cached_sessions.session_project = checkpoint['cached_sessions']
 
     def save_checkpoint(self, db):
         checkpoint = {
-            'cache': self.cache,
+            'projects': self.projects.projects.items(),
             'to_clean': self.to_clean,
             'cached_sessions': self.cached_sessions.session_project,
         }
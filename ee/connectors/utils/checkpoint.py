@@ -0,0 +1,74 @@
+import msgpack
+from decouple import config
+
+
+class IncrementalCheckpoint:
+    """Incremental checkpoint stored through DBConnection.save_binary, encoded with msgpack.
+    A checkpoint is a full base snapshot plus an append-only log of delta objects (one per save).
+    Every CHECKPOINT_COMPACTION deltas the state is compacted into a new base with the next generation
+    number, so deltas left by an interrupted compaction are never replayed over a newer base.
+    env:
+        CHECKPOINT_COMPACTION: number of deltas written between two full snapshots (default 20)"""
+    base_name = 'checkpoint_v2'
+
+    def __init__(self, database_api):
+        self.database_api = database_api
+        self.compaction_rate = config('CHECKPOINT_COMPACTION', default=20, cast=int)
+        self.generation = 0
+        self.n_deltas = 0
+        self.needs_base = True
+
+    def delta_name(self, generation: int, index: int):
+        return f'{self.base_name}_{generation}_delta_{index}'
+
+    @staticmethod
+    def encode(state: dict) -> bytes:
+        return msgpack.packb(state, use_bin_type=True)
+
+    @staticmethod
+    def decode(binary_data: bytes) -> dict:
+        return msgpack.unpackb(binary_data, raw=False, strict_map_key=False)
+
+    def _load(self, name: str):
+        file = self.database_api.load_binary(name=name)
+        if file is None:
+            return None
+        state = self.decode(file.getvalue())
+        file.close()
+        return state
+
+    def needs_compaction(self) -> bool:
+        return self.needs_base or self.n_deltas >= self.compaction_rate
+
+    def save_base(self, state: dict):
+        """Writes a full snapshot as a new generation and drops the deltas of the previous one"""
+        old_generation, old_deltas = self.generation, self.n_deltas
+        self.generation += 1
+        state['generation'] = self.generation
+        self.database_api.save_binary(binary_data=self.encode(state), name=self.base_name)
+        for index in range(old_deltas):
+            self.database_api.delete_binary(name=self.delta_name(old_generation, index))
+        self.n_deltas = 0
+        self.needs_base = False
+
+    def save_delta(self, delta: dict):
+        self.database_api.save_binary(binary_data=self.encode(delta),
+                                      name=self.delta_name(self.generation, self.n_deltas))
+        self.n_deltas += 1
+
+    def load(self):
+        """Returns (base, [deltas in order]) or None if there is no checkpoint in this format"""
+        base = self._load(self.base_name)
+        if base is None:
+            return None
+        self.generation = base['generation']
+        deltas = list()
+        while True:
+            delta = self._load(self.delta_name(self.generation, len(deltas)))
+            if delta is None:
+                break
+            deltas.append(delta)
+        self.n_deltas = len(deltas)
+        # The next save compacts the recovered state into a new base
+        self.needs_base = True
+        return base, deltas
@@ -0,0 +1,51 @@
+from multiprocessing.shared_memory import SharedMemory
+from decouple import config
+
+
+class SharedRingBuffer:
+    """Ring of fixed size slots in a shared memory block, used to hand raw kafka payloads from the reader
+    process to the decoder processes. The reader fills one slot per read cycle and only (offset, length)
+    references cross the pipes; the slot is reused n_slots cycles later, once the decoders are done with it.
+    Payloads that do not fit in the current slot are returned as None and must be sent inline.
+    The block has to be created before the reader and decoder processes are forked.
+    env:
+        SHARED_BUFFER_MB: total size of the shared memory block in MB (default 48, bounded by /dev/shm)
+        SHARED_BUFFER_SLOTS: number of slots in the ring (default 2, at least 2: with a single slot the reader
+            would overwrite the payloads of the previous cycle while the decoders are still reading them)"""
+
+    def __init__(self, size: int = None, n_slots: int = None):
+        if size is None:
+            size = config('SHARED_BUFFER_MB', default=48, cast=int) * 1024 * 1024
+        if n_slots is None:
+            n_slots = config('SHARED_BUFFER_SLOTS', default=2, cast=int)
+        if n_slots < 2:
+            raise ValueError(f'SHARED_BUFFER_SLOTS must be at least 2, got {n_slots}')
+        self.n_slots = n_slots
+        self.slot_size = size // n_slots
+        self.shm = SharedMemory(create=True, size=self.slot_size * n_slots)
+        self.buf = self.shm.buf
+        self.slot = 0
+        self.position = 0
+
+    def next_slot(self):
+        """Moves the writer to the next slot of the ring, dropping its previous content"""
+        self.slot = (self.slot + 1) % self.n_slots
+        self.position = 0
+
+    def write(self, payload: bytes):
+        length = len(payload)
+        if self.position + length > self.slot_size:
+            return None
+        offset = self.slot * self.slot_size + self.position
+        self.buf[offset:offset + length] = payload
+        self.position += length
+        return offset, length
+
+    def read(self, offset: int, length: int) -> bytes:
+        return bytes(self.buf[offset:offset + length])
+
+    def close(self, unlink: bool = False):
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
@@ -4,9 +4,12 @@ from db.api import DBConnection
 from msgcodec import MessageCodec
 from messages import SessionEnd
 from utils.uploader import insertBatch
-from utils.cache import CachedSessions
-from db.models import DetailedEvent, Event, Session, events_detailed_table_name, events_table_name, sessions_table_name
-from handler import handle_normal_message, handle_message, handle_session
+from utils.cache import CachedSessions, ProjectLookup
+from utils.checkpoint import IncrementalCheckpoint
+from utils.shared_buffer import SharedRingBuffer
+from db.models import Session, events_detailed_table_name, events_table_name, sessions_table_name
+from db.utils import EventsColumns
+from handler import append_event_columns, handle_session
 from datetime import datetime
 from decouple import config
 from utils import pg_client
@@ -46,6 +49,7 @@ elif EVENT_TYPE == 'detailed':
 allowed_messages = list(set(session_messages + events_messages))
 codec = MessageCodec(allowed_messages)
 max_kafka_read = config('MAX_KAFKA_READ', default=60000, cast=int)
+prefetch_size = config('PROJECT_PREFETCH_SIZE', default=1000, cast=int)
 
 
 def init_consumer():
@@ -61,7 +65,8 @@ def close_consumer(consumer):
 
 
 def session_to_dict(sess: Session):
-    _dict = sess.__dict__
+    # Copy, the session objects are kept alive between loops by the decoders
+    _dict = sess.__dict__.copy()
     try:
         del _dict['_sa_instance_state']
     except KeyError:
@@ -75,88 +80,68 @@ def dict_to_session(session_dict: dict):
     return n
 
 
-def event_to_dict(event: Event | DetailedEvent):
-    _dict = event.__dict__
-    try:
-        del _dict['_sa_instance_state']
-    except KeyError:
-        ...
-    return _dict
-
-
-def dict_to_event(event_dict: dict):
+def events_from_rows(rows: list[dict]) -> EventsColumns:
+    """Builds a columnar events batch from a list of event dicts (checkpoints before v1.2)"""
     global EVENT_TYPE
-    if EVENT_TYPE == 'detailed':
-        n = DetailedEvent()
-    else:
-        n = Event()
-    n.__dict__ |= event_dict
-    return n
+    batch = EventsColumns(EVENT_TYPE)
+    for row in rows:
+        batch.append(row.get('sessionid'), row.get('received_at'),
+                     [(column, row.get(column)) for column in batch.columns
+                      if column not in ('sessionid', 'received_at', 'batch_order_number')])
+    return batch
 
 class ProjectFilter:
     def __init__(self, project_filter):
-        self.max_lifespan = config('MAX_UNWANTED_SESSION_LIFE', default=7800, cast=int)
-        self.project_filter = project_filter
+        self.project_filter = set(project_filter)
         self.sessions_lifespan = CachedSessions()
-        self.non_valid_sessions_cache = dict()
+        self.projects = ProjectLookup()
 
     def is_valid(self, sessionId: int):
         if len(self.project_filter) == 0:
             return True
-        elif sessionId in self.sessions_lifespan.session_project.keys():
-            return True
-        elif sessionId in self.non_valid_sessions_cache.keys():
-            return False
-        else:
-            projectId = project_from_session(sessionId)
-            if projectId not in self.project_filter:
-                self.non_valid_sessions_cache[sessionId] = int(datetime.now().timestamp())
-                return False
-            else:
-                return True
+        found, projectId = self.projects.cached(sessionId)
+        if not found:
+            projectId = self.projects.lookup([sessionId])[sessionId]
+        return projectId in self.project_filter
 
     def already_checked(self, sessionId):
         if len(self.project_filter) == 0:
             return True, True
-        elif sessionId in self.sessions_lifespan.session_project.keys():
-            return True, True
-        elif sessionId in self.non_valid_sessions_cache.keys():
-            return True, False
+        found, projectId = self.projects.cached(sessionId)
+        if found:
+            return True, projectId in self.project_filter
         else:
             return False, None
 
+    def prefetch(self, sessionIds: list[int]):
+        if len(self.project_filter) != 0:
+            self.projects.prefetch(sessionIds)
+
     def are_valid(self, sessionIds: list[int]):
-        valid_sessions = list()
         if len(self.project_filter) == 0:
             return sessionIds
-        projects_session = project_from_sessions(list(set(sessionIds)))
-        current_datetime = int(datetime.now().timestamp())
-        for projectId, sessionId in projects_session:
-            if projectId not in self.project_filter:
-                self.non_valid_sessions_cache[sessionId] = current_datetime
-            else:
-                valid_sessions.append(sessionId)
-        return valid_sessions
+        projects = self.projects.lookup(sessionIds)
+        return [sessionId for sessionId, projectId in projects.items() if projectId in self.project_filter]
 
     def handle_clean(self):
         if len(self.project_filter) == 0:
             return
         else:
-            current_timestamp = datetime.now().timestamp()
-            self.non_valid_sessions_cache = {sessionId: start_timestamp for sessionId, start_timestamp in
-                                             self.non_valid_sessions_cache.items() if
-                                             self.max_lifespan > current_timestamp - start_timestamp}
+            self.projects.expire()
 
 
 def read_from_kafka(pipe: Connection, params: dict):
-    global UPLOAD_RATE, max_kafka_read
+    global UPLOAD_RATE, max_kafka_read, prefetch_size
     # try:
     asyncio.run(pg_client.init())
     kafka_consumer = init_consumer()
     project_filter = params['project_filter']
+    ring = params['ring']
     capture_messages = list()
     capture_sessions = list()
     while True:
+        requested_sessions = set()
+        to_prefetch = list()
         to_decode = list()
         sessionIds = list()
         start_time = datetime.now().timestamp()
@@ -179,31 +164,40 @@ def read_from_kafka(pipe: Connection, params: dict):
             if not checked:
                 capture_sessions.append(sessionId)
                 capture_messages.append(msg.value())
+                if sessionId not in requested_sessions:
+                    requested_sessions.add(sessionId)
+                    to_prefetch.append(sessionId)
+                    if len(to_prefetch) >= prefetch_size:
+                        project_filter.prefetch(to_prefetch)
+                        to_prefetch = list()
             elif is_valid:
                 to_decode.append(msg.value())
                 sessionIds.append(sessionId)
             # if project_filter.is_valid(sessionId):
             #     to_decode.append(msg.value())
             #     sessionIds.append(sessionId)
-        valid_sessions = project_filter.are_valid(list(set(capture_sessions)))
+        valid_sessions = set(project_filter.are_valid(list(requested_sessions)))
         while capture_sessions:
             sessId = capture_sessions.pop()
             msg = capture_messages.pop()
             if sessId in valid_sessions:
                 sessionIds.append(sessId)
                 to_decode.append(msg)
+        # Only references to the shared buffer go through the pipe, payloads that do not fit are sent inline
+        to_decode = [ring.write(msg) or msg for msg in to_decode]
         if n_messages != 0:
             print(
             f'[WORKER INFO-bg] Found {broken_batchs} broken batch over {n_messages} read messages ({100 * broken_batchs / n_messages:.2f}%)')
         else:
             print('[WORKER WARN-bg] No messages read')
-        non_valid_updated = project_filter.non_valid_sessions_cache
-        pipe.send((non_valid_updated, sessionIds, to_decode))
+        project_filter.handle_clean()
+        pipe.send((sessionIds, to_decode))
         continue_signal = pipe.recv()
         if continue_signal == 'CLOSE':
             print('[WORKER SHUTDOWN-reader] Reader shutting down')
             break
         kafka_consumer.commit()
+        ring.next_slot()
     print('[WORKER INFO] Closing consumer')
     close_consumer(kafka_consumer)
     print('[WORKER INFO] Closing pg connection')
@@ -213,76 +207,25 @@ def read_from_kafka(pipe: Connection, params: dict):
     #     print('[WARN]', repr(e))
 
 
-def into_batch(batch: list[Event | DetailedEvent], session_id: int, n: Session):
-    n.sessionid = session_id
-    n.received_at = int(datetime.now().timestamp() * 1000)
-    n.batch_order_number = len(batch)
-    batch.append(n)
-    return batch
-
-
-def project_from_session(sessionId: int):
-    """Search projectId of requested sessionId in PG table sessions"""
-    with pg_client.PostgresClient() as conn:
-        conn.execute(
-            conn.mogrify("SELECT project_id FROM sessions WHERE session_id=%(sessionId)s LIMIT 1",
-                         {'sessionId': sessionId})
-        )
-        res = conn.fetchone()
-    if res is None:
-        print(f'[WORKER WARN] sessionid {sessionId} not found in sessions table')
-        return None
-    return res['project_id']
-
-
-def project_from_sessions(sessionIds: list[int]):
-    """Search projectId of requested sessionId in PG table sessions"""
-    response = list()
-    while sessionIds:
-        sessIds = sessionIds[-1000:]
-        try:
-            with pg_client.PostgresClient() as conn:
-                conn.execute(
-                    "SELECT session_id, project_id FROM sessions WHERE session_id IN ({sessionIds})".format(
-                                 sessionIds=','.join([str(sessId) for sessId in sessIds])
-                    )
-                )
-                res = conn.fetchall()
-        except Exception as e:
-            print('[WORKER project_from_sessions]', repr(e))
-            raise e
-        if res is None:
-            print(f'[WORKER WARN] sessionids {",".join([str(sessId) for sessId in sessIds])} not found in sessions table')
-        else:
-            response += res
-        sessionIds = sessionIds[:-1000]
-    if not response:
-        return []
-    return [(e['project_id'], e['session_id']) for e in response]
-
-
-def decode_message(params: dict):
+def decode_message(encoded_messages: list, memory: dict):
+    """Decodes the (session_id, encoded_message) pairs, updating the sessions of memory in place.
+    Returns the events batch, the dicts of the sessions changed and the ids of the ended sessions"""
     global codec, session_messages, events_messages, EVENT_TYPE
-    if len(params['message']) == 0:
-        return list(), None, list()
-    memory = {sessId: dict_to_session(sessObj) for sessId, sessObj in params['memory'].items()}
-    events_worker_batch = list()
+    if len(encoded_messages) == 0:
+        return EventsColumns(EVENT_TYPE), None, list()
+    events_worker_batch = EventsColumns(EVENT_TYPE)
     sessionid_ended = list()
-    for session_id, encoded_message in params['message']:
+    changed = set()
+    for session_id, encoded_message in encoded_messages:
         messages = codec.decode_detailed(encoded_message)
         if messages is None:
             continue
+        received_at = int(datetime.now().timestamp() * 1000)
         for message in messages:
             if message is None:
                 continue
-            if message.__id__ in events_messages and EVENT_TYPE != 'detailed':
-                n = handle_normal_message(message)
-                if n:
-                    events_worker_batch = into_batch(batch=events_worker_batch, session_id=session_id, n=n)
-            elif message.__id__ in events_messages and EVENT_TYPE == 'detailed':
-                n = handle_message(message)
-                if n:
-                    events_worker_batch = into_batch(batch=events_worker_batch, session_id=session_id, n=n)
+            if message.__id__ in events_messages:
+                append_event_columns(events_worker_batch, session_id, message, received_at)
 
             if message.__id__ in session_messages:
                 try:
@@ -290,10 +233,28 @@ def decode_message(params: dict):
                 except KeyError:
                     memory[session_id] = handle_session(None, message)
                 memory[session_id].sessionid = session_id
+                changed.add(session_id)
                 if isinstance(message, SessionEnd):
                     sessionid_ended.append(session_id)
-    memory = {sessId: session_to_dict(sessObj) for sessId, sessObj in memory.items()}
-    return events_worker_batch, memory, sessionid_ended
+    return events_worker_batch, {sessId: session_to_dict(memory[sessId]) for sessId in changed}, sessionid_ended
+
+
+def decoder_loop(pipe: Connection, ring: SharedRingBuffer):
+    """Decoder process. Keeps the sessions assigned to it between loops, so that only the sessions unknown
+    to it (restored from a checkpoint) are sent with the messages, and only the changed ones are sent back"""
+    memory = dict()
+    while True:
+        params = pipe.recv()
+        if params == 'CLOSE':
+            break
+        for session_id in params['deleted']:
+            memory.pop(session_id, None)
+        for session_id, session_dict in params['memory'].items():
+            memory[session_id] = dict_to_session(session_dict)
+        messages = [(session_id, ring.read(*message) if isinstance(message, tuple) else message)
+                    for session_id, message in params['message']]
+        pipe.send({'flag': 'decoder', 'value': decode_message(messages, memory)})
+    ring.close()
 
 
 def fix_missing_redshift():
@@ -369,24 +330,34 @@ def fix_missing_redshift():
 
 def work_assigner(params):
     flag = params.pop('flag')
-    if flag == 'decoder':
-        return {'flag': 'decoder', 'value': decode_message(params)}
-    elif flag == 'fix':
+    if flag == 'fix':
         return {'flag': 'fix', 'value': fix_missing_redshift()}
 
 
 class WorkerPool:
     def __init__(self, n_workers: int, project_filter: list[int]):
-        self.pool = Pool(n_workers)
+        self.pool = Pool(1)
+        self.ring = None
+        self.decoders = [None] * n_workers
+        self.decoder_pipes = [None] * n_workers
         self.sessions = dict()
         self.assigned_worker = dict()
+        # Sessions whose state is already held by their decoder, and sessions to drop from each decoder
+        self.seeded_sessions = set()
+        self.deleted_by_worker = [list() for _ in range(n_workers)]
         self.pointer = 0
         self.n_workers = n_workers
         self.project_filter_class = ProjectFilter(project_filter)
         self.sessions_update_batch = dict()
         self.sessions_insert_batch = dict()
-        self.events_batch = list()
+        self.events_batch = EventsColumns(EVENT_TYPE)
         self.n_of_loops = config('LOOPS_BEFORE_UPLOAD', default=4, cast=int)
+        # Changes since the last checkpoint
+        self.checkpoint = None
+        self.changed_sessions = set()
+        self.deleted_sessions = set()
+        self.events_delta = EventsColumns(EVENT_TYPE)
+        self.events_reset = False
 
     def get_worker(self, session_id: int) -> int:
         if session_id in self.assigned_worker.keys():
@@ -397,6 +368,16 @@ class WorkerPool:
             self.assigned_worker[session_id] = worker_id
         return worker_id
 
+    def _start_decoder(self, worker_id: int):
+        main_pipe, decoder_pipe = Pipe()
+        decoder = Process(target=decoder_loop, args=(decoder_pipe, self.ring))
+        decoder.start()
+        self.decoders[worker_id] = decoder
+        self.decoder_pipes[worker_id] = main_pipe
+        # A new decoder starts empty, the state of its sessions is sent again
+        self.seeded_sessions -= {sessId for sessId, assigned in self.assigned_worker.items() if assigned == worker_id}
+        self.deleted_by_worker[worker_id] = list()
+
     def _pool_response_handler(self, pool_results):
         count = 0
         for js_response in pool_results:
@@ -405,10 +386,12 @@ class WorkerPool:
                 worker_events, worker_memory, end_sessions = js_response['value']
                 if worker_memory is None:
                     continue
-                self.events_batch += worker_events
+                self.events_batch.extend(worker_events)
+                self.events_delta.extend(worker_events)
                 for session_id in worker_memory.keys():
                     self.sessions[session_id] = dict_to_session(worker_memory[session_id])
                     self.project_filter_class.sessions_lifespan.add(session_id)
+                self.changed_sessions.update(worker_memory.keys())
                 for session_id in end_sessions:
                     if self.sessions[session_id].session_start_timestamp:
                         old_status = self.project_filter_class.sessions_lifespan.close(session_id)
@@ -424,20 +407,20 @@ class WorkerPool:
                 count += 1
                 if count > 1:
                     raise Exception('Pool only accepts one reader task')
-                non_valid_updated, session_ids, messages = js_response['value']
-                self.project_filter_class.non_valid_sessions_cache = non_valid_updated
+                session_ids, messages = js_response['value']
 
-        self.project_filter_class.handle_clean()
         sessions_to_delete = self.project_filter_class.sessions_lifespan.clear_sessions()
         for sess_id in sessions_to_delete:
             try:
                 del self.sessions[sess_id]
             except KeyError:
                 ...
-            try:
-                del self.assigned_worker[sess_id]
-            except KeyError:
-                ...
+            worker_id = self.assigned_worker.pop(sess_id, None)
+            if sess_id in self.seeded_sessions:
+                self.seeded_sessions.discard(sess_id)
+                self.deleted_by_worker[worker_id].append(sess_id)
+            self.changed_sessions.discard(sess_id)
+            self.deleted_sessions.add(sess_id)
         return session_ids, messages
 
     def run_workers(self, database_api):
@@ -445,10 +428,15 @@ class WorkerPool:
         session_ids = list()
         messages = list()
         main_conn, reader_conn = Pipe()
+        # Created before forking the reader and decoders, which inherit the mapping
+        self.ring = SharedRingBuffer()
         kafka_task_params = {'flag': 'reader',
-                              'project_filter': self.project_filter_class}
+                              'project_filter': self.project_filter_class,
+                              'ring': self.ring}
         kafka_reader_process = Process(target=read_from_kafka, args=(reader_conn, kafka_task_params))
         kafka_reader_process.start()
+        for worker_id in range(self.n_workers):
+            self._start_decoder(worker_id)
         current_loop_number = 0
         n_kafka_restarts = 0
         while signal_handler.KEEP_PROCESSING:
@@ -462,32 +450,43 @@ class WorkerPool:
                 kafka_reader_process = Process(target=read_from_kafka, args=(reader_conn, kafka_task_params))
                 kafka_reader_process.start()
                 n_kafka_restarts += 1
-            decoding_params = [{'flag': 'decoder',
-                                'message': list(),
-                                'memory': dict()} for _ in range(self.n_workers)
+            for worker_id in range(self.n_workers):
+                if not self.decoders[worker_id].is_alive():
+                    print(f'[WORKER-INFO] Restarting decoder {worker_id}')
+                    self._start_decoder(worker_id)
+            decoding_params = [{'message': list(),
+                                'memory': dict(),
+                                'deleted': self.deleted_by_worker[worker_id]} for worker_id in range(self.n_workers)
                                ]
             for i in range(len(session_ids)):
                 session_id = session_ids[i]
                 worker_id = self.get_worker(session_id)
                 decoding_params[worker_id]['message'].append([session_id, messages[i]])
-                if session_id not in decoding_params[worker_id]['memory'].keys():
+                if session_id not in self.seeded_sessions:
+                    self.seeded_sessions.add(session_id)
                     try:
                         decoding_params[worker_id]['memory'][session_id] = session_to_dict(self.sessions[session_id])
                     except KeyError:
                         ...
             # Hand tasks to workers
-            async_results = list()
-            for params in decoding_params:
+            busy_workers = list()
+            for worker_id, params in enumerate(decoding_params):
                 if params['message']:
-                    async_results.append(self.pool.apply_async(work_assigner, args=[params]))
+                    self.decoder_pipes[worker_id].send(params)
+                    self.deleted_by_worker[worker_id] = list()
+                    busy_workers.append(worker_id)
             results = [{'flag': 'reader', 'value': main_conn.recv()}]
-            async_results.append(self.pool.apply_async(work_assigner, args=[{'flag': 'fix'}]))
-            for async_result in async_results:
-                try:
-                    results.append(async_result.get(timeout=32 * UPLOAD_RATE))
-                except TimeoutError as e:
+            fix_result = self.pool.apply_async(work_assigner, args=[{'flag': 'fix'}])
+            for worker_id in busy_workers:
+                if not self.decoder_pipes[worker_id].poll(32 * UPLOAD_RATE):
                     print('[WORKER-TimeoutError] Decoding of messages is taking longer than expected')
-                    raise e
+                    raise TimeoutError
+                results.append(self.decoder_pipes[worker_id].recv())
+            try:
+                results.append(fix_result.get(timeout=32 * UPLOAD_RATE))
+            except TimeoutError as e:
+                print('[WORKER-TimeoutError] Fix task is taking longer than expected')
+                raise e
             session_ids, messages = self._pool_response_handler(
                 pool_results=results)
             if current_loop_number == 0:
@@ -495,24 +494,58 @@ class WorkerPool:
                             database_api, sessions_table_name, table_name, EVENT_TYPE)
                 self.sessions_update_batch = dict()
                 self.sessions_insert_batch = dict()
-                self.events_batch = list()
+                self.events_batch = EventsColumns(EVENT_TYPE)
+                self.events_delta = EventsColumns(EVENT_TYPE)
+                self.events_reset = True
             self.save_snapshot(database_api)
             main_conn.send('CONTINUE')
         print('[WORKER-INFO] Sending close signal')
         main_conn.send('CLOSE')
-        self.terminate()
+        self.terminate(database_api)
         kafka_reader_process.terminate()
         print('[WORKER-SHUTDOWN] Process terminated')
 
+    def _get_checkpoint(self, database_api) -> IncrementalCheckpoint:
+        if self.checkpoint is None:
+            self.checkpoint = IncrementalCheckpoint(database_api)
+        return self.checkpoint
+
+    def _set_batches(self, sessions_update_batch: list[int], sessions_insert_batch: list[int]):
+        self.sessions_update_batch = {sessionId: self.sessions[sessionId] for sessionId in sessions_update_batch
+                                      if sessionId in self.sessions}
+        self.sessions_insert_batch = {sessionId: self.sessions[sessionId] for sessionId in sessions_insert_batch
+                                      if sessionId in self.sessions}
+
+    def _apply_delta(self, delta: dict):
+        session_project = self.project_filter_class.sessions_lifespan.session_project
+        for sessionId in delta['deleted_sessions']:
+            self.sessions.pop(sessionId, None)
+            session_project.pop(str(sessionId), None)
+        for sessionId, session_dict in delta['sessions']:
+            self.sessions[sessionId] = dict_to_session(session_dict)
+        session_project.update(delta['cached_sessions'])
+        self._set_batches(delta['sessions_update_batch'], delta['sessions_insert_batch'])
+        if delta['events_reset']:
+            self.events_batch = EventsColumns(EVENT_TYPE)
+        self.events_batch.extend(EventsColumns.from_dict(delta['events']))
+
     def load_checkpoint(self, database_api):
+        recovered = self._get_checkpoint(database_api).load()
+        if recovered is not None:
+            base, deltas = recovered
+            for sessionId, session_dict in base['sessions']:
+                self.sessions[sessionId] = dict_to_session(session_dict)
+            self.project_filter_class.sessions_lifespan.session_project = base['cached_sessions']
+            self._set_batches(base['sessions_update_batch'], base['sessions_insert_batch'])
+            self.events_batch = EventsColumns.from_dict(base['events_batch'])
+            for delta in deltas:
+                self._apply_delta(delta)
+            return
+        # Checkpoints saved before v2.0 are a single json object
         file = database_api.load_binary(name='checkpoint')
         checkpoint = json.loads(file.getvalue().decode('utf-8'))
         file.close()
         if 'version' not in checkpoint.keys():
-            sessions_cache_list = checkpoint['cache']
-            reload_default_time = datetime.now().timestamp()
-            self.project_filter_class.non_valid_sessions_cache = {int(sessId): reload_default_time for sessId, value in
-                                                                  sessions_cache_list.items() if not value[1]}
             self.project_filter_class.sessions_lifespan.session_project = checkpoint['cached_sessions']
         elif checkpoint['version'] == 'v1.0':
             for sessionId, session_dict in checkpoint['sessions']:
@@ -532,25 +565,63 @@ class WorkerPool:
                     self.sessions_insert_batch[sessionId] = self.sessions[sessionId]
                 except Exception:
                     continue
-            self.events_batch = [dict_to_event(event) for event in checkpoint['events_batch']]
+            self.events_batch = events_from_rows(checkpoint['events_batch'])
+        elif checkpoint['version'] == 'v1.2':
+            for sessionId, session_dict in checkpoint['sessions']:
+                self.sessions[sessionId] = dict_to_session(session_dict)
+            self.project_filter_class.sessions_lifespan.session_project = checkpoint['cached_sessions']
+            for sessionId in checkpoint['sessions_update_batch']:
+                try:
+                    self.sessions_update_batch[sessionId] = self.sessions[sessionId]
+                except Exception:
+                    continue
+            for sessionId in checkpoint['sessions_insert_batch']:
+                try:
+                    self.sessions_insert_batch[sessionId] = self.sessions[sessionId]
+                except Exception:
+                    continue
+            self.events_batch = EventsColumns.from_dict(checkpoint['events_batch'])
         else:
             raise Exception('Error in version of snapshot')
 
     def terminate(self, database_api):
+        for worker_id, decoder in enumerate(self.decoders):
+            if decoder is not None and decoder.is_alive():
+                self.decoder_pipes[worker_id].send('CLOSE')
+                decoder.join()
         self.pool.close()
+        if self.ring is not None:
+            self.ring.close(unlink=True)
         self.save_snapshot(database_api)
         database_api.close()
 
     def save_snapshot(self, database_api):
-        session_snapshot = list()
-        for sessionId, session in self.sessions.items():
-            session_snapshot.append([sessionId, session_to_dict(session)])
-        checkpoint = {
-            'version': 'v1.1',
-            'sessions': session_snapshot,
-            'cached_sessions': self.project_filter_class.sessions_lifespan.session_project,
-            'sessions_update_batch': list(self.sessions_update_batch.keys()),
-            'sessions_insert_batch': list(self.sessions_insert_batch.keys()),
-            'events_batch': [event_to_dict(event) for event in self.events_batch]
-        }
-        database_api.save_binary(binary_data=json.dumps(checkpoint).encode('utf-8'), name='checkpoint')
+        """Appends the changes since the last call to the checkpoint log, or writes a full snapshot when
+        the log is due for compaction"""
+        checkpoint = self._get_checkpoint(database_api)
+        session_project = self.project_filter_class.sessions_lifespan.session_project
+        if checkpoint.needs_compaction():
+            checkpoint.save_base({
+                'version': 'v2.0',
+                'sessions': [[sessionId, session_to_dict(session)] for sessionId, session in self.sessions.items()],
+                'cached_sessions': session_project,
+                'sessions_update_batch': list(self.sessions_update_batch.keys()),
+                'sessions_insert_batch': list(self.sessions_insert_batch.keys()),
+                'events_batch': self.events_batch.to_dict()
+            })
+        else:
+            checkpoint.save_delta({
+                'sessions': [[sessionId, session_to_dict(self.sessions[sessionId])]
+                             for sessionId in self.changed_sessions if sessionId in self.sessions],
+                'deleted_sessions': list(self.deleted_sessions),
+                'cached_sessions': {str(sessionId): session_project[str(sessionId)]
+                                    for sessionId in self.changed_sessions if str(sessionId) in session_project},
+                'sessions_update_batch': list(self.sessions_update_batch.keys()),
+                'sessions_insert_batch': list(self.sessions_insert_batch.keys()),
+                'events_reset': self.events_reset,
+                'events': self.events_delta.to_dict()
+            })
+        self.changed_sessions = set()
+        self.deleted_sessions = set()
+        self.events_delta = EventsColumns(EVENT_TYPE)
+        self.events_reset = False
@@ -173,6 +173,24 @@ SET default_config='{
 }'::jsonb
 WHERE metric_type = 'pathAnalysis';
 
+CREATE TABLE IF NOT EXISTS public.metrics_rollups
+(
+    project_id   integer          NOT NULL REFERENCES public.projects (project_id) ON DELETE CASCADE,
+    metric       text             NOT NULL,
+    bucket       bigint           NOT NULL,
+    values_count bigint           NOT NULL,
+    values_sum   double precision NOT NULL,
+    PRIMARY KEY (project_id, metric, bucket)
+);
+CREATE INDEX IF NOT EXISTS metrics_rollups_bucket_idx ON public.metrics_rollups (bucket);
+
+CREATE TABLE IF NOT EXISTS public.metrics_rollups_state
+(
+    source_table text   NOT NULL PRIMARY KEY,
+    started_at   bigint NOT NULL,
+    watermark    bigint NOT NULL
+);
+
 COMMIT;
 
 \elif :is_next
@@ -872,6 +872,24 @@ $$
                 FOR EACH ROW
             EXECUTE PROCEDURE notify_alert();
 
+            CREATE TABLE IF NOT EXISTS public.metrics_rollups
+            (
+                project_id   integer          NOT NULL REFERENCES public.projects (project_id) ON DELETE CASCADE,
+                metric       text             NOT NULL,
+                bucket       bigint           NOT NULL,
+                values_count bigint           NOT NULL,
+                values_sum   double precision NOT NULL,
+                PRIMARY KEY (project_id, metric, bucket)
+            );
+            CREATE INDEX IF NOT EXISTS metrics_rollups_bucket_idx ON public.metrics_rollups (bucket);
+
+            CREATE TABLE IF NOT EXISTS public.metrics_rollups_state
+            (
+                source_table text   NOT NULL PRIMARY KEY,
+                started_at   bigint NOT NULL,
+                watermark    bigint NOT NULL
+            );
+
             CREATE TABLE IF NOT EXISTS public.sessions_notes
             (
                 note_id    integer generated BY DEFAULT AS IDENTITY PRIMARY KEY,
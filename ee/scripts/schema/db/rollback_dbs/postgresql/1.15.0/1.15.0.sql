@@ -55,6 +55,9 @@ DROP TABLE IF EXISTS public.assist_events_aggregates_logs;
 ALTER TABLE IF EXISTS public.users
     DROP COLUMN IF EXISTS settings;
 
+DROP TABLE IF EXISTS public.metrics_rollups;
+DROP TABLE IF EXISTS public.metrics_rollups_state;
+
 COMMIT;
 
 \elif :is_next
@@ -48,6 +48,9 @@ ALTER TABLE IF EXISTS public.metrics
 ALTER TABLE IF EXISTS public.users
     DROP COLUMN IF EXISTS settings;
 
+DROP TABLE IF EXISTS public.metrics_rollups;
+DROP TABLE IF EXISTS public.metrics_rollups_state;
+
 COMMIT;
 
 \elif :is_next